@@ -1,7 +1,10 @@
 import json
 import hashlib
+import math
 from django.conf import settings
 from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from core.geo import geohash_center, geohash_encode, geohash_precision_for_radius, haversine_km
 
 # Try to use Redis if configured, otherwise fall back to Django's default cache
 try:
@@ -13,6 +16,31 @@ try:
 except (ImportError, AttributeError):
     redis_client = None
 
+class CampusCache:
+    """
+    Version counter for campus/university data. Bumped whenever a Campus or
+    University changes (see ``core.signals``); process-local structures such as
+    the campus spatial index compare against it to know when to rebuild.
+    """
+    VERSION_KEY = "campuses:version"
+
+    @staticmethod
+    def get_version():
+        version = cache.get(CampusCache.VERSION_KEY)
+        if version is None:
+            cache.add(CampusCache.VERSION_KEY, 1, None)
+            version = cache.get(CampusCache.VERSION_KEY, 1)
+        return version
+
+    @staticmethod
+    def bump_version():
+        try:
+            return cache.incr(CampusCache.VERSION_KEY)
+        except ValueError:
+            # Key missing (evicted or never set): restart above the default.
+            cache.set(CampusCache.VERSION_KEY, 2, None)
+            return 2
+
 class UniversityCache:
     CACHE_TTL = 3600  # 1 hour
     
@@ -31,18 +59,67 @@ class UniversityCache:
         cache_key = "universities:all"
         cache.set(cache_key, json.dumps(universities_data), UniversityCache.CACHE_TTL)
     
+    # Suggestion radii are rounded up to one of these steps so requests share buckets.
+    SUGGESTION_RADII_KM = (1, 2, 5, 10, 20, 50, 100)
+    SUGGESTION_TTL = 1800  # 30 minutes
+    SUGGESTION_HITS_KEY = "campus_suggestions:hits"
+    SUGGESTION_MISSES_KEY = "campus_suggestions:misses"
+
     @staticmethod
-    def get_campus_suggestions(lat, lng, radius):
-        """Get cached campus suggestions"""
-        cache_key = f"campus_suggestions:{lat:.4f}:{lng:.4f}:{radius}"
-        return cache.get(cache_key)
-    
+    def _suggestion_bucket(lat, lng, radius):
+        radius_step = next((step for step in UniversityCache.SUGGESTION_RADII_KM if step >= radius), math.ceil(radius))
+        return geohash_encode(lat, lng, geohash_precision_for_radius(radius_step)), radius_step
+
     @staticmethod
-    def set_campus_suggestions(lat, lng, radius, suggestions):
-        """Cache campus suggestions"""
-        cache_key = f"campus_suggestions:{lat:.4f}:{lng:.4f}:{radius}"
-        cache.set(cache_key, json.dumps(suggestions), 1800)  # 30 minutes
-    
+    def get_campus_suggestions(lat, lng, radius, loader):
+        """
+        Campuses within ``radius`` km of (lat, lng), closest first.
+
+        Results are cached per geohash cell (precision chosen from the radius) for
+        the whole cell: ``loader(center_lat, center_lng, search_radius_km)`` is
+        called on a miss with the radius padded by the cell's half-diagonal, and
+        each request filters the shared bucket down to its own position.
+        """
+        cell, radius_step = UniversityCache._suggestion_bucket(lat, lng, radius)
+        cache_key = f"campus_suggestions:v{CampusCache.get_version()}:{cell}:{radius_step}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            UniversityCache._count(UniversityCache.SUGGESTION_HITS_KEY)
+            candidates = json.loads(cached)
+        else:
+            UniversityCache._count(UniversityCache.SUGGESTION_MISSES_KEY)
+            center_lat, center_lng, half_diagonal_km = geohash_center(cell)
+            candidates = loader(center_lat, center_lng, radius_step + half_diagonal_km)
+            cache.set(cache_key, json.dumps(candidates, cls=DjangoJSONEncoder), UniversityCache.SUGGESTION_TTL)
+
+        suggestions = []
+        for campus in candidates:
+            distance = haversine_km(lat, lng, float(campus['latitude']), float(campus['longitude']))
+            if distance <= radius:
+                suggestions.append({**campus, 'distance_km': round(distance, 2)})
+        suggestions.sort(key=lambda campus: campus['distance_km'])
+        return suggestions
+
+    @staticmethod
+    def campus_suggestion_stats():
+        """Hit/miss counters for the campus suggestion cache."""
+        hits = cache.get(UniversityCache.SUGGESTION_HITS_KEY, 0)
+        misses = cache.get(UniversityCache.SUGGESTION_MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else None,
+        }
+
+    @staticmethod
+    def _count(key):
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
     @staticmethod
     def invalidate_university(university_id: int):
         """Invalidate cache for a specific university"""
@@ -86,16 +163,76 @@ class LocationCache:
     def get_user_location(user_id):
         """Get cached user location"""
         cache_key = f"user_location:{user_id}"
-        return cache.get(cache_key)
+        cached = cache.get(cache_key)
+        return json.loads(cached) if cached else None
     
     @staticmethod
     def set_user_location(user_id, location_data):
         """Cache user location"""
         cache_key = f"user_location:{user_id}"
-        cache.set(cache_key, json.dumps(location_data), LocationCache.CACHE_TTL)
+        cache.set(cache_key, json.dumps(location_data, cls=DjangoJSONEncoder), LocationCache.CACHE_TTL)
     
     @staticmethod
     def invalidate_user_location(user_id):
         """Invalidate user location cache"""
         cache_key = f"user_location:{user_id}"
-        cache.delete(cache_key) 
\ No newline at end of file
+        cache.delete(cache_key) 
+
+class ProfileCache:
+    """Per-user profile bundle (see ``UserService.get_profile_bundle``)."""
+    CACHE_TTL = 900  # 15 minutes
+
+    @staticmethod
+    def _key(user_id):
+        return f"profile_bundle:{user_id}"
+
+    @staticmethod
+    def get_bundle(user_id):
+        cached = cache.get(ProfileCache._key(user_id))
+        return json.loads(cached) if cached else None
+
+    @staticmethod
+    def set_bundle(user_id, bundle):
+        cache.set(ProfileCache._key(user_id), json.dumps(bundle, cls=DjangoJSONEncoder), ProfileCache.CACHE_TTL)
+
+    @staticmethod
+    def invalidate(*user_ids):
+        """Drop the bundles of the given users."""
+        keys = [ProfileCache._key(user_id) for user_id in user_ids if user_id is not None]
+        if keys:
+            cache.delete_many(keys)
+
+
+class ShopDirectoryCache:
+    """
+    Publicly visible shops per campus for the shop directory. The whole table
+    is one small entry; it is versioned so shop and subscription changes (see
+    ``shops.signals``) invalidate it, and the TTL bounds staleness from
+    subscriptions that simply run out.
+    """
+    CACHE_TTL = 600  # 10 minutes
+    VERSION_KEY = "shop_directory:version"
+
+    @staticmethod
+    def _key():
+        version = cache.get(ShopDirectoryCache.VERSION_KEY, 1)
+        return f"shop_directory:campus_counts:v{version}"
+
+    @staticmethod
+    def get_campus_counts(loader):
+        """``loader()`` returns ``[{'campus', 'campus_name', 'university', 'shops'}]`` on a miss."""
+        cache_key = ShopDirectoryCache._key()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+        counts = loader()
+        cache.set(cache_key, json.dumps(counts, cls=DjangoJSONEncoder), ShopDirectoryCache.CACHE_TTL)
+        return counts
+
+    @staticmethod
+    def invalidate():
+        if not cache.add(ShopDirectoryCache.VERSION_KEY, 2, None):
+            try:
+                cache.incr(ShopDirectoryCache.VERSION_KEY)
+            except ValueError:
+                cache.set(ShopDirectoryCache.VERSION_KEY, 2, None)
@@ -0,0 +1,80 @@
+"""
+Small geodesy helpers shared by the campus index and location caches.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+_GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Approximate geohash cell width in km (at the equator) per precision.
+GEOHASH_CELL_KM = {1: 5004.0, 2: 1252.0, 3: 156.5, 4: 39.1, 5: 4.89, 6: 1.22, 7: 0.153, 8: 0.038}
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in kilometres between two WGS84 points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def geohash_encode(lat: float, lng: float, precision: int) -> str:
+    """Encode a point as a geohash string of ``precision`` characters."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    use_lng = True
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if use_lng else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            bounds[0] = mid
+        else:
+            bits = bits * 2
+            bounds[1] = mid
+        use_lng = not use_lng
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_bounds(geohash: str):
+    """Return (min_lat, max_lat, min_lng, max_lng) of a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    use_lng = True
+    for char in geohash:
+        value = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bounds = lng_range if use_lng else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if (value >> shift) & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            use_lng = not use_lng
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def geohash_center(geohash: str):
+    """Return (lat, lng, half_diagonal_km) for a geohash cell."""
+    min_lat, max_lat, min_lng, max_lng = geohash_bounds(geohash)
+    lat, lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    return lat, lng, haversine_km(lat, lng, max_lat, max_lng)
+
+
+def geohash_precision_for_radius(radius_km: float) -> int:
+    """
+    Pick the finest precision whose cells are no wider than twice the radius, so
+    a cell's padding (its half-diagonal) stays of the same order as the radius.
+    """
+    for precision in range(1, 9):
+        if GEOHASH_CELL_KM[precision] <= 2 * radius_km:
+            return precision
+    return 8
@@ -0,0 +1,140 @@
+"""
+Validation and clean-up of uploaded images before they are stored.
+
+``sanitize_upload`` runs in the request, so it keeps the work per upload
+bounded:
+
+* the byte size is checked before anything is read, and the format and pixel
+  dimensions come from the header (``Image.open`` is lazy), so oversized or
+  non-image files are rejected without decoding them;
+* JPEGs larger than ``MAX_STORED_SIDE`` are decoded at a reduced DCT scale
+  (``Image.draft``), so a 50 MP photo never expands to full size in memory;
+* EXIF (including GPS) is dropped, the image is rotated upright according to
+  its EXIF orientation, and anything larger than ``MAX_STORED_SIDE`` is
+  downscaled.
+
+Files that are already small, upright and metadata-free are stored as-is.
+``sanitize_stored`` applies the same rules to an object that was uploaded
+straight to storage (presigned uploads) and rewrites it in place.
+"""
+import logging
+import os
+import posixpath
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+MAX_PIXELS = 50_000_000  # header dimensions, checked before decoding
+MAX_STORED_SIDE = 2560  # longest side kept for originals
+JPEG_QUALITY = 88
+ALLOWED_FORMATS = {
+    'JPEG': ('image/jpeg', 'jpg'),
+    'PNG': ('image/png', 'png'),
+    'WEBP': ('image/webp', 'webp'),
+}
+ORIENTATION_TAG = 0x0112
+
+
+def _rewind(upload):
+    if hasattr(upload, 'seek'):
+        upload.seek(0)
+
+
+def sanitize_upload(upload):
+    """
+    Validate ``upload`` and return the file to store: either ``upload`` itself
+    or a re-encoded copy with the same base name. Raises ValidationError.
+    """
+    if upload.size is not None and upload.size > MAX_UPLOAD_BYTES:
+        raise ValidationError(f'Images must be at most {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.')
+
+    _rewind(upload)
+    try:
+        image = Image.open(upload)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValidationError('Upload a valid image. The file is not an image or is corrupted.')
+
+    try:
+        if image.format not in ALLOWED_FORMATS:
+            raise ValidationError(f"Unsupported image format {image.format}; use JPEG, PNG or WebP.")
+        width, height = image.size
+        if width * height > MAX_PIXELS:
+            raise ValidationError(f'Image is too large ({width}x{height}); the limit is {MAX_PIXELS // 1_000_000} megapixels.')
+
+        exif = image.getexif()
+        oversized = max(width, height) > MAX_STORED_SIDE
+        rotated = exif.get(ORIENTATION_TAG, 1) not in (0, 1)
+        if not (exif or oversized or rotated or 'exif' in image.info):
+            _rewind(upload)
+            return upload
+
+        return _reencode(upload, image, oversized)
+    finally:
+        image.close()
+
+
+def _reencode(upload, image, oversized):
+    fmt = image.format
+    content_type, extension = ALLOWED_FORMATS[fmt]
+    icc_profile = image.info.get('icc_profile')
+
+    if oversized and fmt == 'JPEG':
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale instead of full size.
+        image.draft('RGB', (MAX_STORED_SIDE, MAX_STORED_SIDE))
+    try:
+        image.load()
+    except (OSError, Image.DecompressionBombError):
+        raise ValidationError('Upload a valid image. The file is not an image or is corrupted.')
+
+    cleaned = ImageOps.exif_transpose(image)
+    if oversized:
+        cleaned.thumbnail((MAX_STORED_SIDE, MAX_STORED_SIDE), Image.LANCZOS)
+
+    buffer = BytesIO()
+    options = {'icc_profile': icc_profile} if icc_profile else {}
+    if fmt == 'JPEG':
+        if cleaned.mode not in ('RGB', 'L'):
+            cleaned = cleaned.convert('RGB')
+        cleaned.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True, **options)
+    elif fmt == 'WEBP':
+        cleaned.save(buffer, 'WEBP', quality=JPEG_QUALITY, method=4, **options)
+    else:
+        cleaned.save(buffer, 'PNG', optimize=True, **options)
+
+    stem = os.path.splitext(os.path.basename(upload.name or 'image'))[0]
+    size = buffer.tell()
+    buffer.seek(0)
+    logger.debug(f"Re-encoded upload {upload.name}: {upload.size} -> {size} bytes, {cleaned.size[0]}x{cleaned.size[1]}")
+    return InMemoryUploadedFile(buffer, None, f'{stem}.{extension}', content_type, size, None)
+
+
+def sanitize_stored(storage, name: str):
+    """
+    Sanitize an already stored image under its own name. Returns None when the
+    object is clean (or was rewritten clean), or the rejection reason after
+    deleting it.
+    """
+    with storage.open(name, 'rb') as fh:
+        stored = ContentFile(fh.read(MAX_UPLOAD_BYTES + 1), name=posixpath.basename(name))
+    try:
+        cleaned = sanitize_upload(stored)
+    except ValidationError as e:
+        storage.delete(name)
+        logger.warning(f"Rejected stored image {name}: {e.messages[0]}")
+        return e.messages[0]
+    if cleaned is stored:
+        return None
+
+    # The format (and so the extension) is kept, so the rewritten object keeps its key.
+    storage.delete(name)
+    saved = storage.save(name, cleaned)
+    if saved != name:
+        storage.delete(saved)
+        raise RuntimeError(f"Could not rewrite {name} in place (stored as {saved})")
+    return None
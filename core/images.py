@@ -0,0 +1,208 @@
+"""
+Resized image derivatives for listing and shop images.
+
+Every source image gets a WebP and a progressive JPEG rendition at each size in
+``DERIVATIVE_SIZES``. Renditions are written next to each other under
+``derivatives/`` in the same storage as the original, and the model's JSON
+``variants`` field records their names::
+
+    {"source": "product_images/x.jpg", "version": 1760000000,
+     "sizes": {"thumb": {"webp": "...", "jpeg": "...", "width": 160, "height": 120}, ...},
+     "placeholder": "data:image/webp;base64,..."}
+
+``source`` lets the pipeline tell whether the recorded renditions still belong
+to the current upload; ``version`` is added to rendition URLs so regenerated
+files are not served stale from caches. ``placeholder`` is a blurred
+16px WebP inlined as a data URI (a few hundred bytes), which clients paint
+while the real rendition loads. Generation only needs a Django ``Storage``, so it works
+the same against R2 and a local ``FileSystemStorage``.
+"""
+import base64
+import logging
+import posixpath
+import time
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from PIL import Image, ImageFilter, ImageOps
+
+from .media import media_url
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels; images are never upscaled.
+DERIVATIVE_SIZES = {
+    'thumb': 160,
+    'card': 480,
+    'full': 1280,
+}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+DERIVATIVE_ROOT = 'derivatives'
+PLACEHOLDER_SIDE = 16
+PLACEHOLDER_QUALITY = 40
+
+# model label -> (image field, variants field)
+IMAGE_SOURCES = {
+    'marketplace.ProductImage': ('image', 'variants'),
+    'estates.PropertyImage': ('image', 'variants'),
+    'shops.ShopMedia': ('image', 'variants'),
+    'shops.Shop': ('image', 'image_variants'),
+}
+
+
+def derivative_name(source_name: str, size: str, extension: str) -> str:
+    """``product_images/x.jpg`` -> ``derivatives/product_images/x/card.webp``."""
+    stem, _ = posixpath.splitext(source_name)
+    return posixpath.join(DERIVATIVE_ROOT, stem, f'{size}.{extension}')
+
+
+def _encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = BytesIO()
+    if fmt == 'WEBP':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def placeholder_data_uri(image: Image.Image) -> str:
+    """Inline ``data:`` URI of a tiny, blurred WebP preview of ``image``."""
+    preview = image.convert('RGB') if image.mode != 'RGB' else image.copy()
+    preview.thumbnail((PLACEHOLDER_SIDE, PLACEHOLDER_SIDE), Image.BOX)
+    preview = preview.filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    preview.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY, method=6)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def generate_derivatives(storage, source_name: str) -> dict:
+    """
+    Render every size of ``source_name`` into ``storage`` and return the
+    ``variants`` value describing them. Existing renditions are overwritten.
+    """
+    with storage.open(source_name, 'rb') as fh:
+        with Image.open(fh) as opened:
+            original = ImageOps.exif_transpose(opened)
+            original = original.convert('RGB') if original.mode != 'RGB' else original.copy()
+
+    sizes = {}
+    for size, longest_side in DERIVATIVE_SIZES.items():
+        rendition = original.copy()
+        rendition.thumbnail((longest_side, longest_side), Image.LANCZOS)
+        entry = {'width': rendition.width, 'height': rendition.height}
+        for extension, fmt in (('webp', 'WEBP'), ('jpg', 'JPEG')):
+            name = derivative_name(source_name, size, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            entry['webp' if fmt == 'WEBP' else 'jpeg'] = storage.save(name, ContentFile(_encode(rendition, fmt)))
+        sizes[size] = entry
+
+    return {
+        'source': source_name,
+        'version': int(time.time()),
+        'sizes': sizes,
+        'placeholder': placeholder_data_uri(original),
+    }
+
+
+def delete_derivatives(storage, variants: dict) -> None:
+    """Remove the rendition files recorded in ``variants``."""
+    for entry in (variants or {}).get('sizes', {}).values():
+        for key in ('webp', 'jpeg'):
+            name = entry.get(key)
+            if name and storage.exists(name):
+                storage.delete(name)
+
+
+def derivative_urls(storage, variants: dict, source_name: str = None, request=None) -> dict:
+    """
+    ``{size: {'webp': url, 'jpeg': url, 'width': w, 'height': h}}`` for the
+    renditions in ``variants``, or ``{}`` while they are missing or belong to a
+    previous upload.
+    """
+    if not variants or (source_name and variants.get('source') != source_name):
+        return {}
+    version = variants.get('version')
+    return {
+        size: {
+            'webp': media_url(entry['webp'], request, version, storage),
+            'jpeg': media_url(entry['jpeg'], request, version, storage),
+            'width': entry['width'],
+            'height': entry['height'],
+        }
+        for size, entry in variants.get('sizes', {}).items()
+    }
+
+
+def placeholder_for(variants: dict, source_name: str = None):
+    """The recorded placeholder, or None while it is missing or belongs to a previous upload."""
+    if not variants or (source_name and variants.get('source') != source_name):
+        return None
+    return variants.get('placeholder')
+
+
+def needs_derivatives(instance, image_field: str, variants_field: str) -> bool:
+    image = getattr(instance, image_field)
+    if not image:
+        return False
+    return (getattr(instance, variants_field) or {}).get('source') != image.name
+
+
+def process_instance(model_label: str, pk: int, force: bool = False) -> bool:
+    """
+    Generate renditions for one row registered in ``IMAGE_SOURCES``. The result
+    is stored with a conditional UPDATE so a newer upload is never overwritten
+    with renditions of the old one. Returns True if renditions were written.
+    """
+    image_field, variants_field = IMAGE_SOURCES[model_label]
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).only('pk', image_field, variants_field).first()
+    if instance is None:
+        return False
+    if not force and not needs_derivatives(instance, image_field, variants_field):
+        return False
+
+    image = getattr(instance, image_field)
+    if not image:
+        return False
+    previous = getattr(instance, variants_field) or {}
+    variants = generate_derivatives(image.storage, image.name)
+    updated = model.objects.filter(pk=pk, **{image_field: image.name}).update(**{variants_field: variants})
+    if not updated:
+        # The image changed while we were rendering; its own task will redo the work.
+        delete_derivatives(image.storage, variants)
+        return False
+    if previous.get('source') not in (None, image.name):
+        delete_derivatives(image.storage, previous)
+    logger.info(f"Generated image derivatives for {model_label} {pk}")
+    return True
+
+
+def add_placeholder(model_label: str, pk: int) -> bool:
+    """
+    Backfill ``placeholder`` for a row whose renditions predate it. Decodes the
+    stored thumb rendition rather than the original. Rows without current
+    renditions are skipped: generating them records a placeholder as well.
+    Returns True if a placeholder was written.
+    """
+    image_field, variants_field = IMAGE_SOURCES[model_label]
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).only('pk', image_field, variants_field).first()
+    if instance is None:
+        return False
+    image = getattr(instance, image_field)
+    variants = getattr(instance, variants_field) or {}
+    thumb = variants.get('sizes', {}).get('thumb')
+    if not image or variants.get('source') != image.name or variants.get('placeholder') or not thumb:
+        return False
+
+    with image.storage.open(thumb['jpeg'], 'rb') as fh:
+        with Image.open(fh) as opened:
+            placeholder = placeholder_data_uri(opened)
+    # Matching on the version leaves rows regenerated meanwhile alone.
+    updated = model.objects.filter(
+        pk=pk, **{image_field: image.name, f'{variants_field}__version': variants.get('version')}
+    ).update(**{variants_field: {**variants, 'placeholder': placeholder}})
+    return bool(updated)
@@ -0,0 +1,70 @@
+import random
+import statistics
+import time
+
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.core.management.base import BaseCommand
+
+from core.models import Campus
+from core.services.campus_index import CampusSpatialIndex
+
+# Roughly the bounding box of Tanzania, where all seeded campuses live.
+DEFAULT_BBOX = (-11.8, 29.3, -0.9, 40.5)
+
+
+class Command(BaseCommand):
+    help = 'Compare nearby-campus lookups from the in-memory index against the PostGIS query.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200, help='Number of random points to query.')
+        parser.add_argument('--radius', type=float, default=20, help='Search radius in km.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        radius = options['radius']
+        min_lat, min_lng, max_lat, max_lng = DEFAULT_BBOX
+        points = [
+            (rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng))
+            for _ in range(options['queries'])
+        ]
+
+        started = time.perf_counter()
+        index = CampusSpatialIndex.build()
+        build_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f"Index build: {len(index)} campuses in {build_ms:.1f} ms")
+
+        index_times, postgis_times, mismatches = [], [], 0
+        for lat, lng in points:
+            started = time.perf_counter()
+            index_ids = [campus['id'] for campus in index.nearby(lat, lng, radius)]
+            index_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            user_location = Point(lng, lat, srid=4326)
+            postgis_ids = list(
+                Campus.objects.filter(
+                    is_active=True,
+                    location__isnull=False,
+                    location__distance_lte=(user_location, D(km=radius))
+                ).annotate(
+                    distance=Distance('location', user_location)
+                ).order_by('distance').values_list('id', flat=True)
+            )
+            postgis_times.append(time.perf_counter() - started)
+
+            # Haversine vs. spheroid distances can disagree for campuses right on the boundary.
+            if set(index_ids) != set(postgis_ids):
+                mismatches += 1
+
+        for label, samples in (('index', index_times), ('postgis', postgis_times)):
+            samples_us = sorted(sample * 1_000_000 for sample in samples)
+            p95 = samples_us[int(len(samples_us) * 0.95) - 1] if samples_us else 0
+            self.stdout.write(
+                f"{label:>8}: mean {statistics.mean(samples_us):10.1f} us  "
+                f"median {statistics.median(samples_us):10.1f} us  p95 {p95:10.1f} us"
+            )
+        style = self.style.SUCCESS if mismatches == 0 else self.style.WARNING
+        self.stdout.write(style(f"Result sets differing: {mismatches}/{len(points)}"))
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.media_gc import collect_orphaned_media
+
+
+class Command(BaseCommand):
+    help = 'Report (and with --delete, remove) stored media files that no database row references'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Delete the orphans; without it the command only reports them',
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=float,
+            default=24,
+            help='Ignore objects modified more recently than this (default 24)',
+        )
+        parser.add_argument(
+            '--prefix',
+            action='append',
+            help='Only scan this storage prefix (repeatable); defaults to every managed prefix',
+        )
+
+    def handle(self, *args, **options):
+        if options['min_age_hours'] < 1:
+            raise CommandError('--min-age-hours must be at least 1.')
+        prefixes = [prefix.rstrip('/') + '/' for prefix in options['prefix']] if options['prefix'] else None
+
+        report = collect_orphaned_media(
+            delete=options['delete'],
+            min_age=timedelta(hours=options['min_age_hours']),
+            prefixes=prefixes,
+        )
+
+        self.stdout.write(f"Scanned {', '.join(report.prefixes)}")
+        for name in report.sample:
+            self.stdout.write(f"  {name}")
+        if report.orphans > len(report.sample):
+            self.stdout.write(f"  ... and {report.orphans - len(report.sample)} more")
+        self.stdout.write(
+            f"{report.scanned} objects, {report.referenced} referenced names, "
+            f"{report.recent} too recent to judge"
+        )
+        verb = 'Deleted' if not report.dry_run else 'Found'
+        count = report.deleted if not report.dry_run else report.orphans
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {count} orphaned files ({report.orphan_bytes / (1024 * 1024):.1f} MB)"
+        ))
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.reference_data import (
+    DEFAULT_FIXTURE,
+    ReferenceDataError,
+    load_reference_data,
+    read_fixture,
+)
+
+
+class Command(BaseCommand):
+    help = 'Load universities and campuses from a versioned JSON/CSV fixture (bulk, idempotent)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixture',
+            nargs='?',
+            default=str(DEFAULT_FIXTURE),
+            help='Path to the JSON or CSV fixture (defaults to core/data/campuses.json)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without writing anything',
+        )
+        parser.add_argument(
+            '--deactivate-missing',
+            action='store_true',
+            help='Deactivate active universities and campuses that are not in the fixture',
+        )
+        parser.add_argument(
+            '--fixture-version',
+            help='Override the fixture version (CSV files default to their file name)',
+        )
+        parser.add_argument(
+            '--verbose-changes',
+            action='store_true',
+            help='List every university and campus that would be created or updated',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            data = read_fixture(options['fixture'], version=options['fixture_version'])
+            result = load_reference_data(
+                data,
+                dry_run=options['dry_run'],
+                deactivate_missing=options['deactivate_missing'],
+            )
+        except ReferenceDataError as e:
+            raise CommandError(str(e))
+
+        prefix = 'Would ' if result.dry_run else ''
+        self.stdout.write(self.style.SUCCESS(f"Reference data version {result.version}"))
+        if options['verbose_changes']:
+            for name in result.changed_names:
+                self.stdout.write(f"  {name}")
+        self.stdout.write(
+            f"{prefix}create {result.universities_created} / update {result.universities_updated} / "
+            f"deactivate {result.universities_deactivated} universities"
+        )
+        self.stdout.write(
+            f"{prefix}create {result.campuses_created} / update {result.campuses_updated} / "
+            f"deactivate {result.campuses_deactivated} campuses"
+        )
+        self.stdout.write(f"Unchanged: {result.unchanged}")
+        if result.has_changes and not result.dry_run:
+            self.stdout.write("Campus cache version bumped and directory rebuilt")
+        elif not result.has_changes:
+            self.stdout.write("Nothing to do")
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from core.models import University, Campus
+from core.services.campus_directory import refresh_campus_directory
 from decimal import Decimal
 import logging
 from django.contrib.gis.geos import Point
@@ -932,4 +933,8 @@ class Command(BaseCommand):
                 self.style.WARNING("Some errors occurred. Check the logs for details.")
             )
         
-        self.stdout.write(self.style.SUCCESS("Complete campus population finished!")) 
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS("Complete campus population finished!"))
+
+        if not dry_run:
+            directory = refresh_campus_directory()
+            self.stdout.write(f"Campus directory regenerated: version {directory.content_hash}")
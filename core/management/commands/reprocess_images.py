@@ -0,0 +1,102 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.images import IMAGE_SOURCES, add_placeholder, process_instance
+
+
+def _init_worker():
+    # Forked workers must not share the parent's database connections.
+    django.setup()
+    connections.close_all()
+
+
+def _process(job):
+    model_label, pk, mode = job
+    try:
+        if mode == 'placeholders':
+            return model_label, pk, add_placeholder(model_label, pk), None
+        return model_label, pk, process_instance(model_label, pk, force=mode == 'force'), None
+    except Exception as e:
+        return model_label, pk, False, str(e)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate missing (or, with --force, all) resized image derivatives using a process pool; '
+        'with --placeholders, only backfill inline placeholders for rows rendered before they existed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=sorted(IMAGE_SOURCES),
+            help='Only reprocess this model (repeatable); defaults to every image model',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate derivatives even when they are up to date',
+        )
+        parser.add_argument(
+            '--placeholders',
+            action='store_true',
+            help='Only add missing placeholders, decoding the stored thumb rendition instead of the original',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of worker processes (default 4)',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+        if options['force'] and options['placeholders']:
+            raise CommandError('--force and --placeholders cannot be combined.')
+        mode = 'force' if options['force'] else 'placeholders' if options['placeholders'] else 'missing'
+
+        jobs = []
+        for model_label in options['model'] or IMAGE_SOURCES:
+            image_field, variants_field = IMAGE_SOURCES[model_label]
+            rows = apps.get_model(model_label).objects.exclude(
+                **{image_field: ''}
+            ).exclude(
+                **{f'{image_field}__isnull': True}
+            ).values_list('pk', image_field, f'{variants_field}__source', f'{variants_field}__placeholder')
+            jobs.extend(
+                (model_label, pk, mode)
+                for pk, name, source, placeholder in rows.iterator()
+                if mode == 'force'
+                or (mode == 'missing' and source != name)
+                or (mode == 'placeholders' and source == name and not placeholder)
+            )
+
+        if not jobs:
+            self.stdout.write(self.style.SUCCESS(
+                'All image placeholders are up to date.' if mode == 'placeholders'
+                else 'All image derivatives are up to date.'
+            ))
+            return
+
+        self.stdout.write(f"Reprocessing {len(jobs)} images with {options['workers']} workers")
+        connections.close_all()
+        generated = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            for model_label, pk, written, error in pool.map(_process, jobs, chunksize=20):
+                if error:
+                    failed += 1
+                    self.stderr.write(f"  {model_label} {pk}: {error}")
+                elif written:
+                    generated += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {'placeholders' if mode == 'placeholders' else 'derivatives'} for {generated} images, "
+            f"{failed} failed, "
+            f"{len(jobs) - generated - failed} skipped"
+        ))
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django_q.models import Schedule
+
+# Periodic django-q jobs. Each entry is keyed by its unique schedule name, so
+# re-running the command updates existing rows instead of duplicating them.
+SCHEDULES = [
+    {
+        'name': 'shop-subscription-expiry',
+        'func': 'shops.tasks.expire_subscriptions',
+        'schedule_type': Schedule.MINUTES,
+        'minutes': 5,
+    },
+    {
+        'name': 'dashboard-analytics-snapshot',
+        'func': 'dashboard.tasks.refresh_dashboard_snapshot',
+        'schedule_type': Schedule.MINUTES,
+        'minutes': 5,
+    },
+    {
+        'name': 'property-video-queue',
+        'func': 'estates.tasks.process_pending_videos',
+        'schedule_type': Schedule.MINUTES,
+        'minutes': 5,
+    },
+    {
+        'name': 'orphaned-media-gc',
+        'func': 'core.tasks.collect_orphaned_media',
+        'schedule_type': Schedule.DAILY,
+        'first_run': lambda now: (now + timedelta(days=1)).replace(hour=3, minute=30, second=0, microsecond=0),
+    },
+    {
+        'name': 'wallet-monthly-snapshots',
+        'func': 'payments.tasks.build_wallet_monthly_snapshots',
+        'schedule_type': Schedule.MONTHLY,
+        'first_run': lambda now: (now.replace(day=1) + timedelta(days=32)).replace(
+            day=1, hour=0, minute=15, second=0, microsecond=0
+        ),
+    },
+]
+
+
+class Command(BaseCommand):
+    help = 'Create or update the periodic django-q schedules used by the project'
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        for entry in SCHEDULES:
+            defaults = {
+                'func': entry['func'],
+                'schedule_type': entry['schedule_type'],
+                'minutes': entry.get('minutes'),
+                'repeats': -1,
+            }
+            schedule, created = Schedule.objects.get_or_create(name=entry['name'], defaults={
+                **defaults,
+                'next_run': entry['first_run'](now) if 'first_run' in entry else now,
+            })
+            if not created:
+                for field, value in defaults.items():
+                    setattr(schedule, field, value)
+                schedule.save()
+            status = 'Created' if created else 'Updated'
+            self.stdout.write(self.style.SUCCESS(f"{status} schedule '{schedule.name}' -> {schedule.func}"))
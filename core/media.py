@@ -0,0 +1,56 @@
+"""
+Cheap public URLs for stored media.
+
+Media lives in a public-read R2 bucket behind ``AWS_S3_CUSTOM_DOMAIN``, so an
+object's URL is just ``https://<domain>/<location>/<name>``. ``media_url``
+builds it by string concatenation instead of going through ``FieldFile.url``
+and the storage backend, and only calls ``request.build_absolute_uri`` for
+relative URLs (local ``FileSystemStorage`` in development). Storages without a
+public custom domain, or that sign URLs, fall back to ``storage.url``.
+"""
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import quote
+
+from django.core.files.storage import default_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.encoding import filepath_to_uri
+
+
+@lru_cache(maxsize=None)
+def public_base(storage) -> Optional[str]:
+    """``https://domain/location/`` for a public custom-domain storage, else None."""
+    domain = getattr(storage, 'custom_domain', None)
+    if not domain or (getattr(storage, 'querystring_auth', False) and getattr(storage, 'cloudfront_signer', None)):
+        return None
+    location = (getattr(storage, 'location', '') or '').strip('/')
+    return f"{getattr(storage, 'url_protocol', 'https:')}//{domain}/{location + '/' if location else ''}"
+
+
+@receiver(setting_changed)
+def _reset_public_base(setting, **kwargs):
+    if setting in ('STORAGES', 'MEDIA_URL') or setting.startswith('AWS_'):
+        public_base.cache_clear()
+
+
+def media_url(file, request=None, version=None, storage=None) -> Optional[str]:
+    """
+    URL for a ``FieldFile`` or storage name, or None when empty. ``version`` is
+    appended as ``?v=`` to bust caches when an object is rewritten in place
+    (e.g. regenerated derivatives).
+    """
+    if not file:
+        return None
+    name = getattr(file, 'name', file)
+    if not name:
+        return None
+    storage = storage or getattr(file, 'storage', None) or default_storage
+
+    base = public_base(storage)
+    url = base + filepath_to_uri(name.lstrip('/')) if base is not None else storage.url(name)
+    if version is not None:
+        url += ('&' if '?' in url else '?') + f'v={quote(str(version))}'
+    if request is not None and url.startswith('/') and not url.startswith('//'):
+        url = request.build_absolute_uri(url)
+    return url
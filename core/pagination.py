@@ -33,4 +33,18 @@ class LocationPagination(PageNumberPagination):
     """Optimized pagination for location-based content"""
     page_size = 25
     page_size_query_param = 'limit'
-    max_page_size = 150 
\ No newline at end of file
+    max_page_size = 150 
+
+class ProximityPagePagination(PageNumberPagination):
+    """Pages the bounded, distance-ranked id list built by ``core.services.proximity``."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
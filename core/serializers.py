@@ -1,8 +1,76 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 from .models import University, Campus
+from .images import derivative_urls, placeholder_for
+from .image_uploads import sanitize_upload
+from .media import media_url
 from drf_spectacular.utils import extend_schema_field
 
+
+class MediaImageField(serializers.ImageField):
+    """
+    ImageField whose URL is built by ``core.media.media_url`` instead of the
+    storage, and whose uploads go through ``core.image_uploads.sanitize_upload``
+    (header-only validation, size/pixel limits, EXIF stripping, downscaling).
+    """
+
+    def to_internal_value(self, data):
+        # FileField's checks only: sanitize_upload replaces the full Pillow verify.
+        upload = serializers.FileField.to_internal_value(self, data)
+        try:
+            return sanitize_upload(upload)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+
+    def to_representation(self, value):
+        return media_url(value, self.context.get('request'))
+
+
+def image_variant_urls(instance, request=None, image_field='image', variants_field='variants') -> dict:
+    """Absolute rendition URLs for an image row, ``{}`` until they are generated."""
+    image = getattr(instance, image_field)
+    if not image:
+        return {}
+    return derivative_urls(image.storage, getattr(instance, variants_field), image.name, request)
+
+
+def image_placeholder(instance, image_field='image', variants_field='variants'):
+    """Inline blurred preview (``data:`` URI) for an image row, or None until it is generated."""
+    image = getattr(instance, image_field)
+    if not image:
+        return None
+    return placeholder_for(getattr(instance, variants_field), image.name)
+
+
+class _ImageRowField(serializers.Field):
+    """Read-only field computed from a whole image row (its image and variants fields)."""
+
+    def __init__(self, image_field='image', variants_field='variants', **kwargs):
+        self.image_field = image_field
+        self.variants_field = variants_field
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+
+@extend_schema_field(serializers.DictField())
+class ImageVariantsField(_ImageRowField):
+    """Read-only thumb/card/full WebP and JPEG URLs for a model's image field."""
+
+    def to_representation(self, instance):
+        return image_variant_urls(
+            instance, self.context.get('request'), self.image_field, self.variants_field
+        )
+
+
+@extend_schema_field(serializers.CharField(allow_null=True))
+class ImagePlaceholderField(_ImageRowField):
+    """Read-only inline placeholder (``data:image/webp;base64,...``) for a model's image field."""
+
+    def to_representation(self, instance):
+        return image_placeholder(instance, self.image_field, self.variants_field)
+
 class UniversitySerializer(serializers.ModelSerializer):
     """Simple serializer for University model - raw data only"""
     
@@ -0,0 +1,197 @@
+"""
+Pre-rendered campus directory served by ``CampusViewSet.all``.
+
+The full list of active campuses (with their university) is serialized once,
+compressed with gzip (and brotli when installed) and identified by a content
+hash that doubles as the HTTP ETag. Each process keeps the artifact in memory
+and rebuilds it when ``CampusCache``'s version changes, so every process
+produces the same bytes and ETag for the same data.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.cache import CampusCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CampusDirectory:
+    content_hash: str
+    last_modified: Optional[str]
+    body: bytes
+    gzip_body: bytes
+    brotli_body: Optional[bytes]
+    version: Optional[int] = None
+    built_at: float = 0.0
+
+    @property
+    def etag(self):
+        return f'"{self.content_hash}"'
+
+    def encoded(self, accept_encoding: str):
+        """Return (body, content_encoding) for the best encoding the client accepts."""
+        accepted = {part.split(';')[0].strip() for part in (accept_encoding or '').split(',')}
+        if self.brotli_body is not None and 'br' in accepted:
+            return self.brotli_body, 'br'
+        if 'gzip' in accepted:
+            return self.gzip_body, 'gzip'
+        return self.body, None
+
+
+def serialize_campuses(campuses):
+    """Serialize campuses in the directory shape, rendering each university only once."""
+    from core.serializers import CampusSerializer, UniversitySerializer
+
+    universities = {}
+    campuses_data = []
+    for campus in campuses:
+        campus_data = CampusSerializer(campus).data
+        if campus.university_id not in universities:
+            universities[campus.university_id] = UniversitySerializer(campus.university).data
+        campus_data['university'] = universities[campus.university_id]
+        campuses_data.append(campus_data)
+    return campuses_data
+
+
+def directory_last_modified():
+    """High-water mark of campus/university changes, used as the delta cursor."""
+    from core.models import Campus, University
+
+    latest = [
+        Campus.objects.aggregate(latest=Max('updated_at'))['latest'],
+        University.objects.aggregate(latest=Max('updated_at'))['latest'],
+    ]
+    latest = [value for value in latest if value is not None]
+    return max(latest).isoformat() if latest else None
+
+
+def build_campus_directory(version=None) -> CampusDirectory:
+    """Render, hash and compress the directory of all active campuses."""
+    from core.models import Campus
+
+    campuses = Campus.objects.filter(is_active=True).select_related('university').order_by('id')
+    campuses_data = serialize_campuses(campuses)
+    last_modified = directory_last_modified()
+
+    content_hash = hashlib.sha256(
+        json.dumps(campuses_data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    ).hexdigest()[:32]
+    body = json.dumps({
+        'version': content_hash,
+        'last_modified': last_modified,
+        'campuses': campuses_data,
+    }, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+    directory = CampusDirectory(
+        content_hash=content_hash,
+        last_modified=last_modified,
+        body=body,
+        # mtime=0 keeps the gzip bytes identical across processes.
+        gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        brotli_body=brotli.compress(body) if brotli else None,
+        version=version,
+        built_at=time.monotonic(),
+    )
+    logger.info(
+        f"Built campus directory {content_hash}: {len(campuses_data)} campuses, "
+        f"{len(body)} bytes raw, {len(directory.gzip_body)} gzip"
+    )
+    return directory
+
+
+# "...T03:28:16+00:00" pasted unencoded into a query string arrives as "...T03:28:16 00:00".
+_SPACED_OFFSET = re.compile(r'(?<=\d) (\d{2}(?::?\d{2})?)$')
+
+
+def parse_since(value: str):
+    """
+    Aware datetime for a ``since`` cursor (the ``last_modified`` value handed
+    out by the directory), or None if it is not an ISO 8601 timestamp. A UTC
+    offset whose ``+`` was decoded to a space is accepted.
+    """
+    value = value.strip()
+    parsed = parse_datetime(value) or parse_datetime(_SPACED_OFFSET.sub(r'+\1', value))
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def campus_directory_delta(since):
+    """
+    Campuses changed after ``since`` (an aware datetime), for clients holding an
+    older directory. Deactivated campuses are reported in ``removed_ids``;
+    ``active_ids`` lets clients drop campuses that were deleted outright.
+    """
+    from core.models import Campus
+
+    changed = list(
+        Campus.objects.filter(
+            Q(updated_at__gt=since) | Q(university__updated_at__gt=since)
+        ).select_related('university').order_by('id')
+    )
+    return {
+        'since': since.isoformat(),
+        'last_modified': directory_last_modified(),
+        'campuses': serialize_campuses(
+            campus for campus in changed if campus.is_active
+        ),
+        'removed_ids': [campus.id for campus in changed if not campus.is_active],
+        'active_ids': list(
+            Campus.objects.filter(is_active=True).order_by('id').values_list('id', flat=True)
+        ),
+    }
+
+
+# Per-process artifact, refreshed like the campus spatial index.
+VERSION_CHECK_INTERVAL = 30
+MAX_DIRECTORY_AGE = 600
+
+_directory = None
+_last_checked = 0.0
+_lock = threading.Lock()
+
+
+def get_campus_directory() -> CampusDirectory:
+    """Return this process's directory artifact, rebuilding it if stale."""
+    global _directory, _last_checked
+    now = time.monotonic()
+    if _directory is not None and now - _last_checked < VERSION_CHECK_INTERVAL:
+        return _directory
+
+    with _lock:
+        now = time.monotonic()
+        if _directory is not None and now - _last_checked < VERSION_CHECK_INTERVAL:
+            return _directory
+        version = CampusCache.get_version()
+        if _directory is None or _directory.version != version or now - _directory.built_at > MAX_DIRECTORY_AGE:
+            _directory = build_campus_directory(version)
+        _last_checked = now
+        return _directory
+
+
+def refresh_campus_directory() -> CampusDirectory:
+    """Bump the campus cache version and rebuild this process's artifact immediately."""
+    global _directory, _last_checked
+    version = CampusCache.bump_version()
+    with _lock:
+        _directory = build_campus_directory(version)
+        _last_checked = time.monotonic()
+        return _directory
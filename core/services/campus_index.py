@@ -0,0 +1,144 @@
+"""
+Process-local spatial index over active campus locations.
+
+There are only a few hundred campuses, so the whole set is kept in memory and
+bucketed into a fixed lat/lng grid. Queries visit the grid cells overlapping the
+search radius and refine candidates with the haversine distance, avoiding a
+PostGIS round-trip per request. The index is rebuilt when ``CampusCache``'s
+version changes (any Campus/University save or delete bumps it).
+"""
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from core.cache import CampusCache
+from core.geo import EARTH_RADIUS_KM, haversine_km
+
+logger = logging.getLogger(__name__)
+
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+CELL_DEGREES = 0.5  # ~55 km cells; a 20 km search touches at most 4 of them
+LNG_CELLS = int(360 / CELL_DEGREES)
+
+
+class CampusSpatialIndex:
+    """Grid-bucketed campus points with haversine refinement."""
+
+    def __init__(self, entries, version=None):
+        # entries: iterable of (latitude, longitude, campus_data)
+        self.version = version
+        self.built_at = time.monotonic()
+        self._cells = defaultdict(list)
+        self._size = 0
+        for lat, lng, data in entries:
+            self._cells[self._cell(lat, lng)].append((lat, lng, data))
+            self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def build(cls, version=None):
+        """Load every active campus with a location into a new index."""
+        from core.models import Campus
+        from core.serializers import CampusSerializer, UniversitySerializer
+
+        campuses = Campus.objects.filter(
+            is_active=True,
+            location__isnull=False
+        ).select_related('university')
+
+        universities = {}
+        entries = []
+        for campus in campuses:
+            data = CampusSerializer(campus).data
+            if campus.university_id not in universities:
+                universities[campus.university_id] = UniversitySerializer(campus.university).data
+            data['university'] = universities[campus.university_id]
+            entries.append((campus.latitude, campus.longitude, data))
+
+        index = cls(entries, version=version)
+        logger.info(f"Built campus spatial index with {len(index)} campuses (version {version})")
+        return index
+
+    @staticmethod
+    def _cell(lat: float, lng: float):
+        return (math.floor(lat / CELL_DEGREES), math.floor((lng + 180) / CELL_DEGREES) % LNG_CELLS)
+
+    def _candidate_cells(self, lat: float, lng: float, radius_km: float):
+        lat_span = radius_km / KM_PER_DEGREE
+        min_lat, max_lat = max(lat - lat_span, -90.0), min(lat + lat_span, 90.0)
+        y_range = range(math.floor(min_lat / CELL_DEGREES), math.floor(max_lat / CELL_DEGREES) + 1)
+
+        widest = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+        if widest < 1e-6 or radius_km / (KM_PER_DEGREE * widest) >= 180:
+            x_values = range(LNG_CELLS)
+        else:
+            lng_span = radius_km / (KM_PER_DEGREE * widest)
+            start = math.floor((lng - lng_span + 180) / CELL_DEGREES)
+            end = math.floor((lng + lng_span + 180) / CELL_DEGREES)
+            x_values = {x % LNG_CELLS for x in range(start, end + 1)}
+
+        for y in y_range:
+            for x in x_values:
+                bucket = self._cells.get((y, x))
+                if bucket:
+                    yield bucket
+
+    def nearby(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Campuses within ``radius_km``, closest first, each with a ``distance_km`` key."""
+        matches = []
+        for bucket in self._candidate_cells(lat, lng, radius_km):
+            for campus_lat, campus_lng, data in bucket:
+                distance = haversine_km(lat, lng, campus_lat, campus_lng)
+                if distance <= radius_km:
+                    matches.append((distance, data))
+        matches.sort(key=lambda match: match[0])
+        if limit is not None:
+            matches = matches[:limit]
+        return [{**data, 'distance_km': round(distance, 2)} for distance, data in matches]
+
+    def nearest(self, lat: float, lng: float, radius_km: float) -> Optional[Dict[str, Any]]:
+        """The closest campus within ``radius_km``, or None."""
+        results = self.nearby(lat, lng, radius_km, limit=1)
+        return results[0] if results else None
+
+
+# Per-process singleton. The shared version counter is consulted at most every
+# VERSION_CHECK_INTERVAL seconds; MAX_INDEX_AGE bounds staleness when the cache
+# backend is not shared between processes.
+VERSION_CHECK_INTERVAL = 30
+MAX_INDEX_AGE = 600
+
+_index = None
+_last_checked = 0.0
+_lock = threading.Lock()
+
+
+def get_campus_index() -> CampusSpatialIndex:
+    """Return the current process's campus index, rebuilding it if stale."""
+    global _index, _last_checked
+    now = time.monotonic()
+    if _index is not None and now - _last_checked < VERSION_CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        now = time.monotonic()
+        if _index is not None and now - _last_checked < VERSION_CHECK_INTERVAL:
+            return _index
+        version = CampusCache.get_version()
+        if _index is None or _index.version != version or now - _index.built_at > MAX_INDEX_AGE:
+            _index = CampusSpatialIndex.build(version)
+        _last_checked = now
+        return _index
+
+
+def reset_campus_index():
+    """Drop this process's index so the next lookup rebuilds it."""
+    global _index, _last_checked
+    with _lock:
+        _index = None
+        _last_checked = 0.0
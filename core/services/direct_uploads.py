@@ -0,0 +1,292 @@
+"""
+Direct-to-storage image uploads.
+
+Instead of streaming image bytes through the web workers, a client:
+
+1. asks for upload slots (``create_upload_slots``): one presigned S3/R2 ``PUT``
+   URL per file, plus a signed token naming the object key it may write;
+2. PUTs each file straight to storage;
+3. confirms the tokens (``confirm_uploads``). The server checks every object's
+   size, content type and leading bytes with a HEAD and a 16-byte ranged GET,
+   deletes objects that fail, and queues the rest on django-q.
+
+The queued task (``attach_confirmed_uploads``) runs
+``core.image_uploads.sanitize_stored`` on each object (EXIF/GPS stripping and
+the pixel limits, rewriting the object in place when needed), so no image
+bytes pass through the web workers, and creates rows only for the objects
+that pass, with one ``bulk_create``.
+
+Object keys are generated server-side under the image model's ``upload_to``
+directory, so confirmed rows look exactly like form uploads.
+"""
+import logging
+import posixpath
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django_q.tasks import async_task
+
+from core.image_uploads import sanitize_stored
+from core.services.media_ingest import attach_images, delete_files
+
+logger = logging.getLogger(__name__)
+
+# target -> (image model, parent foreign key)
+UPLOAD_TARGETS = {
+    'product': ('marketplace.ProductImage', 'product'),
+    'property': ('estates.PropertyImage', 'property'),
+}
+ALLOWED_CONTENT_TYPES = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/webp': 'webp',
+}
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MAX_SLOTS = 10
+SLOT_TTL = 15 * 60  # presigned URL lifetime, seconds
+CONFIRM_TTL = 60 * 60  # how long a token can still be confirmed
+SIGNING_SALT = 'core.direct_uploads'
+
+
+class DirectUploadError(ValueError):
+    """A slot request or confirmation was rejected; the message is client-facing."""
+
+
+class DirectUploadUnavailable(DirectUploadError):
+    """The configured storage cannot presign uploads (e.g. local FileSystemStorage)."""
+
+
+@dataclass
+class UploadSlot:
+    name: str
+    upload_url: str
+    headers: Dict[str, str]
+    token: str
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'upload_url': self.upload_url,
+            'method': 'PUT',
+            'headers': self.headers,
+            'token': self.token,
+            'expires_in': SLOT_TTL,
+        }
+
+
+def _s3(storage):
+    if not hasattr(storage, 'bucket'):
+        raise DirectUploadUnavailable('Direct uploads are not available on this storage backend.')
+    return storage.bucket.meta.client, storage.bucket_name
+
+
+def _object_key(storage, name: str) -> str:
+    location = getattr(storage, 'location', '') or ''
+    return posixpath.join(location, name) if location else name
+
+
+def _image_model(target: str):
+    if target not in UPLOAD_TARGETS:
+        raise DirectUploadError(f"Unknown upload target '{target}'.")
+    model_label, parent_field = UPLOAD_TARGETS[target]
+    return apps.get_model(model_label), parent_field
+
+
+def create_upload_slots(target: str, user_id: int, parent_id: int, files: List[dict],
+                        storage=None) -> List[UploadSlot]:
+    """
+    One presigned PUT per entry of ``files`` (``{'content_type': ..., 'size': ...}``).
+    The signed headers must be sent with the PUT exactly as returned.
+    """
+    storage = storage or default_storage
+    client, bucket = _s3(storage)
+    model, _ = _image_model(target)
+
+    if not isinstance(files, list) or not files:
+        raise DirectUploadError('files must be a non-empty list.')
+    if len(files) > MAX_SLOTS:
+        raise DirectUploadError(f'At most {MAX_SLOTS} images can be uploaded at once.')
+
+    upload_to = model._meta.get_field('image').upload_to
+    slots = []
+    for entry in files:
+        if not isinstance(entry, dict):
+            raise DirectUploadError('Each file must be an object with content_type and size.')
+        content_type = entry.get('content_type')
+        if content_type not in ALLOWED_CONTENT_TYPES:
+            raise DirectUploadError(
+                f"content_type must be one of {', '.join(sorted(ALLOWED_CONTENT_TYPES))}."
+            )
+        try:
+            size = int(entry.get('size'))
+        except (TypeError, ValueError):
+            raise DirectUploadError('size must be an integer number of bytes.')
+        if not 0 < size <= MAX_UPLOAD_BYTES:
+            raise DirectUploadError(f'Images must be at most {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.')
+
+        name = posixpath.join(upload_to, f'{uuid.uuid4().hex}.{ALLOWED_CONTENT_TYPES[content_type]}')
+        params = {'Bucket': bucket, 'Key': _object_key(storage, name), 'ContentType': content_type}
+        headers = {'Content-Type': content_type}
+        cache_control = getattr(settings, 'AWS_S3_OBJECT_PARAMETERS', {}).get('CacheControl')
+        if cache_control:
+            params['CacheControl'] = headers['Cache-Control'] = cache_control
+        if getattr(storage, 'default_acl', None):
+            params['ACL'] = headers['x-amz-acl'] = storage.default_acl
+
+        url = client.generate_presigned_url('put_object', Params=params, ExpiresIn=SLOT_TTL, HttpMethod='PUT')
+        token = signing.dumps(
+            {'t': target, 'u': user_id, 'p': parent_id, 'n': name, 'c': content_type},
+            salt=SIGNING_SALT
+        )
+        slots.append(UploadSlot(name=name, upload_url=url, headers=headers, token=token))
+    return slots
+
+
+def read_token(token: str, target: str, user_id: int, parent_id: int) -> dict:
+    """Decode a slot token, checking it was issued for this user and listing."""
+    try:
+        payload = signing.loads(token, salt=SIGNING_SALT, max_age=CONFIRM_TTL)
+    except signing.SignatureExpired:
+        raise DirectUploadError('Upload token has expired.')
+    except signing.BadSignature:
+        raise DirectUploadError('Invalid upload token.')
+    if (payload.get('t'), payload.get('u'), payload.get('p')) != (target, user_id, parent_id):
+        raise DirectUploadError('Upload token was issued for a different listing.')
+    return payload
+
+
+def _looks_like(content_type: str, head: bytes) -> bool:
+    if content_type == 'image/jpeg':
+        return head.startswith(b'\xff\xd8\xff')
+    if content_type == 'image/png':
+        return head.startswith(b'\x89PNG\r\n\x1a\n')
+    if content_type == 'image/webp':
+        return head[:4] == b'RIFF' and head[8:12] == b'WEBP'
+    return False
+
+
+def verify_upload(storage, name: str, content_type: str) -> Optional[str]:
+    """
+    Check the stored object against its slot; returns None when it is good, or
+    the rejection reason after deleting the object.
+    """
+    client, bucket = _s3(storage)
+    key = _object_key(storage, name)
+    try:
+        meta = client.head_object(Bucket=bucket, Key=key)
+    except client.exceptions.ClientError:
+        return 'File was not uploaded.'
+
+    reason = None
+    if not 0 < meta['ContentLength'] <= MAX_UPLOAD_BYTES:
+        reason = f'Images must be at most {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.'
+    elif meta.get('ContentType') != content_type:
+        reason = 'Uploaded content type does not match the upload slot.'
+    else:
+        head = client.get_object(Bucket=bucket, Key=key, Range='bytes=0-15')['Body'].read()
+        if not _looks_like(content_type, head):
+            reason = 'Uploaded file is not a valid image.'
+
+    if reason:
+        client.delete_object(Bucket=bucket, Key=key)
+        logger.warning(f"Rejected direct upload {name}: {reason}")
+    return reason
+
+
+def confirm_uploads(target: str, user_id: int, parent, tokens: List[str],
+                    storage=None) -> Tuple[List[str], List[dict]]:
+    """
+    Verify uploaded objects and queue them to be sanitized and attached to
+    ``parent``. Returns ``(queued_names, rejected)``, where each rejection is
+    ``{'token': ..., 'error': ...}``. Re-confirming an attached token is a no-op.
+    """
+    storage = storage or default_storage
+    _s3(storage)
+    model, parent_field = _image_model(target)
+
+    if not isinstance(tokens, list) or not tokens:
+        raise DirectUploadError('tokens must be a non-empty list.')
+    if len(tokens) > MAX_SLOTS:
+        raise DirectUploadError(f'At most {MAX_SLOTS} images can be confirmed at once.')
+
+    accepted, rejected = [], []
+    for token in tokens:
+        try:
+            accepted.append((token, read_token(token, target, user_id, parent.pk)))
+        except DirectUploadError as e:
+            rejected.append({'token': token, 'error': str(e)})
+
+    already = set(
+        model.objects.filter(image__in=[payload['n'] for _, payload in accepted]).values_list('image', flat=True)
+    )
+    verified = []
+    for token, payload in accepted:
+        if payload['n'] in already or payload['n'] in verified:
+            continue
+        try:
+            reason = verify_upload(storage, payload['n'], payload['c'])
+        except Exception as e:
+            logger.error(f"Could not verify direct upload {payload['n']}: {e}")
+            reason = 'Upload could not be verified; please try again.'
+        if reason:
+            rejected.append({'token': token, 'error': reason})
+        else:
+            verified.append(payload['n'])
+
+    if not verified:
+        return [], rejected
+
+    parent_id = parent.pk
+    transaction.on_commit(lambda: async_task(
+        'core.tasks.attach_direct_uploads', target, parent_id, verified
+    ))
+    logger.info(f"Queued {len(verified)} direct uploads for {target} {parent_id}")
+    return verified, rejected
+
+
+def sanitize_confirmed(storage, names: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Run ``sanitize_stored`` on each object; returns ``(clean_names, rejected)``
+    where ``rejected`` maps a name to its reason. Objects that fail, including
+    on a storage error, are deleted.
+    """
+    clean, rejected = [], {}
+    for name in names:
+        # Originals are public, so EXIF/GPS and the size limits apply here too.
+        try:
+            reason = sanitize_stored(storage, name)
+        except Exception as e:
+            logger.error(f"Could not sanitize direct upload {name}: {e}")
+            delete_files(storage, [name])
+            reason = 'Upload could not be processed.'
+        if reason:
+            rejected[name] = reason
+        else:
+            clean.append(name)
+    return clean, rejected
+
+
+def attach_confirmed_uploads(target: str, parent_id: int, names: List[str], storage=None) -> list:
+    """
+    Sanitize confirmed objects and create image rows for the ones that pass.
+    Names that already have a row (a repeated confirmation) are skipped.
+    """
+    storage = storage or default_storage
+    model, parent_field = _image_model(target)
+    parent = model._meta.get_field(parent_field).related_model.objects.filter(pk=parent_id).first()
+    if parent is None:
+        delete_files(storage, names)
+        logger.info(f"Dropped {len(names)} direct uploads for deleted {target} {parent_id}")
+        return []
+
+    already = set(model.objects.filter(image__in=names).values_list('image', flat=True))
+    clean, rejected = sanitize_confirmed(storage, [name for name in names if name not in already])
+    images = attach_images(model, parent_field, parent, clean)
+    logger.info(f"Attached {len(images)} direct uploads for {target} {parent_id}, rejected {len(rejected)}")
+    return images
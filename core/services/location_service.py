@@ -7,8 +7,12 @@ from django.db.models import Q
 from django.utils import timezone
 from django.core.cache import cache
 
-from core.models import University, Location, Campus
-# Distance calculations now handled by frontend - simplified approach
+from core.cache import CampusCache, LocationCache
+from core.geo import haversine_km
+from core.media import media_url
+from core.models import University, Campus
+from core.serializers import CampusSerializer, UniversitySerializer
+from core.services.campus_index import get_campus_index
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +40,7 @@ class LocationService:
                 'description': uni.description,
                 'location': uni.location,
                 'website': uni.website,
-                'logo': uni.logo.url if uni.logo else None,
+                'logo': media_url(uni.logo),
             }
             for uni in universities
         ]
@@ -62,7 +66,7 @@ class LocationService:
                 'description': university.description,
                 'location': university.location,
                 'website': university.website,
-                'logo': university.logo.url if university.logo else None,
+                'logo': media_url(university.logo),
             }
             cache.set(cache_key, data, LocationService.CACHE_TIMEOUT)
             return data
@@ -109,22 +113,8 @@ class LocationService:
         radius_km: float = 20
     ) -> Optional[Dict[str, Any]]:
         """Find the nearest campus within the specified radius."""
-        cache_key = f'nearest_campus_{latitude}_{longitude}_{radius_km}'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-
-        campuses = Campus.objects.filter(
-            is_active=True,
-            location__isnull=False
-        ).select_related('university')
-
-        # Distance calculations now handled by frontend - simplified approach
-        result = None
-
-        cache.set(cache_key, result, LocationService.CACHE_TIMEOUT)
-        return result
+        # The in-memory index answers in microseconds, so results are not cached.
+        return get_campus_index().nearest(latitude, longitude, radius_km)
 
     @staticmethod
     def get_nearby_content(
@@ -223,16 +213,68 @@ class LocationService:
                 context['user_universities'] = [nearest_campus['university']['id']]
 
         if university_ids:
-            # Get university details
-            universities = []
-            for uni_id in university_ids:
-                uni_data = LocationService.get_university_by_id(uni_id)
-                if uni_data:
-                    universities.append(uni_data)
-            context['user_universities'] = universities
+            universities = University.objects.filter(id__in=university_ids, is_active=True).order_by('name')
+            context['user_universities'] = UniversitySerializer(universities, many=True).data
 
         return context
 
+    @staticmethod
+    def _build_user_context(user_id: int) -> Dict[str, Any]:
+        """Profile campuses and their universities, read in a single query."""
+        campuses = Campus.objects.filter(
+            profiles__user_id=user_id
+        ).select_related('university').order_by('id')
+
+        campuses_data = []
+        universities = {}
+        for campus in campuses:
+            if campus.university_id not in universities:
+                universities[campus.university_id] = UniversitySerializer(campus.university).data
+            campuses_data.append(CampusSerializer(campus).data)
+
+        return {
+            'campus_version': CampusCache.get_version(),
+            'campuses': campuses_data,
+            'universities': list(universities.values()),
+        }
+
+    @staticmethod
+    def get_user_context(
+        user,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius_km: float = 20
+    ) -> Dict[str, Any]:
+        """
+        Location context for a user: their profile campuses and universities
+        (cached per user in ``LocationCache`` until the profile's campuses or
+        any campus data change), plus, when a position is given, the campus
+        detected at that position and which profile campus is closest to it.
+        """
+        context = LocationCache.get_user_location(user.id)
+        if context is None or context.get('campus_version') != CampusCache.get_version():
+            context = LocationService._build_user_context(user.id)
+            LocationCache.set_user_location(user.id, context)
+
+        primary_campus = context['campuses'][0] if context['campuses'] else None
+        detected_campus = None
+        if latitude is not None and longitude is not None:
+            detected_campus = LocationService.find_nearest_campus(latitude, longitude, radius_km)
+            located = [c for c in context['campuses'] if c['latitude'] is not None]
+            if located:
+                primary_campus = min(
+                    located,
+                    key=lambda c: haversine_km(latitude, longitude, c['latitude'], c['longitude'])
+                )
+
+        return {
+            'campuses': context['campuses'],
+            'universities': context['universities'],
+            'primary_campus_id': primary_campus['id'] if primary_campus else None,
+            'detected_campus': detected_campus,
+            'has_location_info': bool(context['campuses']),
+        }
+
     @staticmethod
     def clear_location_cache():
         """Clear all location-related cache."""
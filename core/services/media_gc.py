@@ -0,0 +1,263 @@
+"""
+Garbage collection of orphaned media.
+
+``django_cleanup`` removes files when their row is deleted, but failed
+multi-image creates, replaced files on rolled-back transactions and
+unconfirmed direct uploads still leave objects behind. The collector finds
+them without holding either side in memory:
+
+* every file name referenced by a ``FileField`` in the project's models (and
+  every recorded image rendition) is streamed from the database into an
+  on-disk SQLite table, whose primary key keeps it sorted;
+* the bucket is listed page by page, one managed prefix at a time (S3 lists
+  keys in UTF-8 byte order, the same order as SQLite's BINARY collation);
+* the two sorted streams are merge-diffed, and orphans older than a grace
+  period are deleted with batched ``DeleteObjects`` calls.
+
+Only prefixes the project writes to (the fields' ``upload_to`` directories
+and ``derivatives/``) are scanned.
+"""
+import logging
+import os
+import sqlite3
+import tempfile
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
+
+from core.images import DERIVATIVE_ROOT, IMAGE_SOURCES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_AGE = timedelta(hours=24)
+DB_CHUNK_SIZE = 2000
+DELETE_BATCH_SIZE = 1000  # S3 DeleteObjects limit
+SAMPLE_SIZE = 20
+
+
+class StoredObject(NamedTuple):
+    name: str
+    size: int
+    last_modified: Optional[object]
+
+
+@dataclass
+class OrphanReport:
+    prefixes: List[str]
+    referenced: int = 0
+    scanned: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    recent: int = 0
+    deleted: int = 0
+    dry_run: bool = True
+    sample: List[str] = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            'prefixes': self.prefixes,
+            'referenced': self.referenced,
+            'scanned': self.scanned,
+            'orphans': self.orphans,
+            'orphan_bytes': self.orphan_bytes,
+            'recent': self.recent,
+            'deleted': self.deleted,
+            'dry_run': self.dry_run,
+        }
+
+
+def file_fields():
+    """``(model, field)`` for every FileField/ImageField on the project's concrete models."""
+    return [
+        (model, model_field)
+        for model in apps.get_models()
+        if not model._meta.proxy
+        for model_field in model._meta.concrete_fields
+        if isinstance(model_field, models.FileField)
+    ]
+
+
+def managed_prefixes(extra=None) -> List[str]:
+    """Storage prefixes written by the project's file fields and derivatives."""
+    prefixes = {f'{DERIVATIVE_ROOT}/'}
+    for _, model_field in file_fields():
+        if isinstance(model_field.upload_to, str) and model_field.upload_to.strip('/'):
+            directory = model_field.upload_to.split('%')[0].strip('/')
+            prefixes.add(f'{directory}/')
+    prefixes.update(extra or [])
+    return sorted(prefixes)
+
+
+def referenced_names() -> Iterator[str]:
+    """Stream every stored file name the database points at."""
+    for model, model_field in file_fields():
+        names = model._default_manager.exclude(
+            **{f'{model_field.name}__isnull': True}
+        ).exclude(
+            **{model_field.name: ''}
+        ).values_list(model_field.name, flat=True)
+        yield from names.iterator(chunk_size=DB_CHUNK_SIZE)
+
+    for model_label, (_, variants_field) in IMAGE_SOURCES.items():
+        model = apps.get_model(model_label)
+        rows = model._default_manager.exclude(**{variants_field: {}}).values_list(variants_field, flat=True)
+        for variants in rows.iterator(chunk_size=DB_CHUNK_SIZE):
+            for entry in (variants or {}).get('sizes', {}).values():
+                for key in ('webp', 'jpeg'):
+                    if entry.get(key):
+                        yield entry[key]
+
+
+class SortedNameSet:
+    """An on-disk set of names, iterable in UTF-8 byte order."""
+
+    def __init__(self, directory):
+        self.connection = sqlite3.connect(os.path.join(directory, 'names.sqlite3'))
+        self.connection.execute('PRAGMA journal_mode = OFF')
+        self.connection.execute('PRAGMA synchronous = OFF')
+        self.connection.execute('CREATE TABLE names (name TEXT PRIMARY KEY) WITHOUT ROWID')
+
+    def add_all(self, names: Iterable[str], chunk_size: int = DB_CHUNK_SIZE) -> int:
+        batch = []
+        for name in names:
+            batch.append((name,))
+            if len(batch) >= chunk_size:
+                self.connection.executemany('INSERT OR IGNORE INTO names VALUES (?)', batch)
+                batch = []
+        if batch:
+            self.connection.executemany('INSERT OR IGNORE INTO names VALUES (?)', batch)
+        self.connection.commit()
+        return self.connection.execute('SELECT count(*) FROM names').fetchone()[0]
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        # Every name starting with ``prefix`` sorts in [prefix, prefix + U+10FFFF).
+        cursor = self.connection.execute(
+            'SELECT name FROM names WHERE name >= ? AND name < ? ORDER BY name',
+            (prefix, prefix + '\U0010ffff')
+        )
+        for (name,) in cursor:
+            yield name
+
+    def close(self):
+        self.connection.close()
+
+
+def _key_prefix(storage) -> str:
+    location = (getattr(storage, 'location', '') or '').strip('/')
+    return f'{location}/' if location and hasattr(storage, 'bucket') else ''
+
+
+def list_stored(storage, prefix: str, workdir: str) -> Iterator[StoredObject]:
+    """
+    Objects under ``prefix`` in name order. S3 listings are streamed page by
+    page; other storages are walked into a temporary sorted set first.
+    """
+    if hasattr(storage, 'bucket'):
+        client = storage.bucket.meta.client
+        key_prefix = _key_prefix(storage)
+        paginator = client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=storage.bucket_name, Prefix=key_prefix + prefix):
+            for entry in page.get('Contents', []):
+                yield StoredObject(entry['Key'][len(key_prefix):], entry['Size'], entry['LastModified'])
+        return
+
+    if not storage.exists(prefix.rstrip('/')):
+        return
+    names = SortedNameSet(tempfile.mkdtemp(dir=workdir))
+    try:
+        names.add_all(_walk(storage, prefix.rstrip('/')))
+        for name in names.iter_prefix(prefix):
+            yield StoredObject(name, storage.size(name), storage.get_modified_time(name))
+    finally:
+        names.close()
+
+
+def _walk(storage, directory):
+    subdirectories, files = storage.listdir(directory)
+    for name in files:
+        yield f'{directory}/{name}'
+    for subdirectory in subdirectories:
+        yield from _walk(storage, f'{directory}/{subdirectory}')
+
+
+def diff_sorted(stored: Iterable[StoredObject], referenced: Iterable[str]) -> Iterator[StoredObject]:
+    """Stored objects whose name is not in ``referenced``; both inputs must be sorted."""
+    referenced = iter(referenced)
+    current = next(referenced, None)
+    for obj in stored:
+        while current is not None and current < obj.name:
+            current = next(referenced, None)
+        if current != obj.name:
+            yield obj
+
+
+def delete_objects(storage, names: List[str]) -> int:
+    if not names:
+        return 0
+    if hasattr(storage, 'bucket'):
+        client = storage.bucket.meta.client
+        key_prefix = _key_prefix(storage)
+        response = client.delete_objects(
+            Bucket=storage.bucket_name,
+            Delete={'Objects': [{'Key': key_prefix + name} for name in names], 'Quiet': True},
+        )
+        errors = response.get('Errors', [])
+        for error in errors[:5]:
+            logger.warning(f"Could not delete {error.get('Key')}: {error.get('Message')}")
+        return len(names) - len(errors)
+    for name in names:
+        storage.delete(name)
+    return len(names)
+
+
+def collect_orphaned_media(storage=None, delete: bool = False, min_age: timedelta = DEFAULT_MIN_AGE,
+                           prefixes: Optional[List[str]] = None) -> OrphanReport:
+    """
+    Find (and with ``delete``, remove) stored objects no row references.
+    Objects younger than ``min_age`` are never deleted, so in-flight uploads
+    and uncommitted transactions are left alone.
+    """
+    storage = storage or default_storage
+    report = OrphanReport(prefixes=prefixes or managed_prefixes(), dry_run=not delete)
+    cutoff = timezone.now() - min_age
+
+    with tempfile.TemporaryDirectory(prefix='media-gc-') as workdir:
+        referenced = SortedNameSet(workdir)
+        try:
+            report.referenced = referenced.add_all(referenced_names())
+            for prefix in report.prefixes:
+                batch = []
+                for obj in diff_sorted(_counted(list_stored(storage, prefix, workdir), report), referenced.iter_prefix(prefix)):
+                    if obj.last_modified is not None and obj.last_modified > cutoff:
+                        report.recent += 1
+                        continue
+                    report.orphans += 1
+                    report.orphan_bytes += obj.size
+                    if len(report.sample) < SAMPLE_SIZE:
+                        report.sample.append(obj.name)
+                    if delete:
+                        batch.append(obj.name)
+                        if len(batch) >= DELETE_BATCH_SIZE:
+                            report.deleted += delete_objects(storage, batch)
+                            batch = []
+                report.deleted += delete_objects(storage, batch)
+        finally:
+            referenced.close()
+
+    logger.info(
+        f"Orphaned media{' (dry run)' if report.dry_run else ''}: scanned {report.scanned}, "
+        f"referenced {report.referenced}, orphans {report.orphans} ({report.orphan_bytes} bytes), "
+        f"deleted {report.deleted}, {report.recent} too recent"
+    )
+    return report
+
+
+def _counted(objects, report):
+    for obj in objects:
+        report.scanned += 1
+        yield obj
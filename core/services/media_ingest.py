@@ -0,0 +1,133 @@
+"""
+Bulk ingestion of uploaded listing images.
+
+``ingest_images`` uploads every file to storage concurrently on a bounded
+thread pool, then inserts the image rows with a single ``bulk_create`` and
+marks one primary image, instead of one ``Model.objects.create`` (a blocking
+upload plus the primary-image bookkeeping queries) per file. If any upload or
+the insert fails, the objects already written are deleted before the error is
+re-raised. Objects left behind by a rollback of an enclosing transaction are
+picked up by the orphaned-media collector.
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from django.core.files.storage import default_storage, storages
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_WORKERS = 4
+
+_local = threading.local()
+
+
+class MediaIngestError(Exception):
+    """An upload failed; nothing from the batch was kept."""
+
+
+def _worker_storage(storage):
+    # boto3 resources are not thread-safe, so each worker gets its own
+    # instance of the default storage (and with it its own S3 resource).
+    if storage is not default_storage:
+        return storage
+    if not hasattr(_local, 'storage'):
+        _local.storage = storages.create_storage(storages.backends['default'])
+    return _local.storage
+
+
+def unique_upload_names(field, instance, filenames) -> List[str]:
+    """
+    Storage names for ``filenames`` under ``field``'s ``upload_to``, each with a
+    random suffix. Names are fixed here, before the parallel saves, because
+    ``get_available_name`` only checks ``exists()`` and does not reserve the name:
+    two uploads both called ``image.jpg`` would otherwise race to the same key.
+    """
+    names = []
+    for filename in filenames:
+        stem, extension = os.path.splitext(os.path.basename(filename or 'image'))
+        names.append(field.generate_filename(instance, f'{stem or "image"}-{uuid.uuid4().hex[:12]}{extension}'))
+    return names
+
+
+def upload_files(storage, names_and_files, max_workers: int = MAX_UPLOAD_WORKERS) -> List[str]:
+    """
+    Save ``(name, file)`` pairs concurrently; returns the stored names in
+    input order. On any failure the files that were saved are deleted and
+    MediaIngestError is raised.
+    """
+    if not names_and_files:
+        return []
+
+    def save(item):
+        name, content = item
+        return _worker_storage(storage).save(name, content)
+
+    saved, errors = [], []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names_and_files))) as pool:
+        futures = [pool.submit(save, item) for item in names_and_files]
+        for future in futures:
+            try:
+                saved.append(future.result())
+            except Exception as e:
+                errors.append(e)
+
+    if errors:
+        delete_files(storage, saved)
+        logger.error(f"Image upload failed, removed {len(saved)} uploaded files: {errors[0]}")
+        raise MediaIngestError(str(errors[0])) from errors[0]
+    return saved
+
+
+def delete_files(storage, names) -> None:
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete {name}: {e}")
+
+
+def attach_images(model, parent_field: str, parent, names: List[str], has_primary: Optional[bool] = None) -> list:
+    """
+    Insert image rows for already stored ``names`` with one ``bulk_create``.
+    The first new image becomes primary when ``parent`` has none; pass
+    ``has_primary`` when the caller already knows (e.g. a just-created listing).
+    """
+    from core.tasks import enqueue_image_derivatives
+
+    if not names:
+        return []
+    with transaction.atomic():
+        if has_primary is None:
+            has_primary = model.objects.filter(**{parent_field: parent, 'is_primary': True}).exists()
+        images = model.objects.bulk_create([
+            model(**{parent_field: parent, 'image': name, 'is_primary': not has_primary and index == 0})
+            for index, name in enumerate(names)
+        ])
+        # bulk_create skips post_save, which normally queues the renditions.
+        for image in images:
+            enqueue_image_derivatives(image)
+    return images
+
+
+def ingest_images(model, parent_field: str, parent, files, has_primary: Optional[bool] = None,
+                  max_workers: int = MAX_UPLOAD_WORKERS) -> list:
+    """Upload ``files`` concurrently and attach them to ``parent`` as ``model`` rows."""
+    if not files:
+        return []
+    field = model._meta.get_field('image')
+    storage = field.storage
+    names = unique_upload_names(field, model(**{parent_field: parent}), [upload.name for upload in files])
+    names_and_files = list(zip(names, files))
+    names = upload_files(storage, names_and_files, max_workers=max_workers)
+    try:
+        images = attach_images(model, parent_field, parent, names, has_primary=has_primary)
+    except Exception:
+        delete_files(storage, names)
+        raise
+    logger.info(f"Ingested {len(images)} images for {model._meta.label} {parent.pk}")
+    return images
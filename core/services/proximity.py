@@ -0,0 +1,111 @@
+"""
+Proximity feeds: listings ranked by how close their nearest campus is.
+
+Listings have no coordinates of their own; they are attached to campuses
+through the ``ProductCampus`` / ``PropertyCampus`` feed tables. A feed request
+first asks PostGIS for the campuses nearest the origin with a KNN (``<->``)
+ordered query, which walks the GiST index on ``Campus.location`` instead of
+computing a distance for every campus. It then reads each campus's feed rows,
+nearest campus first, until a fixed row budget is spent. A listing's distance
+is that of its nearest campus.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from django.contrib.gis.db import models as gis_models
+from django.contrib.gis.geos import Point
+from django.db.models import F, FloatField, Func, Value
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RADIUS_KM = 20
+MAX_RADIUS_KM = 100
+MAX_CAMPUSES = 10  # campuses considered per request
+MAX_FEED_ROWS = 500  # feed rows read per request, across all campuses
+
+
+class KNNDistance(Func):
+    """PostGIS ``<->`` operator; ordering by it is served by the GiST index."""
+    arg_joiner = ' <-> '
+    template = '%(expressions)s'
+    output_field = FloatField()
+
+
+def parse_origin(query_params, profile=None) -> Tuple[float, float, float]:
+    """
+    Resolve ``(lat, lng, radius_km)`` from ``lat``/``lng``/``radius`` query
+    params, falling back to the first located campus on the user's profile.
+    Raises ValueError with a client-facing message when neither is usable.
+    """
+    try:
+        radius = float(query_params.get('radius', DEFAULT_RADIUS_KM))
+    except (TypeError, ValueError):
+        raise ValueError('radius must be a valid number.')
+    if not 0 < radius <= MAX_RADIUS_KM:
+        raise ValueError(f'radius must be between 0 and {MAX_RADIUS_KM} km.')
+
+    if 'lat' in query_params or 'lng' in query_params:
+        try:
+            lat = float(query_params.get('lat'))
+            lng = float(query_params.get('lng'))
+        except (TypeError, ValueError):
+            raise ValueError('lat and lng must be valid numbers.')
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError('lat and lng are out of range.')
+        return lat, lng, radius
+
+    campus = None
+    if profile is not None:
+        campus = profile.campuses.filter(location__isnull=False).order_by('id').first()
+    if campus is None:
+        raise ValueError('Provide lat and lng, or add a campus to your profile.')
+    return campus.location.y, campus.location.x, radius
+
+
+def nearest_campuses(lat: float, lng: float, radius_km: float, limit: int = MAX_CAMPUSES) -> List[Tuple[int, float]]:
+    """``(campus_id, distance_km)`` of the closest active campuses within ``radius_km``."""
+    from core.models import Campus
+
+    origin = Value(Point(lng, lat, srid=4326), output_field=gis_models.PointField(geography=True))
+    rows = Campus.objects.filter(
+        is_active=True,
+        location__isnull=False
+    ).annotate(
+        knn=KNNDistance(F('location'), origin)
+    ).order_by('knn').values_list('id', 'knn')[:limit]
+    return [(campus_id, meters / 1000) for campus_id, meters in rows if meters / 1000 <= radius_km]
+
+
+def ranked_feed(link_model, listing_field: str, flag_field: str, campuses, max_rows: int = MAX_FEED_ROWS) -> List[Tuple[int, float]]:
+    """
+    Listing ids from ``link_model`` rows flagged ``flag_field=True`` at the given
+    campuses, as ``(listing_id, distance_km)`` ordered by distance then recency.
+    At most ``max_rows`` feed rows are read; each campus is one LIMITed scan of
+    its (campus, flag, -created_at) feed index.
+    """
+    listing_attname = f'{listing_field}_id'
+    budget = max_rows
+    seen = set()
+    ranked = []
+    for campus_id, distance in campuses:
+        if budget <= 0:
+            break
+        listing_ids = list(
+            link_model.objects.filter(
+                campus_id=campus_id,
+                **{flag_field: True}
+            ).order_by('-created_at').values_list(listing_attname, flat=True)[:budget]
+        )
+        budget -= len(listing_ids)
+        for listing_id in listing_ids:
+            if listing_id not in seen:
+                seen.add(listing_id)
+                ranked.append((listing_id, round(distance, 2)))
+    return ranked
+
+
+def proximity_feed(link_model, listing_field: str, flag_field: str, lat: float, lng: float,
+                   radius_km: float, max_rows: Optional[int] = None) -> List[Tuple[int, float]]:
+    """Nearest campuses to the origin, then their ranked, capped feed."""
+    campuses = nearest_campuses(lat, lng, radius_km)
+    return ranked_feed(link_model, listing_field, flag_field, campuses, max_rows or MAX_FEED_ROWS)
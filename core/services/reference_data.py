@@ -0,0 +1,288 @@
+"""
+Bulk loader for the university/campus reference data.
+
+The data lives in a versioned fixture (``core/data/campuses.json`` by default,
+or a CSV export of the same shape). Loading diffs the fixture against the
+existing rows, fetched with one query per table, and writes only the rows that
+are new or changed with ``bulk_create(update_conflicts=True)`` inside a single
+transaction. Re-running an unchanged fixture writes nothing. When something did
+change, the campus cache version is bumped once and the campus directory is
+rebuilt, instead of per-row signal churn.
+"""
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.db import transaction
+
+from core.models import Campus, University
+from core.services.campus_directory import refresh_campus_directory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURE = Path(settings.BASE_DIR) / 'core' / 'data' / 'campuses.json'
+DEFAULT_RADIUS_KM = Decimal('5.00')
+COORDINATE_PLACES = 6
+
+CSV_COLUMNS = [
+    'university', 'short_name', 'university_latitude', 'university_longitude',
+    'radius_km', 'campus', 'address', 'latitude', 'longitude',
+]
+
+
+class ReferenceDataError(ValueError):
+    """The fixture is malformed; nothing has been written."""
+
+
+@dataclass
+class ReferenceLoadResult:
+    version: str
+    universities_created: int = 0
+    universities_updated: int = 0
+    campuses_created: int = 0
+    campuses_updated: int = 0
+    campuses_deactivated: int = 0
+    universities_deactivated: int = 0
+    unchanged: int = 0
+    dry_run: bool = False
+    changed_names: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self):
+        return any([
+            self.universities_created, self.universities_updated,
+            self.campuses_created, self.campuses_updated,
+            self.campuses_deactivated, self.universities_deactivated,
+        ])
+
+
+def read_fixture(path, version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read a JSON or CSV fixture into ``{'version': ..., 'universities': [...]}``.
+
+    CSV files have one row per campus (see ``CSV_COLUMNS``); a row with an empty
+    ``campus`` only declares the university. CSV carries no version of its own,
+    so ``version`` defaults to the file name.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise ReferenceDataError(f"Fixture {path} does not exist")
+
+    if path.suffix.lower() == '.csv':
+        data = {'version': version or path.stem, 'universities': _read_csv(path)}
+    else:
+        try:
+            with path.open(encoding='utf-8') as fh:
+                data = json.load(fh)
+        except json.JSONDecodeError as e:
+            raise ReferenceDataError(f"Invalid JSON in {path}: {e}")
+        if version:
+            data['version'] = version
+
+    validate_fixture(data)
+    return data
+
+
+def _read_csv(path: Path) -> List[Dict[str, Any]]:
+    universities = {}
+    with path.open(encoding='utf-8', newline='') as fh:
+        reader = csv.DictReader(fh)
+        missing = set(CSV_COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise ReferenceDataError(f"CSV fixture is missing columns: {', '.join(sorted(missing))}")
+        for row in reader:
+            name = row['university'].strip()
+            university = universities.setdefault(name, {
+                'name': name,
+                'short_name': row['short_name'].strip(),
+                'latitude': row['university_latitude'],
+                'longitude': row['university_longitude'],
+                'radius_km': row['radius_km'] or None,
+                'campuses': [],
+            })
+            if row['campus'].strip():
+                university['campuses'].append({
+                    'name': row['campus'].strip(),
+                    'address': row['address'].strip(),
+                    'latitude': row['latitude'],
+                    'longitude': row['longitude'],
+                })
+    return list(universities.values())
+
+
+def _coordinate(value, label, low, high):
+    try:
+        number = round(float(value), COORDINATE_PLACES)
+    except (TypeError, ValueError):
+        raise ReferenceDataError(f"{label} is not a number: {value!r}")
+    if not low <= number <= high:
+        raise ReferenceDataError(f"{label} is out of range: {number}")
+    return number
+
+
+def validate_fixture(data: Dict[str, Any]) -> None:
+    """Normalize the fixture in place, raising ReferenceDataError on bad input."""
+    if not data.get('version'):
+        raise ReferenceDataError("Fixture has no version")
+    universities = data.get('universities')
+    if not isinstance(universities, list) or not universities:
+        raise ReferenceDataError("Fixture has no universities")
+
+    names, short_names = set(), set()
+    for university in universities:
+        name = (university.get('name') or '').strip()
+        short_name = (university.get('short_name') or '').strip()
+        if not name or not short_name:
+            raise ReferenceDataError(f"University entry needs name and short_name: {university!r}")
+        if name in names or short_name in short_names:
+            raise ReferenceDataError(f"Duplicate university '{name}' ({short_name})")
+        names.add(name)
+        short_names.add(short_name)
+
+        university['name'], university['short_name'] = name, short_name
+        university['latitude'] = _coordinate(university.get('latitude'), f"{name} latitude", -90, 90)
+        university['longitude'] = _coordinate(university.get('longitude'), f"{name} longitude", -180, 180)
+        try:
+            university['radius_km'] = Decimal(str(university.get('radius_km') or DEFAULT_RADIUS_KM)).quantize(Decimal('0.01'))
+        except InvalidOperation:
+            raise ReferenceDataError(f"{name} radius_km is not a number")
+
+        campus_names = set()
+        for campus in university.setdefault('campuses', []):
+            campus_name = (campus.get('name') or '').strip()
+            if not campus_name:
+                raise ReferenceDataError(f"Campus entry under '{name}' has no name")
+            if campus_name in campus_names:
+                raise ReferenceDataError(f"Duplicate campus '{campus_name}' under '{name}'")
+            campus_names.add(campus_name)
+            campus['name'] = campus_name
+            campus['address'] = (campus.get('address') or '').strip()
+            campus['latitude'] = _coordinate(campus.get('latitude'), f"{campus_name} latitude", -90, 90)
+            campus['longitude'] = _coordinate(campus.get('longitude'), f"{campus_name} longitude", -180, 180)
+
+
+def _point_key(location):
+    if location is None:
+        return None
+    return (round(location.y, COORDINATE_PLACES), round(location.x, COORDINATE_PLACES))
+
+
+def load_reference_data(data: Dict[str, Any], dry_run: bool = False,
+                        deactivate_missing: bool = False) -> ReferenceLoadResult:
+    """
+    Apply a validated fixture. Universities are keyed on ``name`` and campuses
+    on ``(university, name)``; rows already matching the fixture are left alone.
+    With ``deactivate_missing``, active rows absent from the fixture are
+    deactivated (never deleted, since listings and profiles reference them).
+    """
+    result = ReferenceLoadResult(version=data['version'], dry_run=dry_run)
+
+    existing_universities = {
+        university.name: university
+        for university in University.objects.only('id', 'name', 'short_name', 'location', 'radius_km', 'is_active')
+    }
+    existing_campuses = {
+        (campus.university_id, campus.name): campus
+        for campus in Campus.objects.only('id', 'name', 'university_id', 'address', 'location', 'is_active')
+    }
+
+    university_rows = []
+    for entry in data['universities']:
+        current = existing_universities.get(entry['name'])
+        wanted = (entry['short_name'], (entry['latitude'], entry['longitude']), entry['radius_km'], True)
+        if current is not None and (
+            current.short_name, _point_key(current.location), current.radius_km, current.is_active
+        ) == wanted:
+            result.unchanged += 1
+            continue
+        if current is None:
+            result.universities_created += 1
+        else:
+            result.universities_updated += 1
+        result.changed_names.append(entry['name'])
+        university_rows.append(University(
+            name=entry['name'],
+            short_name=entry['short_name'],
+            location=Point(entry['longitude'], entry['latitude'], srid=4326),
+            radius_km=entry['radius_km'],
+            is_active=True,
+        ))
+
+    with transaction.atomic():
+        university_ids = {name: university.id for name, university in existing_universities.items()}
+        if university_rows and not dry_run:
+            # On PostgreSQL the upsert returns primary keys, including for updated rows.
+            for university in University.objects.bulk_create(
+                university_rows,
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['short_name', 'location', 'radius_km', 'is_active', 'updated_at'],
+            ):
+                university_ids[university.name] = university.id
+
+        campus_rows = []
+        seen_campuses = set()
+        for entry in data['universities']:
+            university_id = university_ids.get(entry['name'])
+            for campus_entry in entry['campuses']:
+                key = (university_id, campus_entry['name'])
+                seen_campuses.add(key)
+                current = existing_campuses.get(key) if university_id else None
+                wanted = (campus_entry['address'], (campus_entry['latitude'], campus_entry['longitude']), True)
+                if current is not None and (current.address, _point_key(current.location), current.is_active) == wanted:
+                    result.unchanged += 1
+                    continue
+                if current is None:
+                    result.campuses_created += 1
+                else:
+                    result.campuses_updated += 1
+                result.changed_names.append(f"{entry['name']} / {campus_entry['name']}")
+                campus_rows.append(Campus(
+                    name=campus_entry['name'],
+                    university_id=university_id,
+                    address=campus_entry['address'],
+                    location=Point(campus_entry['longitude'], campus_entry['latitude'], srid=4326),
+                    is_active=True,
+                ))
+
+        if campus_rows and not dry_run:
+            Campus.objects.bulk_create(
+                campus_rows,
+                update_conflicts=True,
+                unique_fields=['name', 'university'],
+                update_fields=['address', 'location', 'is_active', 'updated_at'],
+            )
+
+        if deactivate_missing:
+            fixture_names = {entry['name'] for entry in data['universities']}
+            stale_campus_ids = [
+                campus.id for key, campus in existing_campuses.items()
+                if campus.is_active and key not in seen_campuses
+            ]
+            stale_university_ids = [
+                university.id for name, university in existing_universities.items()
+                if university.is_active and name not in fixture_names
+            ]
+            result.campuses_deactivated = len(stale_campus_ids)
+            result.universities_deactivated = len(stale_university_ids)
+            if not dry_run:
+                Campus.objects.filter(id__in=stale_campus_ids).update(is_active=False)
+                University.objects.filter(id__in=stale_university_ids).update(is_active=False)
+
+    if result.has_changes and not dry_run:
+        # bulk_create/update() skip the post_save signals that normally bump the version.
+        refresh_campus_directory()
+
+    logger.info(
+        f"Reference data {result.version}{' (dry run)' if dry_run else ''}: "
+        f"universities +{result.universities_created} ~{result.universities_updated} "
+        f"-{result.universities_deactivated}, campuses +{result.campuses_created} "
+        f"~{result.campuses_updated} -{result.campuses_deactivated}, {result.unchanged} unchanged"
+    )
+    return result
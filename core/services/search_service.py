@@ -3,10 +3,13 @@ Search service for handling unified search functionality.
 """
 import logging
 from typing import List, Dict, Any, Optional
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Prefetch
 from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
 from django.db import connection
 
+from core.images import placeholder_for
+from core.media import media_url
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +41,7 @@ class SearchService:
         sort_by: str = 'relevance'
     ) -> List[Dict[str, Any]]:
         """Search products with advanced filtering."""
-        from marketplace.models import Product
+        from marketplace.models import Product, ProductImage
 
         queryset = Product.objects.filter(is_active=True)
         used_rank = False
@@ -86,6 +89,9 @@ class SearchService:
         queryset = SearchService._apply_sorting(queryset, sort_by, used_rank, 'created_at')
 
         # Convert to dict
+        queryset = queryset.prefetch_related(
+            Prefetch('images', queryset=ProductImage.objects.order_by('-is_primary', 'id'))
+        )
         products = []
         for product in queryset[:50]:
             products.append({
@@ -94,7 +100,7 @@ class SearchService:
                 'title': product.name,
                 'description': product.description,
                 'price': float(product.price),
-                'image': product.images.first().image.url if product.images.exists() else None,
+                **SearchService._first_image(product.images.all()),
                 'category': product.category.name if product.category else None,
                 'location': product.get_location_context(),
                 'university': product.university.name if product.university else None,
@@ -118,7 +124,7 @@ class SearchService:
         sort_by: str = 'relevance'
     ) -> List[Dict[str, Any]]:
         """Search estates/properties with advanced filtering."""
-        from estates.models import Property
+        from estates.models import Property, PropertyImage
 
         queryset = Property.objects.filter(is_available=True)
         used_rank = False
@@ -166,6 +172,9 @@ class SearchService:
         queryset = SearchService._apply_sorting(queryset, sort_by, used_rank, 'created_at')
 
         # Convert to dict
+        queryset = queryset.prefetch_related(
+            Prefetch('property_images', queryset=PropertyImage.objects.order_by('-is_primary', 'id'))
+        )
         estates = []
         for estate in queryset[:50]:
             estates.append({
@@ -174,7 +183,7 @@ class SearchService:
                 'title': estate.title,
                 'description': estate.features,
                 'price': float(estate.price),
-                'image': estate.images.first().image.url if estate.images.exists() else None,
+                **SearchService._first_image(estate.property_images.all()),
                 'category': estate.property_type.name if estate.property_type else None,
                 'location': estate.location,
                 'university': estate.university.name if estate.university else None,
@@ -186,6 +195,16 @@ class SearchService:
 
         return estates
 
+    @staticmethod
+    def _first_image(images) -> Dict[str, Optional[str]]:
+        """
+        ``image`` URL and inline ``image_placeholder`` of the first (primary
+        first) prefetched image, without extra queries.
+        """
+        for image in images:
+            return {'image': media_url(image.image), 'image_placeholder': placeholder_for(image.variants, image.image.name)}
+        return {'image': None, 'image_placeholder': None}
+
     @staticmethod
     def _apply_sorting(queryset, sort_by: str, used_rank: bool, default_field: str) -> Any:
         """Apply sorting to queryset based on sort_by parameter."""
@@ -257,6 +276,11 @@ class SearchService:
             )
             results['results'].extend(estates)
 
+        if 'users' in content_types:
+            from core.services.user_service import UserService
+            users = UserService.search_users(query, location, university_id, campus_id, sort_by)
+            results['results'].extend(users)
+
         # Add other content types as needed...
 
         # Sort combined results
@@ -3,11 +3,14 @@ User service for handling user-related operations.
 """
 import logging
 from typing import List, Dict, Any, Optional
-from django.db.models import Q, Count
+from django.db.models import Count, Prefetch, Q
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 
+from core.cache import CampusCache, ProfileCache
+from core.media import media_url
 from core.models import University, Campus
+from users.search import search_page, search_queryset
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -74,7 +77,7 @@ class UserService:
                     'phonenumber': user.phonenumber,
                     'university': user.university.name if user.university else None,
                     'campus': user.specific_location.name if user.specific_location else None,
-                    'profile_image': user.profile.image.url if user.profile and user.profile.image else None,
+                    'profile_image': media_url(user.profile.image) if user.profile else None,
                     'start_date': user.start_date,
                     'is_active': user.is_active,
                 }
@@ -89,6 +92,49 @@ class UserService:
         cache.set(cache_key, result, UserService.CACHE_TIMEOUT)
         return result
 
+    @staticmethod
+    def search_result(user) -> Dict[str, Any]:
+        """
+        Shape of a user in search results, shared with ``SearchService.unified_search``.
+        Expects ``profile__campuses__university`` to be prefetched.
+        """
+        profile = getattr(user, 'profile', None)
+        names = profile.get_location_names() if profile else {
+            'university_names': [], 'university_short_names': [], 'campus_names': []
+        }
+        return {
+            'id': user.id,
+            'type': 'user',
+            'title': user.username,
+            'description': ', '.join(names['campus_names']),
+            'image': media_url(profile.image) if profile else None,
+            'location': ', '.join(names['university_short_names']) or None,
+            'university': names['university_names'][0] if names['university_names'] else None,
+            'campus': names['campus_names'][0] if names['campus_names'] else None,
+            'created_at': user.start_date,
+            'relevance_score': float(getattr(user, 'rank', 0) or 0),
+            'url': f'/users/{user.id}'
+        }
+
+    @staticmethod
+    def search_users_page(
+        query: str = '',
+        university_id: Optional[int] = None,
+        campus_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Keyset-paginated user search. Pass the returned ``next_cursor`` back as
+        ``cursor`` for the following page. Raises ValueError on a bad cursor.
+        """
+        queryset = search_queryset(query, campus_id=campus_id, university_id=university_id)
+        users, next_cursor = search_page(UserService._eager(queryset), cursor=cursor, limit=limit)
+        return {
+            'results': [UserService.search_result(user) for user in users],
+            'next_cursor': next_cursor,
+        }
+
     @staticmethod
     def search_users(
         query: str,
@@ -98,78 +144,104 @@ class UserService:
         sort_by: str = 'relevance'
     ) -> List[Dict[str, Any]]:
         """Search users with advanced filtering."""
-        queryset = User.objects.filter(is_active=True)
-        used_rank = False
-
-        if query:
-            # Clean the query to remove special characters
-            clean_query = query.replace('@', '').replace('#', '').replace('$', '').replace('%', '').replace('^', '').replace('&', '').replace('*', '').replace('(', '').replace(')', '').replace('-', '').replace('+', '').replace('=', '').replace('[', '').replace(']', '').replace('{', '').replace('}', '').replace('|', '').replace('\\', '').replace(':', '').replace(';', '').replace('"', '').replace("'", '').replace('<', '').replace('>', '').replace(',', '').replace('.', '').replace('?', '').replace('/', '')
-            
-            if clean_query.strip():
-                try:
-                    from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-                    from django.db import connection
-                    
-                    if 'postgresql' in connection.vendor:
-                        search_vector = SearchVector('username', weight='A') + SearchVector('email', weight='B')
-                        search_query = SearchQuery(clean_query)
-                        queryset = queryset.annotate(
-                            search=search_vector,
-                            rank=SearchRank(search_vector, search_query)
-                        ).filter(search=search_query)
-                        used_rank = True
-                    else:
-                        queryset = queryset.filter(
-                            Q(username__icontains=query) | Q(email__icontains=query)
-                        )
-                except Exception as e:
-                    logger.warning(f"Search failed for query '{query}': {e}")
-                    queryset = queryset.filter(
-                        Q(username__icontains=query) | Q(email__icontains=query)
-                    )
-            else:
-                queryset = queryset.filter(
-                    Q(username__icontains=query) | Q(email__icontains=query)
-                )
-
-        # Apply filters
+        queryset = search_queryset(query, campus_id=campus_id, university_id=university_id)
         if location:
-            queryset = queryset.filter(
-                Q(university__name__icontains=location) |
-                Q(specific_location__name__icontains=location)
-            )
-        if university_id:
-            queryset = queryset.filter(university_id=university_id)
-        if campus_id:
-            queryset = queryset.filter(specific_location_id=campus_id)
+            # Campus/university names are part of the stored vector (weight B).
+            location_query = search_queryset(location).values('pk')
+            queryset = queryset.filter(pk__in=location_query)
 
-        # Apply sorting
         if sort_by == 'newest':
             queryset = queryset.order_by('-start_date')
         else:  # relevance
-            if used_rank:
-                queryset = queryset.order_by('-rank', '-start_date')
-            else:
-                queryset = queryset.order_by('-start_date')
+            queryset = queryset.order_by('-rank', '-id')
+
+        return [UserService.search_result(user) for user in UserService._eager(queryset)[:50]]
+
+    @staticmethod
+    def _eager(queryset):
+        return queryset.select_related('profile').prefetch_related(
+            Prefetch('profile__campuses', queryset=Campus.objects.select_related('university').order_by('id'))
+        )
 
-        # Convert to dict
-        users = []
-        for user in queryset[:50]:
-            users.append({
+    @staticmethod
+    def build_profile_bundle(user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Everything a client needs at startup about the current user: account,
+        profile, campuses, free-listing offers, wallet balance and shop summary.
+        Loaded with one joined query plus one campus prefetch. Values are kept
+        JSON-native so cached and freshly built bundles are identical.
+        """
+        user = User.objects.select_related(
+            'profile', 'offer', 'wallet', 'shop', 'shop__subscription'
+        ).prefetch_related(
+            Prefetch('profile__campuses', queryset=Campus.objects.select_related('university').order_by('id'))
+        ).filter(id=user_id).first()
+        if user is None:
+            return None
+
+        profile = getattr(user, 'profile', None)
+        offer = getattr(user, 'offer', None)
+        wallet = getattr(user, 'wallet', None)
+        shop = getattr(user, 'shop', None)
+        subscription = getattr(shop, 'subscription', None) if shop else None
+
+        return {
+            'campus_version': CampusCache.get_version(),
+            'user': {
                 'id': user.id,
-                'type': 'user',
-                'title': user.username,
-                'description': user.email,
-                'image': user.profile.image.url if user.profile and user.profile.image else None,
-                'location': user.university.name if user.university else None,
-                'university': user.university.name if user.university else None,
-                'campus': user.specific_location.name if user.specific_location else None,
-                'created_at': user.start_date,
-                'relevance_score': getattr(user, 'rank', 0.5),
-                'url': f'/users/{user.id}'
-            })
+                'username': user.username,
+                'email': user.email,
+                'phonenumber': str(user.phonenumber),
+                'start_date': user.start_date.isoformat(),
+            },
+            'profile': {
+                'id': profile.id,
+                'image': media_url(profile.image),
+                'instagram': profile.instagram,
+                'tiktok': profile.tiktok,
+                'facebook': profile.facebook,
+            } if profile else None,
+            'campuses': [
+                {
+                    'id': campus.id,
+                    'name': campus.name,
+                    'university': {
+                        'id': campus.university_id,
+                        'name': campus.university.name,
+                        'short_name': campus.university.short_name,
+                    },
+                }
+                for campus in (profile.campuses.all() if profile else [])
+            ],
+            'offer': {
+                'free_products_remaining': offer.free_products_remaining,
+                'free_estates_remaining': offer.free_estates_remaining,
+            } if offer else None,
+            'wallet': {
+                'balance': str(wallet.balance),
+            } if wallet else None,
+            'shop': {
+                'id': shop.id,
+                'name': shop.name,
+                'image': media_url(shop.image),
+                'is_active': shop.is_active,
+                'subscription': {
+                    'status': subscription.status,
+                    'end_date': subscription.end_date.isoformat() if subscription.end_date else None,
+                    'is_trial': subscription.is_trial,
+                } if subscription else None,
+            } if shop else None,
+        }
 
-        return users
+    @staticmethod
+    def get_profile_bundle(user_id: int) -> Optional[Dict[str, Any]]:
+        """Cached ``build_profile_bundle``; signals drop the entry on every related write."""
+        bundle = ProfileCache.get_bundle(user_id)
+        if bundle is None or bundle.get('campus_version') != CampusCache.get_version():
+            bundle = UserService.build_profile_bundle(user_id)
+            if bundle is not None:
+                ProfileCache.set_bundle(user_id, bundle)
+        return bundle
 
     @staticmethod
     def get_user_statistics() -> Dict[str, Any]:
@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import University, Campus
+from .cache import CampusCache
+from .images import IMAGE_SOURCES, delete_derivatives
+from .tasks import enqueue_image_derivatives
+
+@receiver(post_save, sender=Campus)
+@receiver(post_delete, sender=Campus)
+@receiver(post_save, sender=University)
+@receiver(post_delete, sender=University)
+def bump_campus_cache_version(sender, **kwargs):
+    if kwargs.get('raw'):
+        return
+    CampusCache.bump_version()
+
+
+def queue_image_derivatives(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    enqueue_image_derivatives(instance)
+
+
+def remove_image_derivatives(sender, instance, **kwargs):
+    image_field, variants_field = IMAGE_SOURCES[sender._meta.label]
+    image = getattr(instance, image_field)
+    variants = getattr(instance, variants_field)
+    if image and variants:
+        storage = image.storage
+        transaction.on_commit(lambda: delete_derivatives(storage, variants))
+
+
+for model_label in IMAGE_SOURCES:
+    post_save.connect(queue_image_derivatives, sender=model_label, dispatch_uid=f'derivatives-save-{model_label}')
+    post_delete.connect(remove_image_derivatives, sender=model_label, dispatch_uid=f'derivatives-delete-{model_label}')
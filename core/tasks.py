@@ -0,0 +1,43 @@
+# core/tasks.py
+import logging
+
+from django.db import transaction
+from django_q.tasks import async_task
+
+from .images import IMAGE_SOURCES, needs_derivatives, process_instance
+
+logger = logging.getLogger(__name__)
+
+
+def generate_image_derivatives(model_label, pk, force=False):
+    """django-q entry point: render thumb/card/full WebP+JPEG for one image row."""
+    return process_instance(model_label, pk, force=force)
+
+
+def enqueue_image_derivatives(instance):
+    """Queue derivative generation for ``instance`` after commit, if its image changed."""
+    model_label = instance._meta.label
+    image_field, variants_field = IMAGE_SOURCES[model_label]
+    if not needs_derivatives(instance, image_field, variants_field):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: async_task(
+        'core.tasks.generate_image_derivatives', model_label, pk,
+        task_name=f'derivatives-{model_label}-{pk}'
+    ))
+
+
+def attach_direct_uploads(target, parent_id, names):
+    """django-q entry point: sanitize confirmed direct uploads and create their rows."""
+    from .services.direct_uploads import attach_confirmed_uploads
+
+    return len(attach_confirmed_uploads(target, parent_id, names))
+
+
+def collect_orphaned_media(delete=True, min_age_hours=24):
+    """django-q entry point for the orphaned-media collector; returns the report."""
+    from datetime import timedelta
+
+    from .services.media_gc import collect_orphaned_media as collect
+
+    return collect(delete=delete, min_age=timedelta(hours=min_age_hours)).as_dict()
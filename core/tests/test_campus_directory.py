@@ -0,0 +1,79 @@
+"""
+Tests for the pre-rendered campus directory: ETag revalidation and ``since`` deltas.
+"""
+import gzip
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.models import Campus, University
+from core.services.campus_directory import parse_since, refresh_campus_directory
+
+
+class ParseSinceTestCase(SimpleTestCase):
+
+    def test_accepts_offsets_mangled_by_query_string_decoding(self):
+        expected = datetime(2026, 10, 19, 3, 28, 16, 941867, tzinfo=dt_timezone.utc)
+        for value in (
+            '2026-10-19T03:28:16.941867+00:00',
+            '2026-10-19T03:28:16.941867 00:00',
+            '2026-10-19T03:28:16.941867Z',
+            '2026-10-19T06:28:16.941867 03:00',
+        ):
+            self.assertEqual(parse_since(value), expected, value)
+
+    def test_rejects_garbage(self):
+        self.assertIsNone(parse_since('yesterday'))
+        self.assertIsNone(parse_since('2026-10-19T03:28:16 00:00 extra'))
+
+
+class CampusDirectoryEndpointTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        university = University.objects.create(name='University of Dar es Salaam', short_name='UDSM')
+        self.main = Campus.objects.create(name='Mlimani', university=university)
+        self.other = Campus.objects.create(name='Mabibo', university=university)
+        refresh_campus_directory()
+        self.url = reverse('campus-all')
+
+    def test_etag_revalidation(self):
+        first = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        body = json.loads(gzip.decompress(first.content))
+        self.assertEqual(len(body['campuses']), 2)
+
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], first['ETag'])
+
+        self.main.name = 'Mlimani Main'
+        self.main.save()
+        refresh_campus_directory()
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+    def test_since_delta_with_unencoded_offset(self):
+        last_modified = json.loads(self.client.get(self.url).content)['last_modified']
+        self.assertIn('+', last_modified)
+
+        self.main.name = 'Mlimani Main'
+        self.main.save()
+        self.other.is_active = False
+        self.other.save()
+
+        # Copied into the URL as-is, so the "+" decodes to a space.
+        response = self.client.get(f'{self.url}?since={last_modified}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([campus['name'] for campus in response.data['campuses']], ['Mlimani Main'])
+        self.assertEqual(response.data['removed_ids'], [self.other.id])
+        self.assertEqual(response.data['active_ids'], [self.main.id])
+
+    def test_invalid_since(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'yesterday'}).status_code, 400)
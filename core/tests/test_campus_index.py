@@ -0,0 +1,36 @@
+"""
+Tests for the in-memory campus spatial index.
+"""
+from django.test import SimpleTestCase
+
+from core.geo import haversine_km
+from core.services.campus_index import CampusSpatialIndex
+
+
+class CampusSpatialIndexTestCase(SimpleTestCase):
+    """Index lookups against a handful of known points (no database needed)."""
+
+    def setUp(self):
+        self.index = CampusSpatialIndex([
+            (-6.7796, 39.2030, {'id': 1, 'name': 'UDSM Mwalimu Nyerere'}),
+            (-6.8160, 39.2803, {'id': 2, 'name': 'IFM Dar es Salaam'}),
+            (-6.1630, 35.7516, {'id': 3, 'name': 'UDOM Dodoma'}),
+            (-3.3869, 36.6830, {'id': 4, 'name': 'Arusha'}),
+        ])
+
+    def test_haversine_matches_known_distance(self):
+        # Dar es Salaam to Dodoma is roughly 390 km as the crow flies.
+        self.assertAlmostEqual(haversine_km(-6.7924, 39.2083, -6.1630, 35.7516), 388, delta=5)
+
+    def test_nearby_orders_by_distance_and_respects_radius(self):
+        results = self.index.nearby(-6.80, 39.25, radius_km=20)
+        self.assertEqual([campus['id'] for campus in results], [2, 1])
+        self.assertLessEqual(results[0]['distance_km'], results[1]['distance_km'])
+
+    def test_nearby_spans_grid_cells(self):
+        results = self.index.nearby(-6.5, 37.5, radius_km=250)
+        self.assertEqual({campus['id'] for campus in results}, {1, 2, 3})
+
+    def test_nearest_returns_none_outside_radius(self):
+        self.assertIsNone(self.index.nearest(-1.0, 30.0, radius_km=20))
+        self.assertEqual(self.index.nearest(-6.17, 35.75, radius_km=20)['id'], 3)
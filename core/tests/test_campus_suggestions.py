@@ -0,0 +1,116 @@
+"""
+Tests for the geohash helpers and the geohash-bucketed campus suggestion cache.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.cache import CampusCache, UniversityCache
+from core.geo import geohash_bounds, geohash_center, geohash_encode, geohash_precision_for_radius
+from users.models import NewUser
+
+
+class GeohashTestCase(SimpleTestCase):
+    """Known vectors from the geohash reference implementation."""
+
+    def test_encode(self):
+        self.assertEqual(geohash_encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(geohash_encode(42.6, -5.6, 5), 'ezs42')
+        self.assertEqual(geohash_encode(42.6, -5.6, 3), 'ezs')
+
+    def test_bounds_and_center(self):
+        self.assertEqual(geohash_bounds('ezs42'), (42.5830078125, 42.626953125, -5.625, -5.5810546875))
+        lat, lng, half_diagonal_km = geohash_center('ezs42')
+        self.assertEqual((lat, lng), (42.60498046875, -5.60302734375))
+        self.assertAlmostEqual(half_diagonal_km, 3.03, places=2)
+
+    def test_precision_per_radius_step(self):
+        steps = dict(zip(UniversityCache.SUGGESTION_RADII_KM, (6, 6, 5, 5, 4, 4, 3)))
+        for radius, precision in steps.items():
+            self.assertEqual(geohash_precision_for_radius(radius), precision, radius)
+        self.assertEqual(geohash_precision_for_radius(0.01), 8)
+        self.assertEqual(geohash_precision_for_radius(5000), 1)
+
+
+class CampusSuggestionCacheTestCase(SimpleTestCase):
+    """Shared buckets per geohash cell, re-filtered for each caller's position."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        # Two origins about 1.1 km apart inside the same precision-5 cell.
+        cell = geohash_encode(-6.7796, 39.2030, 5)
+        self.lat, self.lng, self.half_diagonal_km = geohash_center(cell)
+        self.north = (self.lat + 0.01, self.lng)
+        self.assertEqual(geohash_encode(*self.north, 5), cell)
+        self.candidates = [
+            {'id': 1, 'name': 'North', 'latitude': self.lat + 0.048, 'longitude': self.lng},
+            {'id': 2, 'name': 'South', 'latitude': self.lat - 0.03, 'longitude': self.lng},
+            {'id': 3, 'name': 'Padding', 'latitude': self.lat + 0.2, 'longitude': self.lng},
+        ]
+        self.loader = mock.Mock(return_value=self.candidates)
+
+    def suggest(self, lat, lng, radius=5):
+        return UniversityCache.get_campus_suggestions(lat, lng, radius, self.loader)
+
+    def test_nearby_origins_share_one_bucket(self):
+        self.suggest(self.lat, self.lng)
+        self.suggest(*self.north)
+        self.loader.assert_called_once()
+        center_lat, center_lng, search_radius = self.loader.call_args.args
+        self.assertEqual((center_lat, center_lng), (self.lat, self.lng))
+        self.assertAlmostEqual(search_radius, 5 + self.half_diagonal_km)
+
+    def test_bucket_is_refiltered_per_origin(self):
+        at_center = self.suggest(self.lat, self.lng)
+        self.assertEqual([campus['id'] for campus in at_center], [2])
+        self.assertAlmostEqual(at_center[0]['distance_km'], 3.34, delta=0.05)
+
+        north = self.suggest(*self.north)
+        self.assertEqual([campus['id'] for campus in north], [1, 2])
+        self.assertLess(north[0]['distance_km'], north[1]['distance_km'])
+        self.assertTrue(all(campus['distance_km'] <= 5 for campus in north))
+
+    def test_radius_is_rounded_up_to_a_step(self):
+        self.suggest(self.lat, self.lng, radius=3)
+        self.assertEqual([campus['id'] for campus in self.suggest(self.lat, self.lng, radius=4)], [2])
+        self.loader.assert_called_once()
+        self.assertEqual(self.suggest(self.lat, self.lng, radius=2.5), [])
+
+    def test_version_bump_reloads(self):
+        self.suggest(self.lat, self.lng)
+        CampusCache.bump_version()
+        self.suggest(self.lat, self.lng)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_hit_and_miss_counters(self):
+        self.assertEqual(UniversityCache.campus_suggestion_stats(), {'hits': 0, 'misses': 0, 'hit_ratio': None})
+        for _ in range(3):
+            self.suggest(self.lat, self.lng)
+        self.assertEqual(UniversityCache.campus_suggestion_stats(), {'hits': 2, 'misses': 1, 'hit_ratio': 0.6667})
+
+
+class SuggestionCacheStatsEndpointTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.url = reverse('campus-suggestion-cache-stats')
+
+    def test_admin_only(self):
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+
+        user = NewUser.objects.create_user(email='student@example.com', username='student', phonenumber='+255718000001')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        UniversityCache.get_campus_suggestions(-6.78, 39.2, 5, lambda *args: [])
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'hits': 0, 'misses': 1, 'hit_ratio': 0.0})
@@ -0,0 +1,125 @@
+"""
+Tests for presigned direct uploads. Object verification runs against moto's
+in-memory S3 when it is installed (see requirements-dev.txt).
+"""
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock, skipIf
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+from PIL import Image
+from storages.backends.s3 import S3Storage
+
+from core.services.direct_uploads import (
+    MAX_SLOTS,
+    DirectUploadError,
+    create_upload_slots,
+    read_token,
+    sanitize_confirmed,
+    verify_upload,
+)
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+BUCKET = 'direct-upload-tests'
+
+
+def make_storage():
+    return S3Storage(
+        bucket_name=BUCKET, access_key='testing', secret_key='testing', region_name='us-east-1',
+        endpoint_url=None, custom_domain=None, default_acl=None,
+    )
+
+
+def jpeg_bytes():
+    buffer = BytesIO()
+    Image.new('RGB', (32, 32), 'blue').save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+class UploadSlotTestCase(SimpleTestCase):
+
+    def test_slot_is_bound_to_user_and_listing(self):
+        slot, = create_upload_slots('product', 7, 42, [{'content_type': 'image/png', 'size': 2048}], storage=make_storage())
+        self.assertTrue(slot.name.startswith('product_images/') and slot.name.endswith('.png'))
+        self.assertIn(slot.name, slot.upload_url)
+        self.assertEqual(read_token(slot.token, 'product', 7, 42)['n'], slot.name)
+        for target, user_id, parent_id in (('property', 7, 42), ('product', 8, 42), ('product', 7, 43)):
+            with self.assertRaises(DirectUploadError):
+                read_token(slot.token, target, user_id, parent_id)
+
+    def test_rejects_bad_requests(self):
+        storage = make_storage()
+        for files in (
+            [],
+            ['a'],
+            [None],
+            [{'content_type': 'image/gif', 'size': 10}],
+            [{'content_type': 'image/jpeg', 'size': 0}],
+            [{'content_type': 'image/jpeg', 'size': 50 * 1024 * 1024}],
+            [{'content_type': 'image/jpeg', 'size': 10}] * (MAX_SLOTS + 1),
+        ):
+            with self.assertRaises(DirectUploadError):
+                create_upload_slots('product', 1, 1, files, storage=storage)
+
+
+class SanitizeConfirmedTestCase(SimpleTestCase):
+    """The queued step after confirmation: failures are reported per object, never raised."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = FileSystemStorage(location=self.root)
+
+    def test_rejects_per_object(self):
+        good = self.storage.save('product_images/good.jpg', ContentFile(jpeg_bytes()))
+        fake = self.storage.save('product_images/fake.jpg', ContentFile(b'not an image'))
+        clean, rejected = sanitize_confirmed(self.storage, [good, fake, 'product_images/missing.jpg'])
+        self.assertEqual(clean, [good])
+        self.assertEqual(set(rejected), {fake, 'product_images/missing.jpg'})
+        self.assertFalse(self.storage.exists(fake))
+
+    def test_rewrite_failure_is_rejected_and_deleted(self):
+        name = self.storage.save('product_images/a.jpg', ContentFile(jpeg_bytes()))
+        with mock.patch('core.services.direct_uploads.sanitize_stored', side_effect=RuntimeError('moved')):
+            clean, rejected = sanitize_confirmed(self.storage, [name])
+        self.assertEqual((clean, list(rejected)), ([], [name]))
+        self.assertFalse(self.storage.exists(name))
+
+
+@skipIf(mock_aws is None, 'moto is not installed')
+class VerifyUploadTestCase(SimpleTestCase):
+
+    def setUp(self):
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+        self.storage = make_storage()
+        self.client = self.storage.bucket.meta.client
+        self.client.create_bucket(Bucket=BUCKET)
+
+    def put(self, name, body, content_type='image/jpeg'):
+        self.client.put_object(Bucket=BUCKET, Key=name, Body=body, ContentType=content_type)
+
+    def test_accepts_matching_image(self):
+        self.put('product_images/a.jpg', jpeg_bytes())
+        self.assertIsNone(verify_upload(self.storage, 'product_images/a.jpg', 'image/jpeg'))
+        self.assertTrue(self.storage.exists('product_images/a.jpg'))
+
+    def test_rejects_and_deletes_non_image(self):
+        self.put('product_images/b.jpg', b'<?php echo "hi"; ?>')
+        self.assertIsNotNone(verify_upload(self.storage, 'product_images/b.jpg', 'image/jpeg'))
+        self.assertFalse(self.storage.exists('product_images/b.jpg'))
+
+    def test_rejects_content_type_mismatch(self):
+        self.put('product_images/c.jpg', jpeg_bytes(), content_type='image/png')
+        self.assertIsNotNone(verify_upload(self.storage, 'product_images/c.jpg', 'image/jpeg'))
+
+    def test_missing_object(self):
+        self.assertEqual(verify_upload(self.storage, 'product_images/none.jpg', 'image/jpeg'), 'File was not uploaded.')
@@ -0,0 +1,84 @@
+"""
+Tests for resized image derivatives, rendered into a local FileSystemStorage.
+"""
+import base64
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+from PIL import Image
+
+from core.images import (
+    DERIVATIVE_SIZES,
+    delete_derivatives,
+    derivative_name,
+    derivative_urls,
+    generate_derivatives,
+    placeholder_data_uri,
+    placeholder_for,
+)
+
+
+class ImageDerivativesTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = FileSystemStorage(location=self.root, base_url='/media/')
+        buffer = BytesIO()
+        Image.new('RGBA', (2000, 1000), (200, 50, 50, 255)).save(buffer, 'PNG')
+        self.source = self.storage.save('product_images/sofa.png', ContentFile(buffer.getvalue()))
+
+    def test_generates_every_size_and_format(self):
+        variants = generate_derivatives(self.storage, self.source)
+        self.assertEqual(variants['source'], self.source)
+        self.assertEqual(set(variants['sizes']), set(DERIVATIVE_SIZES))
+        for size, longest_side in DERIVATIVE_SIZES.items():
+            entry = variants['sizes'][size]
+            self.assertEqual((entry['width'], entry['height']), (longest_side, longest_side // 2))
+            self.assertEqual(entry['webp'], derivative_name(self.source, size, 'webp'))
+            with self.storage.open(entry['jpeg']) as fh, Image.open(fh) as rendition:
+                self.assertEqual(rendition.format, 'JPEG')
+                self.assertEqual(rendition.size, (longest_side, longest_side // 2))
+
+    def test_regenerating_overwrites_in_place(self):
+        first = generate_derivatives(self.storage, self.source)
+        second = generate_derivatives(self.storage, self.source)
+        self.assertEqual(first['sizes'], second['sizes'])
+
+    def test_urls_only_for_current_source(self):
+        variants = generate_derivatives(self.storage, self.source)
+        urls = derivative_urls(self.storage, variants, self.source)
+        self.assertEqual(
+            urls['thumb']['webp'],
+            f"/media/derivatives/product_images/sofa/thumb.webp?v={variants['version']}"
+        )
+        self.assertEqual(derivative_urls(self.storage, variants, 'product_images/other.png'), {})
+        self.assertEqual(derivative_urls(self.storage, {}, self.source), {})
+
+    def test_delete_removes_renditions(self):
+        variants = generate_derivatives(self.storage, self.source)
+        delete_derivatives(self.storage, variants)
+        for entry in variants['sizes'].values():
+            self.assertFalse(self.storage.exists(entry['webp']))
+            self.assertFalse(self.storage.exists(entry['jpeg']))
+        self.assertTrue(self.storage.exists(self.source))
+
+    def test_placeholder_is_tiny_inline_webp(self):
+        variants = generate_derivatives(self.storage, self.source)
+        placeholder = variants['placeholder']
+        prefix = 'data:image/webp;base64,'
+        self.assertTrue(placeholder.startswith(prefix))
+        self.assertLess(len(placeholder), 600)
+        with Image.open(BytesIO(base64.b64decode(placeholder[len(prefix):]))) as preview:
+            self.assertEqual(preview.size, (16, 8))
+        self.assertEqual(placeholder_for(variants, self.source), placeholder)
+        self.assertIsNone(placeholder_for(variants, 'product_images/other.png'))
+        self.assertIsNone(placeholder_for({}, self.source))
+
+    def test_placeholder_from_palette_image(self):
+        palette = Image.new('P', (40, 40))
+        self.assertTrue(placeholder_data_uri(palette).startswith('data:image/webp;base64,'))
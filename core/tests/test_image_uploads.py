@@ -0,0 +1,95 @@
+"""
+Tests for upload sanitizing: limits, EXIF/GPS stripping, orientation, downscaling.
+"""
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from PIL import Image
+
+from core import image_uploads
+from core.image_uploads import MAX_STORED_SIDE, sanitize_stored, sanitize_upload
+
+GPS_IFD = 0x8825
+
+
+def upload(image, fmt='JPEG', name='photo.jpg', **save_options):
+    buffer = BytesIO()
+    image.save(buffer, fmt, **save_options)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{fmt.lower()}')
+
+
+class SanitizeUploadTestCase(SimpleTestCase):
+
+    def test_clean_small_image_is_stored_as_is(self):
+        original = upload(Image.new('RGB', (200, 100), 'red'))
+        self.assertIs(sanitize_upload(original), original)
+
+    def test_strips_exif_and_applies_orientation(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90° clockwise for display
+        exif[0x010F] = 'PhoneMaker'
+        exif.get_ifd(GPS_IFD)[2] = (6.0, 48.0, 0.0)
+        cleaned = sanitize_upload(upload(Image.new('RGB', (300, 100), 'red'), exif=exif))
+        with Image.open(cleaned) as image:
+            self.assertEqual(image.size, (100, 300))
+            self.assertEqual(len(image.getexif()), 0)
+            self.assertNotIn('exif', image.info)
+
+    def test_downscales_oversized_originals(self):
+        cleaned = sanitize_upload(upload(Image.new('RGB', (MAX_STORED_SIDE * 2, MAX_STORED_SIDE), 'blue')))
+        with Image.open(cleaned) as image:
+            self.assertEqual(max(image.size), MAX_STORED_SIDE)
+        self.assertTrue(cleaned.name.endswith('.jpg'))
+
+    def test_keeps_png_format(self):
+        cleaned = sanitize_upload(upload(Image.new('RGBA', (MAX_STORED_SIDE + 10, 20)), 'PNG', 'logo.png'))
+        self.assertEqual(cleaned.content_type, 'image/png')
+        with Image.open(cleaned) as image:
+            self.assertEqual((image.format, image.mode), ('PNG', 'RGBA'))
+
+    def test_rejects_without_decoding(self):
+        with self.assertRaises(ValidationError):
+            sanitize_upload(SimpleUploadedFile('notes.jpg', b'not an image'))
+        with self.assertRaises(ValidationError):
+            sanitize_upload(upload(Image.new('RGB', (10, 10)), 'GIF', 'anim.gif'))
+
+        big = upload(Image.new('L', (1000, 1000)))
+        with mock.patch.object(image_uploads, 'MAX_PIXELS', 999_999):
+            with self.assertRaisesMessage(ValidationError, 'too large'):
+                sanitize_upload(big)
+
+
+class SanitizeStoredTestCase(SimpleTestCase):
+    """Objects confirmed after a presigned upload are cleaned in place."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = FileSystemStorage(location=self.root)
+
+    def store(self, name, image, **save_options):
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', **save_options)
+        return self.storage.save(name, ContentFile(buffer.getvalue()))
+
+    def test_confirmed_jpeg_with_gps_is_rewritten_clean(self):
+        exif = Image.Exif()
+        exif.get_ifd(GPS_IFD)[2] = (6.0, 48.0, 0.0)
+        name = self.store('product_images/direct.jpg', Image.new('RGB', (64, 64), 'red'), exif=exif)
+        self.assertIsNone(sanitize_stored(self.storage, name))
+        self.assertEqual(self.storage.listdir('product_images')[1], ['direct.jpg'])
+        with self.storage.open(name) as fh, Image.open(fh) as image:
+            self.assertEqual(len(image.getexif()), 0)
+            self.assertNotIn('exif', image.info)
+
+    def test_rejected_object_is_deleted(self):
+        name = self.storage.save('product_images/fake.jpg', ContentFile(b'not an image'))
+        self.assertIsNotNone(sanitize_stored(self.storage, name))
+        self.assertFalse(self.storage.exists(name))
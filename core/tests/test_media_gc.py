@@ -0,0 +1,48 @@
+"""
+Tests for the orphaned-media merge diff (no database or bucket needed).
+"""
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+from core.services.media_gc import SortedNameSet, StoredObject, delete_objects, diff_sorted, list_stored
+
+
+class MediaGcTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def test_sorted_set_orders_like_bucket_listings(self):
+        names = SortedNameSet(self.root)
+        self.addCleanup(names.close)
+        unsorted = ['shop_images/z.jpg', 'product_images/b.jpg', 'product_images/é.jpg',
+                    'product_images/a-1.jpg', 'product_images/a/1.jpg', 'product_images/b.jpg']
+        self.assertEqual(names.add_all(unsorted, chunk_size=2), 5)
+        self.assertEqual(
+            list(names.iter_prefix('product_images/')),
+            sorted(set(name for name in unsorted if name.startswith('product_images/')))
+        )
+
+    def test_diff_yields_unreferenced_objects(self):
+        stored = [StoredObject(name, 1, None) for name in ('a', 'b', 'c', 'd', 'f')]
+        orphans = [obj.name for obj in diff_sorted(stored, iter(['b', 'd', 'e', 'g']))]
+        self.assertEqual(orphans, ['a', 'c', 'f'])
+
+    def test_lists_and_deletes_local_storage(self):
+        storage = FileSystemStorage(location=f'{self.root}/media')
+        for name in ('product_images/b.jpg', 'product_images/a.jpg', 'product_images/old/c.jpg'):
+            storage.save(name, ContentFile(b'data'))
+
+        stored = list(list_stored(storage, 'product_images/', self.root))
+        self.assertEqual([obj.name for obj in stored], ['product_images/a.jpg', 'product_images/b.jpg', 'product_images/old/c.jpg'])
+        self.assertEqual(list(list_stored(storage, 'avatars/', self.root)), [])
+
+        orphans = [obj.name for obj in diff_sorted(stored, iter(['product_images/b.jpg']))]
+        self.assertEqual(delete_objects(storage, orphans), 2)
+        self.assertFalse(storage.exists('product_images/a.jpg'))
+        self.assertTrue(storage.exists('product_images/b.jpg'))
@@ -0,0 +1,57 @@
+"""
+Tests for concurrent image uploads, against a local FileSystemStorage.
+"""
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+from core.services.media_ingest import MediaIngestError, unique_upload_names, upload_files
+from marketplace.models import ProductImage
+
+
+class BrokenFile(ContentFile):
+    def chunks(self, chunk_size=None):
+        raise OSError('connection reset')
+
+
+class UploadFilesTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = FileSystemStorage(location=self.root)
+
+    def test_saves_all_files_in_order(self):
+        items = [(f'product_images/{i}.jpg', ContentFile(b'x' * i)) for i in range(1, 8)]
+        names = upload_files(self.storage, items, max_workers=3)
+        self.assertEqual(names, [name for name, _ in items])
+        self.assertEqual(self.storage.size('product_images/5.jpg'), 5)
+
+    def test_failure_removes_uploaded_files(self):
+        items = [
+            ('product_images/a.jpg', ContentFile(b'a')),
+            ('product_images/b.jpg', BrokenFile(b'b')),
+            ('product_images/c.jpg', ContentFile(b'c')),
+        ]
+        with self.assertRaises(MediaIngestError):
+            upload_files(self.storage, items)
+        self.assertFalse(self.storage.exists('product_images/a.jpg'))
+        self.assertFalse(self.storage.exists('product_images/c.jpg'))
+
+    def test_same_client_filename_gets_distinct_objects(self):
+        field = ProductImage._meta.get_field('image')
+        names = unique_upload_names(field, ProductImage(), ['image.jpg', 'image.jpg', 'blob'])
+        self.assertEqual(len(set(names)), 3)
+        self.assertTrue(all(name.startswith('product_images/') for name in names))
+        self.assertTrue(names[0].endswith('.jpg'))
+
+        stored = upload_files(self.storage, [
+            (names[0], ContentFile(b'first')),
+            (names[1], ContentFile(b'second')),
+        ])
+        self.assertEqual(stored, names[:2])
+        with self.storage.open(stored[0]) as first, self.storage.open(stored[1]) as second:
+            self.assertEqual((first.read(), second.read()), (b'first', b'second'))
@@ -0,0 +1,39 @@
+"""
+Tests for the string-built media URL resolver.
+"""
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase
+from storages.backends.s3 import S3Storage
+
+from core.media import media_url
+
+
+class MediaUrlTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.s3 = S3Storage(
+            bucket_name='media', custom_domain='cdn.example.com', location='uploads',
+            access_key='x', secret_key='y', querystring_auth=False,
+        )
+        self.local = FileSystemStorage(location='/tmp/media-url-tests', base_url='/media/')
+
+    def test_matches_storage_url_without_touching_boto(self):
+        for name in ('product_images/a.jpg', 'shop-profile/café logo.png'):
+            self.assertEqual(media_url(name, storage=self.s3), self.s3.url(name))
+        self.assertEqual(media_url('product_images/a.jpg', storage=self.s3), 'https://cdn.example.com/uploads/product_images/a.jpg')
+        self.assertFalse(hasattr(self.s3._connections, 'connection'))
+
+    def test_version_is_appended(self):
+        self.assertEqual(
+            media_url('derivatives/a/card.webp', version=3, storage=self.s3),
+            'https://cdn.example.com/uploads/derivatives/a/card.webp?v=3'
+        )
+
+    def test_relative_urls_made_absolute_only_when_needed(self):
+        request = RequestFactory().get('/')
+        self.assertEqual(media_url('a.jpg', request, storage=self.local), 'http://testserver/media/a.jpg')
+        self.assertEqual(media_url('a.jpg', request, storage=self.s3), 'https://cdn.example.com/uploads/a.jpg')
+
+    def test_empty_values(self):
+        self.assertIsNone(media_url(None))
+        self.assertIsNone(media_url(''))
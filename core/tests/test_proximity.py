@@ -0,0 +1,117 @@
+"""
+Tests for proximity feeds: origin parsing, the campus KNN radius cut and the
+capped, de-duplicated feed ranking.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.gis.geos import Point
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core.models import Campus, University
+from core.services.proximity import (
+    DEFAULT_RADIUS_KM,
+    nearest_campuses,
+    parse_origin,
+    proximity_feed,
+    ranked_feed,
+)
+from marketplace.models import Brand, Category, Product, ProductCampus
+from users.models import NewUser
+
+ORIGIN = (-6.78, 39.20)  # lat, lng
+KM_PER_DEGREE_LAT = 111.0
+
+
+class ParseOriginTestCase(SimpleTestCase):
+    """Query-param handling for the near_user feeds (no database needed)."""
+
+    def test_coordinates_with_default_radius(self):
+        self.assertEqual(parse_origin({'lat': '-6.8', 'lng': '39.25'}), (-6.8, 39.25, DEFAULT_RADIUS_KM))
+
+    def test_radius_is_bounded(self):
+        for radius in ('0', '-5', '500', 'far'):
+            with self.assertRaises(ValueError):
+                parse_origin({'lat': '-6.8', 'lng': '39.25', 'radius': radius})
+
+    def test_rejects_out_of_range_coordinates(self):
+        with self.assertRaises(ValueError):
+            parse_origin({'lat': '120', 'lng': '39.25'})
+
+    def test_requires_origin_without_profile(self):
+        with self.assertRaises(ValueError):
+            parse_origin({})
+
+
+class ProximityFeedTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        university = University.objects.create(name='University of Dar es Salaam', short_name='UDSM')
+
+        def campus(name, km, **kwargs):
+            lat, lng = ORIGIN
+            location = Point(lng, lat + km / KM_PER_DEGREE_LAT, srid=4326)
+            return Campus.objects.create(name=name, university=university, location=location, **kwargs)
+
+        cls.near = campus('Mlimani', 1)
+        cls.middle = campus('Mabibo', 5)
+        cls.far = campus('Mbeya', 50)
+        campus('Closed', 2, is_active=False)
+        Campus.objects.create(name='Unmapped', university=university)
+
+        cls.owner = NewUser.objects.create_user(
+            email='seller@example.com', username='seller', phonenumber='+255717000001'
+        )
+        cls.category = Category.objects.create(name='Electronics')
+        cls.brand = Brand.objects.create(name='Tecno', created_by=cls.owner, is_active=True)
+
+    def create_product(self, name, campuses, age_hours=0, is_active=True):
+        product = Product.objects.create(
+            name=name, description='Barely used', brand=self.brand, category=self.category,
+            owner=self.owner, price=Decimal('150000'), is_active=is_active
+        )
+        product.campus.set(campuses)
+        ProductCampus.objects.filter(product=product).update(
+            created_at=timezone.now() - timedelta(hours=age_hours)
+        )
+        return product
+
+    def feed(self, campuses, **kwargs):
+        return ranked_feed(ProductCampus, 'product', 'is_active', campuses, **kwargs)
+
+    def test_radius_cut(self):
+        campuses = nearest_campuses(*ORIGIN, radius_km=10)
+        self.assertEqual([campus_id for campus_id, _ in campuses], [self.near.id, self.middle.id])
+        self.assertAlmostEqual(campuses[0][1], 1, delta=0.05)
+        self.assertAlmostEqual(campuses[1][1], 5, delta=0.1)
+        self.assertEqual(len(nearest_campuses(*ORIGIN, radius_km=100)), 3)
+
+    def test_orders_by_distance_then_recency(self):
+        old = self.create_product('Old phone', [self.near], age_hours=5)
+        new = self.create_product('New phone', [self.near], age_hours=1)
+        farther = self.create_product('Laptop', [self.middle], age_hours=0)
+        self.create_product('Hidden', [self.near], is_active=False)
+
+        ranked = proximity_feed(ProductCampus, 'product', 'is_active', *ORIGIN, radius_km=10)
+        self.assertEqual([product_id for product_id, _ in ranked], [new.id, old.id, farther.id])
+        self.assertEqual(ranked[0][1], ranked[1][1])
+        self.assertLess(ranked[1][1], ranked[2][1])
+
+    def test_listing_at_several_campuses_keeps_nearest_distance(self):
+        shared = self.create_product('Fridge', [self.near, self.middle])
+        ranked = self.feed([(self.near.id, 1.0), (self.middle.id, 5.0)])
+        self.assertEqual(ranked, [(shared.id, 1.0)])
+
+    def test_row_budget_stops_campus_scans(self):
+        first = self.create_product('Phone', [self.near], age_hours=2)
+        second = self.create_product('Radio', [self.near], age_hours=1)
+        self.create_product('Laptop', [self.middle])
+
+        with self.assertNumQueries(1):
+            ranked = self.feed([(self.near.id, 1.0), (self.middle.id, 5.0)], max_rows=2)
+        self.assertEqual([product_id for product_id, _ in ranked], [second.id, first.id])
+
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.feed([(self.near.id, 1.0), (self.middle.id, 5.0)], max_rows=3)), 3)
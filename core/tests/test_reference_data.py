@@ -0,0 +1,69 @@
+"""
+Tests for reference data fixture parsing and validation.
+"""
+import csv
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from core.services.reference_data import (
+    CSV_COLUMNS,
+    DEFAULT_FIXTURE,
+    ReferenceDataError,
+    read_fixture,
+    validate_fixture,
+)
+
+
+class ReferenceFixtureTestCase(SimpleTestCase):
+    """Fixture handling that runs before any database access."""
+
+    def fixture(self, **overrides):
+        university = {
+            'name': 'University of Dar es Salaam',
+            'short_name': 'UDSM',
+            'latitude': -6.7735,
+            'longitude': 39.2692,
+            'campuses': [{'name': 'Mlimani Campus', 'address': ' Mlimani Road ', 'latitude': '-6.7735', 'longitude': '39.2692'}],
+        }
+        university.update(overrides)
+        return {'version': 'test', 'universities': [university]}
+
+    def test_bundled_fixture_is_valid(self):
+        data = read_fixture(DEFAULT_FIXTURE)
+        self.assertTrue(data['version'])
+        self.assertTrue(any(university['campuses'] for university in data['universities']))
+
+    def test_validate_normalizes_values(self):
+        data = self.fixture()
+        validate_fixture(data)
+        university = data['universities'][0]
+        self.assertEqual(university['radius_km'], Decimal('5.00'))
+        self.assertEqual(university['campuses'][0]['address'], 'Mlimani Road')
+        self.assertEqual(university['campuses'][0]['latitude'], -6.7735)
+
+    def test_rejects_duplicates_and_bad_coordinates(self):
+        campus = {'name': 'Main', 'latitude': 0, 'longitude': 0}
+        with self.assertRaises(ReferenceDataError):
+            validate_fixture(self.fixture(campuses=[campus, dict(campus)]))
+        with self.assertRaises(ReferenceDataError):
+            validate_fixture(self.fixture(latitude=95))
+        with self.assertRaises(ReferenceDataError):
+            validate_fixture({'universities': self.fixture()['universities']})
+
+    def test_reads_csv_grouped_by_university(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'campuses-2026.csv'
+            with path.open('w', newline='') as fh:
+                writer = csv.DictWriter(fh, fieldnames=CSV_COLUMNS)
+                writer.writeheader()
+                base = {'university': 'Ardhi University', 'short_name': 'ARU', 'university_latitude': '-6.775',
+                        'university_longitude': '39.127', 'radius_km': ''}
+                writer.writerow({**base, 'campus': 'Main Campus', 'address': 'Mlimani', 'latitude': '-6.775', 'longitude': '39.127'})
+                writer.writerow({**base, 'campus': 'Mbezi Beach Campus', 'address': '', 'latitude': '-6.75', 'longitude': '39.2'})
+            data = read_fixture(path)
+        self.assertEqual(data['version'], 'campuses-2026')
+        self.assertEqual(len(data['universities']), 1)
+        self.assertEqual([c['name'] for c in data['universities'][0]['campuses']], ['Main Campus', 'Mbezi Beach Campus'])
@@ -1,7 +1,7 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.throttling import UserRateThrottle
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
@@ -21,7 +21,12 @@ from .models import University, Campus
 from .serializers import (
     UniversitySerializer, CampusSerializer
 )
-from django.contrib.gis.db.models.functions import Distance
+from .services.campus_index import get_campus_index
+from .services.campus_directory import campus_directory_delta, get_campus_directory, parse_since
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from .cache import UniversityCache
 # Remove any lingering references to LocationViewSet or Location
 
 logger = logging.getLogger(__name__)
@@ -64,6 +69,7 @@ class CampusViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Campus.objects.filter(is_active=True)
     serializer_class = CampusSerializer
     permission_classes = [AllowAny]
+    DIRECTORY_MAX_AGE = 300  # seconds clients/CDNs may reuse the campus directory
     
     def get_queryset(self):
         """Filter campuses by university if specified"""
@@ -76,24 +82,30 @@ class CampusViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def all(self, request):
         """
-        Get all campuses with coordinates - frontend handles distance calculations
-        """
-        campuses = Campus.objects.filter(
-            is_active=True
-        ).select_related('university')
+        Get all campuses with coordinates - frontend handles distance calculations.
 
-        campuses_data = []
-        for campus in campuses:
-            campus_data = CampusSerializer(campus).data
-            campus_data['university'] = UniversitySerializer(campus.university).data
-            # Include coordinates for frontend distance calculation
-            campus_data['latitude'] = campus.latitude
-            campus_data['longitude'] = campus.longitude
-            campuses_data.append(campus_data)
+        Served from a pre-rendered, pre-compressed artifact with an ETag. Pass
+        ``?since=<last_modified>`` to receive only campuses changed after that point.
+        """
+        since = request.query_params.get('since')
+        if since:
+            since_dt = parse_since(since)
+            if since_dt is None:
+                return Response({'error': 'since must be an ISO 8601 timestamp.'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(campus_directory_delta(since_dt))
 
-        return Response({
-            'campuses': campuses_data
-        })
+        directory = get_campus_directory()
+        if directory.etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            body, encoding = directory.encoded(request.headers.get('Accept-Encoding', ''))
+            response = HttpResponse(body, content_type='application/json')
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = directory.etag
+        response['Cache-Control'] = f'public, max-age={self.DIRECTORY_MAX_AGE}'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
 
     @action(detail=False, methods=['get'], url_path='nearby')
     def nearby(self, request):
@@ -101,29 +113,19 @@ class CampusViewSet(viewsets.ReadOnlyModelViewSet):
         Get campuses within a given radius (km) of provided lat/lng.
         Example: /api/campuses/nearby/?lat=-6.8&lng=39.2&radius=20
         """
-        from django.contrib.gis.geos import Point
-        from django.contrib.gis.measure import D
         try:
             lat = float(request.query_params.get('lat'))
             lng = float(request.query_params.get('lng'))
         except (TypeError, ValueError):
             return Response({'error': 'lat and lng are required and must be valid numbers.'}, status=400)
         radius = float(request.query_params.get('radius', 20))
-        user_location = Point(lng, lat)  # Note: Point(x, y) = (lng, lat)
-        qs = Campus.objects.filter(
-            is_active=True,
-            location__isnull=False,
-            location__distance_lte=(user_location, D(km=radius))
-        ).annotate(
-            distance=Distance('location', user_location)
-        ).order_by('distance').select_related('university')
-        data = []
-        for campus in qs:
-            campus_data = CampusSerializer(campus).data
-            campus_data['distance_km'] = round(campus.distance.km, 2) if hasattr(campus, 'distance') else None
-            campus_data['university'] = UniversitySerializer(campus.university).data
-            data.append(campus_data)
-        return Response({'campuses': data})
+        # Served from the in-memory campus index; no database query per request.
+        return Response({'campuses': get_campus_index().nearby(lat, lng, radius)})
+
+    @action(detail=False, methods=['get'], url_path='suggestion-cache-stats', permission_classes=[IsAdminUser])
+    def suggestion_cache_stats(self, request):
+        """Hit ratio of the geohash-bucketed campus suggestion cache."""
+        return Response(UniversityCache.campus_suggestion_stats())
 
 # Location context and suggestions now handled by frontend
 
@@ -1,32 +1,44 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, reverse
 from django.template.response import TemplateResponse
 from users.models import NewUser, Profile
 from shops.models import Shop, ShopMedia, Promotion, Event, Services, UserOffer, Subscription
 from marketplace.models import Category, Brand, Attribute, AttributeValue, Product, ProductImage, WhatsAppClick
 from estates.models import Property, PropertyType, PropertyImage
-from payments.models import PaymentService, Payment, Wallet, WalletTransaction
+from payments.models import PaymentService, Payment, Wallet, WalletTransaction, WalletMonthlySnapshot, PaymentDailyRollup
 from core.models import University
 from users.admin import NewUserAdmin, ProfileAdmin
 from shops.admin import ShopAdmin, ShopMediaAdmin, PromotionAdmin, EventAdmin, ServicesAdmin, UserOfferAdmin, SubscriptionAdmin
 from marketplace.admin import CategoryAdmin, BrandAdmin, AttributeAdmin, AttributeValueAdmin, ProductAdmin, ProductImageAdmin, WhatsAppClickAdmin
 from estates.admin import PropertyAdmin, PropertyTypeAdmin, PropertyImageAdmin
-from payments.admin import PaymentServiceAdmin, PaymentAdmin, WalletAdmin, WalletTransactionAdmin
+from payments.admin import PaymentServiceAdmin, PaymentAdmin, WalletAdmin, WalletTransactionAdmin, WalletMonthlySnapshotAdmin, PaymentDailyRollupAdmin
 from core.admin import UniversityAdmin
-from datetime import datetime, timedelta
-from django.db.models import Count, Sum, Q, Max
+from datetime import timedelta
+from django.contrib import messages
+from django.db.models import Q
+from django.http import HttpResponseNotAllowed
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_q.tasks import async_task
 from unfold.sites import UnfoldAdminSite
-from django.db.models.functions import ExtractYear, ExtractMonth
+from .models import DashboardSnapshot
+from .tasks import ANALYTICS_SNAPSHOT_KEY, REFRESH_PENDING_TIMEOUT, refresh_dashboard_snapshot
+
+SNAPSHOT_DATETIME_FIELDS = ('start_date', 'created_at', 'updated_at', 'date_added', 'last_login')
 
 class AnalyticsAdminSite(UnfoldAdminSite):
     site_header = "Mwanachuoshop Admin"
     site_title = "Mwanachuoshop Admin Portal"
     index_title = "Welcome to Mwanachuoshop Admin"
+    # "Refresh now" is ignored when the snapshot is younger than this.
+    MIN_REFRESH_INTERVAL = timedelta(seconds=30)
 
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             path('analytics/', self.admin_view(self.analytics_view), name='analytics'),
+            path('analytics/refresh/', self.admin_view(self.refresh_analytics_view), name='analytics_refresh'),
             path('', self.admin_view(self.analytics_view), name='index'),  # Make analytics the homepage
         ]
         return custom_urls + urls
@@ -35,121 +47,72 @@ class AnalyticsAdminSite(UnfoldAdminSite):
         return self.analytics_view(request)
 
     def analytics_view(self, request):
-        now = datetime.now()
-        month_ago = now - timedelta(days=30)
-        week_ago = now - timedelta(days=7)
-        today = now.date()
+        request.current_app = self.name
+        snapshot = DashboardSnapshot.objects.filter(key=ANALYTICS_SNAPSHOT_KEY).first()
+        if snapshot is None:
+            # First load before the scheduled job has run.
+            snapshot = refresh_dashboard_snapshot()
 
-        # KPIs
-        total_users = NewUser.objects.count()
-        active_users = NewUser.objects.filter(is_active=True).count()
-        new_users_month = NewUser.objects.filter(start_date__gte=month_ago).count()
-        total_shops = Shop.objects.count()
-        active_shops = Shop.objects.filter(is_active=True).count()
-        new_shops_month = Shop.objects.filter(created_at__gte=month_ago).count()
-        total_products = Product.objects.count()
-        active_products = Product.objects.filter(is_active=True).count()
-        new_products_month = Product.objects.filter(created_at__gte=month_ago).count()
-        total_properties = Property.objects.count()
-        new_properties_month = Property.objects.filter(created_at__gte=month_ago).count()
-        total_universities = University.objects.count()
-        active_universities = University.objects.filter(is_active=True).count()
-        total_payments = Payment.objects.count()
-        revenue_all = Payment.objects.aggregate(total=Sum('amount'))['total'] or 0
-        revenue_month = Payment.objects.filter(date_added__gte=month_ago).aggregate(total=Sum('amount'))['total'] or 0
-        revenue_today = Payment.objects.filter(date_added__date=today).aggregate(total=Sum('amount'))['total'] or 0
+        context = dict(
+            self.each_context(request),
+            **self._hydrate_snapshot(snapshot.data),
+            snapshot_generated_at=snapshot.generated_at,
+            snapshot_build_duration_ms=snapshot.build_duration_ms,
+        )
+        return TemplateResponse(request, "admin/analytics.html", context)
 
-        # Most popular university
-        top_university = University.objects.annotate(user_count=Count('campuses__profiles')).order_by('-user_count').first()
-        # Most active user/shop/product
-        most_active_user = NewUser.objects.annotate(num_products=Count('products')).order_by('-num_products').first()
-        most_active_shop = Shop.objects.annotate(num_products=Count('products')).order_by('-num_products').first()
-        most_active_product = Product.objects.annotate(num_views=Count('whatsapp_clicks')).order_by('-num_views').first()
+    def refresh_analytics_view(self, request):
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        index = redirect(reverse('admin:index', current_app=self.name))
+        snapshot = DashboardSnapshot.objects.filter(key=ANALYTICS_SNAPSHOT_KEY).first()
+        if snapshot is None:
+            return index  # The index builds the first snapshot itself.
+        if snapshot.age < self.MIN_REFRESH_INTERVAL:
+            messages.info(request, "Dashboard data was refreshed moments ago.")
+        elif self._claim_refresh(snapshot):
+            # The rebuild can outlast the HTTP timeout on a large tree, so it runs on django-q.
+            async_task('dashboard.tasks.refresh_dashboard_snapshot')
+            messages.success(request, "Dashboard refresh queued; reload in a moment to see the new data.")
+        else:
+            messages.info(request, "A dashboard refresh is already pending.")
+        return index
 
-        # Trends
-        user_growth = NewUser.objects.annotate(
-            year=ExtractYear('start_date'),
-            month=ExtractMonth('start_date')
-        ).values('year', 'month').annotate(count=Count('id')).order_by('year', 'month')
-        shop_growth = Shop.objects.annotate(
-            year=ExtractYear('created_at'),
-            month=ExtractMonth('created_at')
-        ).values('year', 'month').annotate(count=Count('id')).order_by('year', 'month')
-        product_growth = Product.objects.annotate(
-            year=ExtractYear('created_at'),
-            month=ExtractMonth('created_at')
-        ).values('year', 'month').annotate(count=Count('id')).order_by('year', 'month')
-        revenue_trend = Payment.objects.annotate(
-            year=ExtractYear('date_added'),
-            month=ExtractMonth('date_added')
-        ).values('year', 'month').annotate(total=Sum('amount')).order_by('year', 'month')
-        top_universities = University.objects.annotate(user_count=Count('campuses__profiles')).order_by('-user_count')[:5]
-        top_shops = Shop.objects.annotate(num_products=Count('products')).order_by('-num_products')[:5]
-        top_products = Product.objects.annotate(num_views=Count('whatsapp_clicks')).order_by('-num_views')[:5]
+    @staticmethod
+    def _claim_refresh(snapshot):
+        """
+        Mark a rebuild as requested unless one already is. The flag lives on the
+        snapshot row, so it is shared by every web process and cleared by the worker.
+        """
+        now = timezone.now()
+        return DashboardSnapshot.objects.filter(
+            Q(refresh_requested_at__isnull=True) | Q(refresh_requested_at__lt=now - REFRESH_PENDING_TIMEOUT),
+            pk=snapshot.pk,
+        ).update(refresh_requested_at=now) == 1
 
-        # Recent activity
-        recent_users = NewUser.objects.order_by('-start_date')[:5]
-        recent_shops = Shop.objects.order_by('-created_at')[:5]
-        recent_payments = Payment.objects.order_by('-date_added')[:5]
-        recent_products = Product.objects.order_by('-created_at')[:5]
-        recent_properties = Property.objects.order_by('-created_at')[:5]
+    @staticmethod
+    def _hydrate_snapshot(data):
+        """Turn the snapshot's ISO timestamps back into datetimes for the template's date filters."""
+        now = timezone.now()
+        for rows in data.values():
+            if not isinstance(rows, list):
+                continue
+            for row in rows:
+                if not isinstance(row, dict):
+                    continue
+                for field in SNAPSHOT_DATETIME_FIELDS:
+                    if isinstance(row.get(field), str):
+                        row[field] = parse_datetime(row[field])
+                if row.get('last_login'):
+                    row['inactive_days'] = (now - row['last_login']).days
+        return data
 
-        # Health & Engagement
-        inactive_users = NewUser.objects.filter(last_login__lt=week_ago)[:5]
-        inactive_shops = Shop.objects.filter(updated_at__lt=week_ago)[:5]
-        pending_shops = Shop.objects.filter(is_active=False)[:5]
-        flagged_products = Product.objects.filter(is_active=False)[:5]
+class DashboardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('key', 'generated_at', 'build_duration_ms')
+    readonly_fields = ('key', 'data', 'generated_at', 'build_duration_ms', 'refresh_requested_at')
 
-        context = dict(
-            self.each_context(request),
-            # KPIs
-            total_users=total_users,
-            active_users=active_users,
-            new_users_month=new_users_month,
-            total_shops=total_shops,
-            active_shops=active_shops,
-            new_shops_month=new_shops_month,
-            total_products=total_products,
-            active_products=active_products,
-            new_products_month=new_products_month,
-            total_properties=total_properties,
-            new_properties_month=new_properties_month,
-            total_universities=total_universities,
-            active_universities=active_universities,
-            total_payments=total_payments,
-            revenue_all=revenue_all,
-            revenue_month=revenue_month,
-            revenue_today=revenue_today,
-            # Top performers
-            top_university=top_university,
-            most_active_user=most_active_user,
-            most_active_shop=most_active_shop,
-            most_active_product=most_active_product,
-            # Trends
-            user_growth_dates=[f"{x['year']}-{x['month']:02d}" for x in user_growth],
-            user_growth_counts=[x['count'] for x in user_growth],
-            shop_growth_dates=[f"{x['year']}-{x['month']:02d}" for x in shop_growth],
-            shop_growth_counts=[x['count'] for x in shop_growth],
-            product_growth_dates=[f"{x['year']}-{x['month']:02d}" for x in product_growth],
-            product_growth_counts=[x['count'] for x in product_growth],
-            revenue_trend_dates=[f"{x['year']}-{x['month']:02d}" for x in revenue_trend],
-            revenue_trend_totals=[x['total'] for x in revenue_trend],
-            top_universities=top_universities,
-            top_shops=top_shops,
-            top_products=top_products,
-            # Recent activity
-            recent_users=recent_users,
-            recent_shops=recent_shops,
-            recent_payments=recent_payments,
-            recent_products=recent_products,
-            recent_properties=recent_properties,
-            # Health & Engagement
-            inactive_users=inactive_users,
-            inactive_shops=inactive_shops,
-            pending_shops=pending_shops,
-            flagged_products=flagged_products,
-        )
-        return TemplateResponse(request, "admin/analytics.html", context)
+    def has_add_permission(self, request):
+        return False  # Built by dashboard.tasks.refresh_dashboard_snapshot
 
 # Register the custom admin site
 admin_site = AnalyticsAdminSite(name='analytics_admin')
@@ -178,4 +141,7 @@ admin_site.register(PaymentService, PaymentServiceAdmin)
 admin_site.register(Payment, PaymentAdmin)
 admin_site.register(Wallet, WalletAdmin)
 admin_site.register(WalletTransaction, WalletTransactionAdmin)
+admin_site.register(WalletMonthlySnapshot, WalletMonthlySnapshotAdmin)
+admin_site.register(PaymentDailyRollup, PaymentDailyRollupAdmin)
 admin_site.register(University, UniversityAdmin)
+admin_site.register(DashboardSnapshot, DashboardSnapshotAdmin)
@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-19 02:56
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(default='analytics', max_length=50, unique=True)),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('generated_at', models.DateTimeField()),
+                ('build_duration_ms', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
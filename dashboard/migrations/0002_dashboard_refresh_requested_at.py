@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-19 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_dashboard_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardsnapshot',
+            name='refresh_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
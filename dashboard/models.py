@@ -1,3 +1,25 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class DashboardSnapshot(models.Model):
+    """
+    Precomputed analytics document rendered by the admin dashboard.
+
+    Rebuilt periodically by ``dashboard.tasks.refresh_dashboard_snapshot`` so
+    admin page loads read one row instead of running the analytics queries.
+    """
+    key = models.CharField(max_length=50, unique=True, default='analytics')
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    generated_at = models.DateTimeField()
+    build_duration_ms = models.PositiveIntegerField(default=0)
+    # Set when the admin's "refresh now" queues a rebuild; cleared by the rebuild.
+    refresh_requested_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.key} snapshot @ {self.generated_at:%Y-%m-%d %H:%M:%S}"
+
+    @property
+    def age(self):
+        return timezone.now() - self.generated_at
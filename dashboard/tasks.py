@@ -0,0 +1,189 @@
+# dashboard/tasks.py
+from datetime import timedelta
+import logging
+import time
+
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear, TruncMonth
+from django.utils import timezone
+
+from core.models import University
+from estates.models import Property
+from marketplace.models import Product
+from payments.models import Payment, PaymentDailyRollup
+from shops.models import Shop
+from users.models import NewUser
+
+from .models import DashboardSnapshot
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_SNAPSHOT_KEY = 'analytics'
+# A queued "refresh now" older than this is assumed lost and may be queued again.
+REFRESH_PENDING_TIMEOUT = timedelta(minutes=5)
+TOP_N = 5
+
+
+def _monthly(queryset, field):
+    rows = queryset.annotate(
+        year=ExtractYear(field),
+        month=ExtractMonth(field)
+    ).values('year', 'month').annotate(count=Count('id')).order_by('year', 'month')
+    return {
+        'dates': [f"{row['year']}-{row['month']:02d}" for row in rows],
+        'counts': [row['count'] for row in rows],
+    }
+
+
+def build_analytics_snapshot():
+    """Run every KPI, trend and top-N query for the admin dashboard and return a JSON-ready dict."""
+    now = timezone.now()
+    month_ago = now - timedelta(days=30)
+    week_ago = now - timedelta(days=7)
+    today = timezone.localdate()
+
+    users = NewUser.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        new_month=Count('id', filter=Q(start_date__gte=month_ago)),
+    )
+    shops = Shop.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        new_month=Count('id', filter=Q(created_at__gte=month_ago)),
+    )
+    products = Product.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        new_month=Count('id', filter=Q(created_at__gte=month_ago)),
+    )
+    properties = Property.objects.aggregate(
+        total=Count('id'),
+        new_month=Count('id', filter=Q(created_at__gte=month_ago)),
+    )
+    universities = University.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+
+    # Revenue comes from the per-day payment rollups (completed payments only).
+    total_payments = PaymentDailyRollup.objects.aggregate(total=Sum('count'))['total'] or 0
+    completed_rollups = PaymentDailyRollup.objects.filter(status=Payment.PaymentStatus.COMPLETED)
+    revenue = completed_rollups.aggregate(
+        all=Sum('total'),
+        month=Sum('total', filter=Q(date__gte=month_ago.date())),
+        today=Sum('total', filter=Q(date=today)),
+    )
+    revenue_trend = completed_rollups.annotate(
+        period=TruncMonth('date')
+    ).values('period').annotate(total=Sum('total')).order_by('period')
+
+    top_universities = list(
+        University.objects.annotate(user_count=Count('campuses__profiles'))
+        .order_by('-user_count').values('id', 'name', 'user_count')[:TOP_N]
+    )
+    top_shops = list(
+        Shop.objects.annotate(num_products=Count('products'))
+        .order_by('-num_products').values('id', 'name', 'is_active', 'num_products')[:TOP_N]
+    )
+    top_products = list(
+        Product.objects.annotate(num_views=Count('whatsapp_clicks'))
+        .order_by('-num_views').values('id', 'name', 'is_active', 'num_views')[:TOP_N]
+    )
+    most_active_user = (
+        NewUser.objects.annotate(num_products=Count('products'))
+        .order_by('-num_products').values('id', 'username', 'num_products').first()
+    )
+
+    user_growth = _monthly(NewUser.objects.all(), 'start_date')
+    shop_growth = _monthly(Shop.objects.all(), 'created_at')
+    product_growth = _monthly(Product.objects.all(), 'created_at')
+
+    return {
+        'total_users': users['total'],
+        'active_users': users['active'],
+        'new_users_month': users['new_month'],
+        'total_shops': shops['total'],
+        'active_shops': shops['active'],
+        'new_shops_month': shops['new_month'],
+        'total_products': products['total'],
+        'active_products': products['active'],
+        'new_products_month': products['new_month'],
+        'total_properties': properties['total'],
+        'new_properties_month': properties['new_month'],
+        'total_universities': universities['total'],
+        'active_universities': universities['active'],
+        'total_payments': total_payments,
+        'revenue_all': revenue['all'] or 0,
+        'revenue_month': revenue['month'] or 0,
+        'revenue_today': revenue['today'] or 0,
+        # Top performers
+        'top_university': top_universities[0] if top_universities else None,
+        'most_active_user': most_active_user,
+        'most_active_shop': top_shops[0] if top_shops else None,
+        'most_active_product': top_products[0] if top_products else None,
+        # Trends
+        'user_growth_dates': user_growth['dates'],
+        'user_growth_counts': user_growth['counts'],
+        'shop_growth_dates': shop_growth['dates'],
+        'shop_growth_counts': shop_growth['counts'],
+        'product_growth_dates': product_growth['dates'],
+        'product_growth_counts': product_growth['counts'],
+        'revenue_trend_dates': [f"{row['period']:%Y-%m}" for row in revenue_trend],
+        'revenue_trend_totals': [float(row['total']) for row in revenue_trend],
+        'top_universities': top_universities,
+        'top_shops': top_shops,
+        'top_products': top_products,
+        # Recent activity
+        'recent_users': list(
+            NewUser.objects.order_by('-start_date').values('id', 'username', 'start_date', 'is_active')[:TOP_N]
+        ),
+        'recent_shops': list(
+            Shop.objects.order_by('-created_at').values('id', 'name', 'created_at', 'is_active')[:TOP_N]
+        ),
+        'recent_payments': list(
+            Payment.objects.order_by('-date_added').values('id', 'amount', 'date_added', username=F('user__username'))[:TOP_N]
+        ),
+        'recent_products': list(
+            Product.objects.order_by('-created_at').values('id', 'name', 'created_at', 'is_active')[:TOP_N]
+        ),
+        'recent_properties': list(
+            Property.objects.order_by('-created_at').values('id', 'title', 'created_at')[:TOP_N]
+        ),
+        # Health & Engagement
+        'inactive_users': list(
+            NewUser.objects.filter(last_login__lt=week_ago).values('id', 'username', 'last_login')[:TOP_N]
+        ),
+        'inactive_shops': list(
+            Shop.objects.filter(updated_at__lt=week_ago).values('id', 'name', 'updated_at')[:TOP_N]
+        ),
+        'pending_shops': list(
+            Shop.objects.filter(is_active=False).values('id', 'name', 'created_at')[:TOP_N]
+        ),
+        'flagged_products': list(
+            Product.objects.filter(is_active=False).values('id', 'name')[:TOP_N]
+        ),
+    }
+
+
+def refresh_dashboard_snapshot():
+    """
+    Rebuild the admin analytics snapshot.
+
+    Scheduled every few minutes via django-q (see ``setup_schedules``) and also
+    queued by the dashboard's "refresh now" button.
+    """
+    started = time.monotonic()
+    data = build_analytics_snapshot()
+    duration_ms = int((time.monotonic() - started) * 1000)
+    snapshot, _ = DashboardSnapshot.objects.update_or_create(
+        key=ANALYTICS_SNAPSHOT_KEY,
+        defaults={
+            'data': data,
+            'generated_at': timezone.now(),
+            'build_duration_ms': duration_ms,
+            'refresh_requested_at': None,
+        }
+    )
+    logger.info(f"Rebuilt dashboard snapshot in {duration_ms} ms")
+    return snapshot
@@ -1,3 +1,100 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from payments.models import Payment
+from users.models import NewUser
+
+from .models import DashboardSnapshot
+from .tasks import ANALYTICS_SNAPSHOT_KEY, REFRESH_PENDING_TIMEOUT, build_analytics_snapshot, refresh_dashboard_snapshot
+
+
+class AnalyticsSnapshotTests(TestCase):
+    """KPIs come from aggregates and the payment rollups, not per-row queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = NewUser.objects.create_user(
+            email='buyer@example.com', username='buyer', phonenumber='+255714000001'
+        )
+        NewUser.objects.create_user(
+            email='dormant@example.com', username='dormant', phonenumber='+255714000002', is_active=False
+        )
+        for amount, status in (
+            ('1000.00', Payment.PaymentStatus.COMPLETED),
+            ('250.00', Payment.PaymentStatus.COMPLETED),
+            ('400.00', Payment.PaymentStatus.PENDING),
+        ):
+            Payment.objects.create(
+                user=cls.buyer, amount=Decimal(amount), status=status, payment_type=Payment.PaymentType.DEPOSIT
+            )
+
+    def test_kpis(self):
+        data = build_analytics_snapshot()
+        self.assertEqual((data['total_users'], data['active_users'], data['new_users_month']), (2, 1, 2))
+        self.assertEqual(data['total_payments'], 3)
+        self.assertEqual(data['revenue_all'], Decimal('1250.00'))
+        self.assertEqual(data['revenue_month'], Decimal('1250.00'))
+        self.assertEqual(data['revenue_today'], Decimal('1250.00'))
+        self.assertEqual(data['revenue_trend_dates'], [f'{timezone.localdate():%Y-%m}'])
+        self.assertEqual(data['revenue_trend_totals'], [1250.0])
+        self.assertEqual(data['user_growth_counts'], [2])
+        self.assertEqual(data['total_products'], 0)
+        self.assertIsNone(data['most_active_product'])
+        self.assertEqual([row['username'] for row in data['recent_payments']], ['buyer'] * 3)
+
+    def test_refresh_stores_one_snapshot_row(self):
+        refresh_dashboard_snapshot()
+        snapshot = refresh_dashboard_snapshot()
+        self.assertEqual(DashboardSnapshot.objects.count(), 1)
+        self.assertEqual(snapshot.key, ANALYTICS_SNAPSHOT_KEY)
+        self.assertEqual(DashboardSnapshot.objects.get().data['total_users'], 2)
+
+
+class RefreshAnalyticsViewTests(TestCase):
+    """"Refresh now" queues the rebuild instead of running it in the request."""
+
+    def setUp(self):
+        admin = NewUser.objects.create_superuser(
+            email='admin@example.com', username='admin', phonenumber='+255714000003', password='pw'
+        )
+        self.client.force_login(admin)
+        self.url = reverse('admin:analytics_refresh')
+
+    def stale_snapshot(self):
+        snapshot = refresh_dashboard_snapshot()
+        DashboardSnapshot.objects.filter(pk=snapshot.pk).update(generated_at=timezone.now() - timedelta(hours=1))
+        return snapshot
+
+    @mock.patch('dashboard.admin.async_task')
+    def test_queues_one_refresh(self, async_task):
+        snapshot = self.stale_snapshot()
+        self.client.post(self.url)
+        self.client.post(self.url)
+        async_task.assert_called_once_with('dashboard.tasks.refresh_dashboard_snapshot')
+
+        snapshot.refresh_from_db()
+        self.assertIsNotNone(snapshot.refresh_requested_at)
+        self.assertIsNone(refresh_dashboard_snapshot().refresh_requested_at)
+
+    @mock.patch('dashboard.admin.async_task')
+    def test_lost_request_can_be_queued_again(self, async_task):
+        snapshot = self.stale_snapshot()
+        DashboardSnapshot.objects.filter(pk=snapshot.pk).update(
+            refresh_requested_at=timezone.now() - REFRESH_PENDING_TIMEOUT - timedelta(seconds=1)
+        )
+        self.client.post(self.url)
+        async_task.assert_called_once()
+
+    @mock.patch('dashboard.admin.async_task')
+    def test_fresh_snapshot_is_not_rebuilt(self, async_task):
+        refresh_dashboard_snapshot()
+        self.client.post(self.url)
+        async_task.assert_not_called()
 
-# Create your tests here.
+    def test_get_is_rejected(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
@@ -9,7 +9,7 @@ from django.db import transaction
 import logging
 
 
-from .models import Property, PropertyType, PropertyImage
+from .models import Property, PropertyType, PropertyImage, PropertyCampus, PropertyVideo
 from payments.models import Payment
 
 logger = logging.getLogger(__name__)
@@ -27,6 +27,19 @@ class PropertyImageInline(admin.TabularInline):
         return "No Image"
     image_preview.short_description = 'Preview'
 
+class PropertyVideoInline(admin.TabularInline):
+    model = PropertyVideo
+    extra = 0
+    fields = ('source', 'status', 'progress', 'attempts', 'duration', 'error_message')
+    readonly_fields = ('status', 'progress', 'attempts', 'duration', 'error_message')
+
+class PropertyCampusInline(admin.TabularInline):
+    model = PropertyCampus
+    extra = 1
+    fields = ('campus',)
+    verbose_name = 'Campus'
+    verbose_name_plural = 'Campuses'
+
 # Admin for PropertyType
 @admin.register(PropertyType)
 class PropertyTypeAdmin(ModelAdmin):
@@ -50,14 +63,14 @@ class PropertyAdmin(ModelAdmin):
     default_lat = -6.8
     default_zoom = 6
     readonly_fields = ('slug', 'created_at', 'updated_at')
-    inlines = [PropertyImageInline]
+    inlines = [PropertyCampusInline, PropertyImageInline, PropertyVideoInline]
     actions = ['activate_properties', 'deactivate_properties']
     fieldsets = (
         (None, {
             'fields': ('owner', 'property_type', 'title', 'slug', 'location', 'price', 'is_available')
         }),
         ('Details', {
-            'fields': ('features', 'campus')
+            'fields': ('features',)
         }),
     )
 
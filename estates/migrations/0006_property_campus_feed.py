@@ -0,0 +1,67 @@
+# Converts the auto-created Property.campus join table into the explicit
+# PropertyCampus model in place, then adds the denormalized feed columns.
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_listing_fields(apps, schema_editor):
+    Property = apps.get_model('estates', 'Property')
+    PropertyCampus = apps.get_model('estates', 'PropertyCampus')
+    properties = Property.objects.filter(pk=models.OuterRef('property_id'))
+    PropertyCampus.objects.update(
+        is_available=models.Subquery(properties.values('is_available')[:1]),
+        created_at=models.Subquery(properties.values('created_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_delete_location'),
+        ('estates', '0005_update_campus_to_many_to_many'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='PropertyCampus',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('campus', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='property_links', to='core.campus')),
+                        ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='campus_links', to='estates.property')),
+                    ],
+                    options={
+                        'db_table': 'estates_property_campus',
+                        'unique_together': {('property', 'campus')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='property',
+                    name='campus',
+                    field=models.ManyToManyField(blank=True, related_name='properties', through='estates.PropertyCampus', to='core.campus'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='propertycampus',
+            name='is_available',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='propertycampus',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copy_listing_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='propertycampus',
+            index=models.Index(fields=['campus', 'is_available', '-created_at'], include=('property',), name='est_propcampus_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_available', '-created_at'], name='est_property_avail_recent_idx'),
+        ),
+    ]
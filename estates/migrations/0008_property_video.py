@@ -0,0 +1,39 @@
+# Generated by Django 5.1 on 2026-10-19 03:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('estates', '0007_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyVideo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.FileField(upload_to='property_videos/')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('duration', models.FloatField(blank=True, null=True)),
+                ('renditions', models.JSONField(blank=True, default=dict, editable=False)),
+                ('hls_playlist', models.CharField(blank=True, default='', max_length=255)),
+                ('thumbnail', models.ImageField(blank=True, null=True, upload_to='property_videos/thumbnails/')),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='videos', to='estates.property')),
+            ],
+            options={
+                'verbose_name': 'Property Video',
+                'verbose_name_plural': 'Property Videos',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='propertyvideo_queue_idx')],
+            },
+        ),
+    ]
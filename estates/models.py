@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.contenttypes.models import ContentType
 from decimal import Decimal
@@ -26,7 +27,7 @@ class PropertyType(models.Model):
         return self.name
 
 class Property(models.Model):
-    """Property model with image support only (no video)"""
+    """Property listing; media lives in PropertyImage and PropertyVideo"""
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='properties')
     property_type = models.ForeignKey(PropertyType, on_delete=models.PROTECT, related_name='properties')
     title = models.CharField(max_length=100)
@@ -38,7 +39,7 @@ class Property(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     # Change campus to ManyToManyField
-    campus = models.ManyToManyField(Campus, related_name='properties', blank=True)
+    campus = models.ManyToManyField(Campus, related_name='properties', blank=True, through='PropertyCampus')
 
     class Meta:
         verbose_name = "Property"
@@ -53,6 +54,7 @@ class Property(models.Model):
             models.Index(fields=['slug']),
             models.Index(fields=['location']),
             models.Index(fields=['is_available', 'location']),
+            models.Index(fields=['is_available', '-created_at'], name='est_property_avail_recent_idx'),
         ]
 
     def __str__(self):
@@ -107,11 +109,44 @@ class Property(models.Model):
                 payment.save()
                 raise
 
+class PropertyCampus(models.Model):
+    """
+    Through table for ``Property.campus``. Carries copies of the property's
+    ``is_available`` and ``created_at`` so campus feeds are answered from one
+    covering index; kept in sync by ``estates.signals``.
+    """
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='campus_links')
+    campus = models.ForeignKey(Campus, on_delete=models.CASCADE, related_name='property_links')
+    is_available = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'estates_property_campus'
+        unique_together = ('property', 'campus')
+        indexes = [
+            models.Index(
+                fields=['campus', 'is_available', '-created_at'],
+                include=['property'],
+                name='est_propcampus_feed_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.is_available = self.property.is_available
+            self.created_at = self.property.created_at
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.property_id} @ campus {self.campus_id}"
+
 class PropertyImage(models.Model):
     """Property image model"""
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='property_images')
     image = models.ImageField(upload_to='property_images/')
     is_primary = models.BooleanField(default=False)
+    # Resized renditions, filled in by core.tasks.generate_image_derivatives
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -126,4 +161,45 @@ class PropertyImage(models.Model):
         # If this image is being set as primary, unset all other primary images for this property
         if self.is_primary:
             PropertyImage.objects.filter(property=self.property, is_primary=True).update(is_primary=False)
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class PropertyVideo(models.Model):
+    """
+    Uploaded walkthrough video, transcoded to adaptive HLS by
+    ``estates.tasks``. Finished renditions are recorded in ``renditions`` as
+    they complete, so a job interrupted by a crash or worker timeout resumes
+    with the remaining ones.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PROCESSING = 'processing', 'Processing'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='videos')
+    source = models.FileField(upload_to='property_videos/')
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    attempts = models.PositiveSmallIntegerField(default=0)
+    duration = models.FloatField(null=True, blank=True)  # seconds
+    # {"720p": {"playlist": "hls/1/720p/index.m3u8", "bandwidth": 3000000, "resolution": "1280x720"}, ...}
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    hls_playlist = models.CharField(max_length=255, blank=True, default='')  # master playlist name
+    thumbnail = models.ImageField(upload_to='property_videos/thumbnails/', null=True, blank=True)
+    error_message = models.TextField(blank=True, default='')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # refreshed while a worker owns the job
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Property Video"
+        verbose_name_plural = "Property Videos"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='propertyvideo_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Video for {self.property.title} ({self.status})"
+
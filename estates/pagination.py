@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 class StandardPagePagination(PageNumberPagination):
@@ -13,3 +13,11 @@ class StandardPagePagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+class CampusFeedCursorPagination(CursorPagination):
+    """Pages ``PropertyCampus`` rows; the feed index is ordered on ``created_at``."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
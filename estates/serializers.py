@@ -2,10 +2,14 @@ from datetime import datetime, timedelta
 from rest_framework import serializers
 from django.urls import reverse
 from decimal import Decimal
-from .models import Property, PropertyImage, PropertyType
+from .models import Property, PropertyImage, PropertyType, PropertyVideo
 from users.models import NewUser, Profile
 from core.models import University, Campus
+from core.media import media_url
+from core.serializers import ImagePlaceholderField, ImageVariantsField, MediaImageField
+from core.services.media_ingest import MediaIngestError, ingest_images
 from dj_rest_auth.serializers import UserDetailsSerializer
+from drf_spectacular.utils import extend_schema_field
 import os
 from cloudflare import Cloudflare
 from django.conf import settings
@@ -20,16 +24,42 @@ class PropertyTypeSerializer(serializers.ModelSerializer):
 
 class PropertyImageSerializer(serializers.ModelSerializer):
     property = serializers.PrimaryKeyRelatedField(queryset=Property.objects.all())
+    image = MediaImageField()
+    variants = ImageVariantsField()
+    placeholder = ImagePlaceholderField()
 
     class Meta:
         model = PropertyImage
-        fields = ['id', 'property', 'image', 'is_primary', 'created_at']
+        fields = ['id', 'property', 'image', 'is_primary', 'created_at', 'variants', 'placeholder']
         read_only_fields = ['created_at']
 
+class PropertyVideoSerializer(serializers.ModelSerializer):
+    property = serializers.PrimaryKeyRelatedField(queryset=Property.objects.all())
+    source = serializers.FileField(write_only=True)
+    thumbnail = MediaImageField(read_only=True)
+    hls_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PropertyVideo
+        fields = ['id', 'property', 'source', 'status', 'progress', 'duration', 'hls_url', 'thumbnail', 'created_at']
+        read_only_fields = ['status', 'progress', 'duration', 'created_at']
+
+    def validate_source(self, value):
+        content_type = getattr(value, 'content_type', '') or ''
+        if not content_type.startswith('video/'):
+            raise serializers.ValidationError("Upload a video file.")
+        return value
+
+    @extend_schema_field(serializers.CharField(allow_null=True))
+    def get_hls_url(self, obj):
+        if obj.status != PropertyVideo.Status.READY or not obj.hls_playlist:
+            return None
+        return media_url(obj.hls_playlist, self.context.get('request'), storage=obj.source.storage)
+
 class CustomUserDetailsSerializer(UserDetailsSerializer):
     profile_id = serializers.IntegerField(source='profile.id', read_only=True)
     whatsapp = serializers.CharField(source='profile.whatsapp', read_only=True, allow_null=True)
-    profile_image = serializers.ImageField(source='profile.image', read_only=True, allow_null=True)
+    profile_image = MediaImageField(source='profile.image', read_only=True, allow_null=True)
 
     class Meta(UserDetailsSerializer.Meta):
         ref_name = "EstatesAppCustomUserDetails"
@@ -62,9 +92,9 @@ class PropertySerializer(serializers.ModelSerializer):
         source='property_type',
         write_only=True
     )
-    images = PropertyImageSerializer(many=True, read_only=True)
+    images = PropertyImageSerializer(source='property_images', many=True, read_only=True)
     images_upload = serializers.ListField(
-        child=serializers.ImageField(),
+        child=MediaImageField(),
         write_only=True,
         required=False,
         help_text="Upload multiple images at once."
@@ -98,8 +128,10 @@ class PropertySerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         images_data = validated_data.pop('images_upload', [])
         property_instance = super().create(validated_data)
-        for image in images_data:
-            PropertyImage.objects.create(property=property_instance, image=image)
+        try:
+            ingest_images(PropertyImage, 'property', property_instance, images_data, has_primary=False)
+        except MediaIngestError as e:
+            raise serializers.ValidationError({'images_upload': f'Image upload failed: {e}'})
         return property_instance
 
     def validate(self, data):
@@ -30,3 +30,56 @@
 #         logger.info(f"Video transcoding not queued for Property ID {instance.id}. Video present: {bool(instance.video)}, Changed: {current_video != original_video}")
 
 #     instance._original_video = current_video
+
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django_q.tasks import async_task
+from estates.models import Property, PropertyCampus, PropertyVideo
+
+@receiver(post_save, sender=Property)
+def sync_campus_links(sender, instance, created, raw=False, **kwargs):
+    """Mirror the property's is_available onto its campus feed rows."""
+    if raw or created:
+        return
+    PropertyCampus.objects.filter(property=instance).exclude(
+        is_available=instance.is_available
+    ).update(is_available=instance.is_available)
+
+@receiver(m2m_changed, sender=PropertyCampus)
+def copy_listing_fields_to_campus_links(sender, instance, action, reverse, pk_set, **kwargs):
+    """Fill is_available/created_at on rows added through property.campus.add()/set()."""
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        # campus.properties.add(...): instance is the Campus, pk_set holds property ids.
+        properties = Property.objects.filter(pk=OuterRef('property_id'))
+        PropertyCampus.objects.filter(campus=instance, property_id__in=pk_set).update(
+            is_available=Subquery(properties.values('is_available')[:1]),
+            created_at=Subquery(properties.values('created_at')[:1])
+        )
+    else:
+        PropertyCampus.objects.filter(property=instance, campus_id__in=pk_set).update(
+            is_available=instance.is_available,
+            created_at=instance.created_at
+        )
+
+@receiver(post_save, sender=PropertyVideo)
+def queue_video_transcoding(sender, instance, created, raw=False, **kwargs):
+    """Transcode new uploads once the row is committed."""
+    if raw or not created:
+        return
+    video_id = instance.pk
+    transaction.on_commit(lambda: async_task(
+        'estates.tasks.transcode_property_video', video_id, group=f'property_video_{video_id}'
+    ))
+
+@receiver(post_delete, sender=PropertyVideo)
+def delete_video_output(sender, instance, **kwargs):
+    """django_cleanup handles source/thumbnail; the HLS output is only referenced by name."""
+    from estates.tasks import delete_hls_output
+
+    storage, video_id, renditions = instance.source.storage, instance.pk, instance.renditions
+    transaction.on_commit(lambda: delete_hls_output(storage, video_id, renditions))
@@ -0,0 +1,206 @@
+# estates/tasks.py
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import PropertyVideo
+from .transcoding import (
+    ProgressTracker,
+    extract_thumbnail,
+    hls_command,
+    master_playlist,
+    probe,
+    renditions_for,
+    run_ffmpeg,
+    threads_per_job,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+STALE_AFTER = timedelta(minutes=10)  # a job without a heartbeat for this long is resumable
+HEARTBEAT_SECONDS = 15
+HLS_ROOT = 'hls'
+
+
+def claim_video(video_id=None):
+    """
+    Atomically take one pending video, or one whose worker stopped sending
+    heartbeats, and mark it processing. Rows locked by a concurrent claim are
+    skipped. Returns the claimed video or None.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = PropertyVideo.objects.select_for_update(skip_locked=True).filter(
+            Q(status=PropertyVideo.Status.PENDING) |
+            Q(status=PropertyVideo.Status.PROCESSING, heartbeat_at__lt=now - STALE_AFTER),
+            attempts__lt=MAX_ATTEMPTS
+        )
+        if video_id is not None:
+            queryset = queryset.filter(pk=video_id)
+        video = queryset.order_by('created_at').first()
+        if video is None:
+            return None
+        video.status = PropertyVideo.Status.PROCESSING
+        video.attempts += 1
+        video.heartbeat_at = now
+        video.save(update_fields=['status', 'attempts', 'heartbeat_at', 'updated_at'])
+    return video
+
+
+def _save_state(video, **fields):
+    for name, value in fields.items():
+        setattr(video, name, value)
+    video.heartbeat_at = timezone.now()
+    PropertyVideo.objects.filter(pk=video.pk).update(heartbeat_at=video.heartbeat_at, **fields)
+
+
+def _replace(storage, name, content):
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, content)
+
+
+def _upload_rendition(storage, video, rendition, local_dir, width):
+    prefix = f'{HLS_ROOT}/{video.pk}/{rendition.name}'
+    for filename in sorted(os.listdir(local_dir)):
+        with open(os.path.join(local_dir, filename), 'rb') as fh:
+            _replace(storage, f'{prefix}/{filename}', File(fh))
+    return {
+        'playlist': f'{prefix}/index.m3u8',
+        'bandwidth': rendition.bandwidth,
+        'resolution': f'{width}x{rendition.height}',
+    }
+
+
+def transcode(video):
+    """
+    Transcode a claimed video to HLS. Renditions already recorded on the row
+    (from an interrupted run) are skipped; the rest run in parallel, and each
+    one is uploaded and recorded as soon as it finishes.
+    """
+    storage = video.source.storage
+    with tempfile.TemporaryDirectory(prefix=f'property-video-{video.pk}-') as workdir:
+        source_path = os.path.join(workdir, 'source' + os.path.splitext(video.source.name)[1])
+        with video.source.open('rb') as src, open(source_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        info = probe(source_path)
+        wanted = renditions_for(info.height)
+        renditions = {name: entry for name, entry in video.renditions.items() if name in {r.name for r in wanted}}
+        pending = [r for r in wanted if r.name not in renditions]
+        tracker = ProgressTracker([r.name for r in wanted], done=renditions)
+        _save_state(video, duration=info.duration, progress=tracker.percent)
+        if renditions:
+            logger.info(f"Resuming video {video.pk}: {', '.join(renditions)} already done")
+
+        threads = threads_per_job(len(pending))
+        with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as pool:
+            futures = {}
+            for rendition in pending:
+                output_dir = os.path.join(workdir, rendition.name)
+                os.makedirs(output_dir)
+                command = hls_command(source_path, output_dir, rendition, info.has_audio, threads)
+                future = pool.submit(run_ffmpeg, command, info.duration, tracker.callback(rendition.name))
+                futures[future] = (rendition, output_dir)
+
+            remaining = set(futures)
+            while remaining:
+                finished, remaining = wait(remaining, timeout=HEARTBEAT_SECONDS, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    future.result()
+                    rendition, output_dir = futures[future]
+                    # -2 in the scale filter keeps the aspect ratio with an even width.
+                    width = 2 * round(info.width * rendition.height / info.height / 2) if info.height else 0
+                    renditions[rendition.name] = _upload_rendition(storage, video, rendition, output_dir, width)
+                    _save_state(video, renditions=dict(renditions))
+                _save_state(video, progress=min(tracker.percent, 99))
+
+        playlist_name = _replace(
+            storage, f'{HLS_ROOT}/{video.pk}/master.m3u8', ContentFile(master_playlist(renditions).encode())
+        )
+
+        thumbnail_path = os.path.join(workdir, 'thumbnail.jpg')
+        extract_thumbnail(source_path, thumbnail_path, info.duration)
+        with open(thumbnail_path, 'rb') as fh:
+            video.thumbnail.save(f'{video.pk}.jpg', File(fh), save=False)
+
+    video.hls_playlist = playlist_name
+    video.status = PropertyVideo.Status.READY
+    video.progress = 100
+    video.error_message = ''
+    video.heartbeat_at = None
+    video.save(update_fields=[
+        'hls_playlist', 'thumbnail', 'status', 'progress', 'error_message', 'heartbeat_at', 'updated_at'
+    ])
+    logger.info(f"Video {video.pk} ready: {len(renditions)} renditions, {video.duration:.0f}s")
+
+
+def run_claimed(video):
+    try:
+        transcode(video)
+    except Exception as e:
+        failed = video.attempts >= MAX_ATTEMPTS
+        logger.exception(f"Transcoding video {video.pk} failed (attempt {video.attempts}): {e}")
+        PropertyVideo.objects.filter(pk=video.pk).update(
+            status=PropertyVideo.Status.FAILED if failed else PropertyVideo.Status.PENDING,
+            error_message=str(e)[:2000],
+            heartbeat_at=None,
+            updated_at=timezone.now()
+        )
+        return False
+    return True
+
+
+def transcode_property_video(video_id):
+    """django-q entry point queued when a video is uploaded."""
+    video = claim_video(video_id)
+    if video is None:
+        logger.info(f"Video {video_id} is not claimable (already processing or done)")
+        return False
+    return run_claimed(video)
+
+
+def process_pending_videos(limit=1):
+    """
+    Periodic sweep: retry pending videos, resume stalled ones, and give up on
+    jobs that stalled on their last attempt. Returns the number processed.
+    """
+    PropertyVideo.objects.filter(
+        status=PropertyVideo.Status.PROCESSING,
+        heartbeat_at__lt=timezone.now() - STALE_AFTER,
+        attempts__gte=MAX_ATTEMPTS
+    ).update(status=PropertyVideo.Status.FAILED, error_message='Worker stopped responding', heartbeat_at=None)
+
+    processed = 0
+    while processed < limit:
+        video = claim_video()
+        if video is None:
+            break
+        run_claimed(video)
+        processed += 1
+    return processed
+
+
+def delete_hls_output(storage, video_id, renditions):
+    """Remove a video's HLS playlists and segments."""
+    for entry in (renditions or {}).values():
+        directory = os.path.dirname(entry['playlist'])
+        try:
+            _, files = storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for filename in files:
+            storage.delete(f'{directory}/{filename}')
+    master = f'{HLS_ROOT}/{video_id}/master.m3u8'
+    if storage.exists(master):
+        storage.delete(master)
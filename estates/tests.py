@@ -1,3 +1,250 @@
-from django.test import TestCase
+import os
+import shutil
+import sys
+import tempfile
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Campus, University
+from users.models import NewUser
+from estates.models import Property, PropertyCampus, PropertyType, PropertyVideo
+from estates.tasks import (
+    MAX_ATTEMPTS,
+    STALE_AFTER,
+    claim_video,
+    process_pending_videos,
+    transcode,
+    transcode_property_video,
+)
+
+from estates.transcoding import (
+    RENDITIONS,
+    ProbeResult,
+    ProgressTracker,
+    TranscodeError,
+    master_playlist,
+    parse_progress_line,
+    renditions_for,
+    run_ffmpeg,
+)
+
+
+class TranscodingHelpersTests(SimpleTestCase):
+    """ffmpeg plumbing for property videos (no ffmpeg or database needed)."""
+
+    def test_progress_lines(self):
+        self.assertEqual(parse_progress_line('out_time_us=5000000\n', 10), 0.5)
+        self.assertEqual(parse_progress_line('out_time_ms=20000000', 10), 1.0)
+        self.assertEqual(parse_progress_line('progress=end', 10), 1.0)
+        self.assertIsNone(parse_progress_line('progress=continue', 10))
+        self.assertIsNone(parse_progress_line('out_time_us=N/A', 10))
+        self.assertIsNone(parse_progress_line('frame=120', 10))
+
+    def test_renditions_never_upscale(self):
+        self.assertEqual([r.name for r in renditions_for(720)], ['360p', '720p'])
+        self.assertEqual([r.name for r in renditions_for(2160)], [r.name for r in RENDITIONS])
+        self.assertEqual([r.name for r in renditions_for(240)], ['360p'])
+
+    def test_progress_counts_resumed_renditions_as_done(self):
+        tracker = ProgressTracker(['360p', '720p'], done={'360p': {}})
+        tracker.callback('720p')(0.5)
+        self.assertEqual(tracker.percent, 75)
+
+    def test_master_playlist_orders_by_bandwidth(self):
+        playlist = master_playlist({
+            '720p': {'bandwidth': 2928000, 'resolution': '1280x720'},
+            '360p': {'bandwidth': 928000, 'resolution': '640x360'},
+        })
+        lines = playlist.splitlines()
+        self.assertEqual(lines[0], '#EXTM3U')
+        self.assertEqual(lines[4], '360p/index.m3u8')
+        self.assertEqual(lines[6], '720p/index.m3u8')
+
+    def test_run_ffmpeg_reports_progress_and_failures(self):
+        seen = []
+        script = "print('out_time_us=1000000'); print('out_time_us=2000000'); print('progress=end')"
+        run_ffmpeg([sys.executable, '-c', script], duration=4, on_progress=seen.append)
+        self.assertEqual(seen, [0.25, 0.5, 1.0])
+
+        with self.assertRaisesMessage(TranscodeError, 'bad input'):
+            run_ffmpeg([sys.executable, '-c', "import sys; sys.stderr.write('bad input'); sys.exit(1)"], duration=1)
+
+
+class CampusFeedLinkTests(TestCase):
+    """PropertyCampus rows must mirror their property's is_available and created_at."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = NewUser.objects.create_user(
+            email='landlord@example.com', username='landlord', phonenumber='+255716000002'
+        )
+        university = University.objects.create(name='Ardhi University', short_name='ARU')
+        cls.campuses = [Campus.objects.create(name=f'Campus {i}', university=university) for i in range(3)]
+        cls.property_type = PropertyType.objects.create(name='Hostel')
+
+    def create_property(self, title='Hostel room', is_available=False):
+        return Property.objects.create(
+            owner=self.owner, property_type=self.property_type, title=title,
+            features='Near campus', price=Decimal('120000'), is_available=is_available
+        )
+
+    def assertLinksInSync(self, estate):
+        estate.refresh_from_db()
+        links = list(PropertyCampus.objects.filter(property=estate).values_list('is_available', 'created_at'))
+        self.assertTrue(links)
+        for is_available, created_at in links:
+            self.assertEqual((is_available, created_at), (estate.is_available, estate.created_at))
+
+    def test_added_links_copy_listing_fields(self):
+        estate = self.create_property(is_available=True)
+        estate.campus.add(*self.campuses[:2])
+        self.assertLinksInSync(estate)
+        self.campuses[2].properties.add(estate)
+        self.assertLinksInSync(estate)
+
+    def test_toggling_availability_updates_links(self):
+        estate = self.create_property()
+        estate.campus.set(self.campuses)
+        estate.is_available = True
+        estate.save(update_fields=['is_available', 'updated_at'])
+        self.assertLinksInSync(estate)
+        estate.is_available = False
+        estate.save()
+        self.assertLinksInSync(estate)
+
+    def test_relinking_campuses(self):
+        estate = self.create_property(is_available=True)
+        estate.campus.set(self.campuses[:2])
+        estate.campus.set(self.campuses[1:])
+        self.assertEqual(
+            set(PropertyCampus.objects.filter(property=estate).values_list('campus_id', flat=True)),
+            {campus.id for campus in self.campuses[1:]}
+        )
+        self.assertLinksInSync(estate)
+
+    def test_migration_backfill_repairs_stale_links(self):
+        estate = self.create_property(is_available=True)
+        estate.campus.set(self.campuses[:2])
+        PropertyCampus.objects.update(is_available=False)  # bypasses the signals
+        import_module('estates.migrations.0006_property_campus_feed').copy_listing_fields(apps, None)
+        self.assertLinksInSync(estate)
+
+
+def fake_ffmpeg(command, duration, on_progress=None):
+    """Stands in for an HLS run: writes the playlist and one segment next to it."""
+    output_dir = os.path.dirname(command[-1])
+    for filename in ('index.m3u8', 'seg_0000.ts'):
+        with open(os.path.join(output_dir, filename), 'w') as fh:
+            fh.write(filename)
+
+
+def fake_thumbnail(source, output_path, duration):
+    with open(output_path, 'wb') as fh:
+        fh.write(b'jpeg')
+
+
+@mock.patch('estates.tasks.extract_thumbnail', side_effect=fake_thumbnail)
+@mock.patch('estates.tasks.probe', return_value=ProbeResult(duration=12.0, width=1280, height=720, has_audio=True))
+class VideoJobTests(TestCase):
+    """Claiming, resuming and retrying transcoding jobs; ffmpeg itself is mocked."""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = NewUser.objects.create_user(
+            email='videos@example.com', username='videos', phonenumber='+255716000003'
+        )
+        cls.estate = Property.objects.create(
+            owner=owner, property_type=PropertyType.objects.create(name='Apartment'), title='Studio',
+            features='Furnished', price=Decimal('300000'), is_available=True
+        )
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        storage_settings = override_settings(
+            MEDIA_ROOT=self.root,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+        )
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+    def create_video(self, **fields):
+        return PropertyVideo.objects.create(
+            property=self.estate, source=ContentFile(b'video', name='tour.mp4'), **fields
+        )
+
+    def test_claimed_row_cannot_be_claimed_again(self, probe, thumbnail):
+        video = self.create_video()
+        claimed = claim_video(video.pk)
+        self.assertEqual((claimed.status, claimed.attempts), (PropertyVideo.Status.PROCESSING, 1))
+        self.assertIsNone(claim_video(video.pk))
+        self.assertIsNone(claim_video())
+
+    def test_stale_heartbeat_is_reclaimed(self, probe, thumbnail):
+        video = self.create_video()
+        claim_video(video.pk)
+        PropertyVideo.objects.filter(pk=video.pk).update(heartbeat_at=timezone.now() - STALE_AFTER / 2)
+        self.assertIsNone(claim_video(video.pk))
+
+        PropertyVideo.objects.filter(pk=video.pk).update(heartbeat_at=timezone.now() - STALE_AFTER * 2)
+        reclaimed = claim_video(video.pk)
+        self.assertEqual((reclaimed.status, reclaimed.attempts), (PropertyVideo.Status.PROCESSING, 2))
+
+    @mock.patch('estates.tasks.run_ffmpeg', side_effect=fake_ffmpeg)
+    def test_resume_skips_recorded_renditions(self, run, probe, thumbnail):
+        done = {'playlist': 'hls/1/360p/index.m3u8', 'bandwidth': 928000, 'resolution': '640x360'}
+        video = self.create_video(renditions={'360p': done})
+        transcode(claim_video(video.pk))
+
+        run.assert_called_once()
+        self.assertEqual(os.path.basename(os.path.dirname(run.call_args.args[0][-1])), '720p')
+        video.refresh_from_db()
+        self.assertEqual(video.status, PropertyVideo.Status.READY)
+        self.assertEqual(video.progress, 100)
+        self.assertEqual(video.renditions['360p'], done)
+        self.assertEqual(video.renditions['720p']['playlist'], f'hls/{video.pk}/720p/index.m3u8')
+        self.assertEqual(video.hls_playlist, f'hls/{video.pk}/master.m3u8')
+        self.assertTrue(video.thumbnail)
+
+    @mock.patch('estates.tasks.run_ffmpeg', side_effect=TranscodeError('bad input'))
+    def test_failure_is_retried_until_max_attempts(self, run, probe, thumbnail):
+        video = self.create_video()
+        self.assertFalse(transcode_property_video(video.pk))
+        video.refresh_from_db()
+        self.assertEqual((video.status, video.attempts), (PropertyVideo.Status.PENDING, 1))
+        self.assertEqual(video.error_message, 'bad input')
+        self.assertIsNone(video.heartbeat_at)
+
+        PropertyVideo.objects.filter(pk=video.pk).update(attempts=MAX_ATTEMPTS - 1)
+        self.assertFalse(transcode_property_video(video.pk))
+        video.refresh_from_db()
+        self.assertEqual((video.status, video.attempts), (PropertyVideo.Status.FAILED, MAX_ATTEMPTS))
+        self.assertIsNone(claim_video(video.pk))
+
+    @mock.patch('estates.tasks.run_ffmpeg', side_effect=fake_ffmpeg)
+    def test_sweep_resumes_stalled_and_gives_up_on_exhausted(self, run, probe, thumbnail):
+        stale = timezone.now() - STALE_AFTER * 2
+        stalled = self.create_video()
+        PropertyVideo.objects.filter(pk=stalled.pk).update(
+            status=PropertyVideo.Status.PROCESSING, attempts=1, heartbeat_at=stale
+        )
+        exhausted = self.create_video()
+        PropertyVideo.objects.filter(pk=exhausted.pk).update(
+            status=PropertyVideo.Status.PROCESSING, attempts=MAX_ATTEMPTS, heartbeat_at=stale
+        )
+
+        self.assertEqual(process_pending_videos(limit=5), 1)
+        stalled.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual((stalled.status, stalled.attempts), (PropertyVideo.Status.READY, 2))
+        self.assertEqual(exhausted.status, PropertyVideo.Status.FAILED)
+        self.assertEqual(exhausted.error_message, 'Worker stopped responding')
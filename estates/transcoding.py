@@ -0,0 +1,170 @@
+"""
+ffmpeg helpers for property videos.
+
+Each HLS rendition is a separate ``ffmpeg`` process run with ``-progress
+pipe:1``. The progress stream is parsed into a per-rendition fraction. The
+renditions of one video run in parallel, with ffmpeg's thread count split so
+that together they use roughly every core. Nothing here touches the database;
+``estates.tasks`` drives it and records state.
+"""
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FFMPEG = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+FFPROBE = os.getenv('FFPROBE_BINARY', 'ffprobe')
+SEGMENT_SECONDS = 6
+
+
+@dataclass(frozen=True)
+class Rendition:
+    name: str
+    height: int
+    video_bitrate: int  # bits per second
+    audio_bitrate: int = 128_000
+
+    @property
+    def bandwidth(self):
+        return self.video_bitrate + self.audio_bitrate
+
+
+RENDITIONS = [
+    Rendition('360p', 360, 800_000),
+    Rendition('720p', 720, 2_800_000),
+    Rendition('1080p', 1080, 5_000_000),
+]
+
+
+class TranscodeError(Exception):
+    """ffmpeg/ffprobe failed; the message carries the tail of its stderr."""
+
+
+@dataclass
+class ProbeResult:
+    duration: float
+    width: int
+    height: int
+    has_audio: bool
+
+
+def probe(path: str) -> ProbeResult:
+    result = subprocess.run(
+        [FFPROBE, '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise TranscodeError(f"ffprobe failed: {result.stderr.strip()[-500:]}")
+    metadata = json.loads(result.stdout)
+    video = next((s for s in metadata.get('streams', []) if s.get('codec_type') == 'video'), None)
+    if video is None:
+        raise TranscodeError('File has no video stream')
+    duration = metadata.get('format', {}).get('duration') or video.get('duration')
+    if not duration:
+        raise TranscodeError('Could not determine video duration')
+    return ProbeResult(
+        duration=float(duration),
+        width=int(video.get('width') or 0),
+        height=int(video.get('height') or 0),
+        has_audio=any(s.get('codec_type') == 'audio' for s in metadata['streams']),
+    )
+
+
+def renditions_for(height: int) -> List[Rendition]:
+    """Renditions no taller than the source; always at least the smallest."""
+    return [r for r in RENDITIONS if r.height <= height] or RENDITIONS[:1]
+
+
+def threads_per_job(jobs: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(jobs, 1))
+
+
+def parse_progress_line(line: str, duration: float) -> Optional[float]:
+    """Fraction complete from one ``-progress`` line, or None if it carries no position."""
+    key, _, value = line.strip().partition('=')
+    if key == 'progress' and value == 'end':
+        return 1.0
+    # out_time_ms is (despite its name) in microseconds, like out_time_us.
+    if key in ('out_time_us', 'out_time_ms') and value.lstrip('-').isdigit() and duration > 0:
+        return max(0.0, min(1.0, int(value) / 1_000_000 / duration))
+    return None
+
+
+def hls_command(source: str, output_dir: str, rendition: Rendition, has_audio: bool, threads: int) -> List[str]:
+    command = [
+        FFMPEG, '-hide_banner', '-nostdin', '-y', '-i', source,
+        '-vf', f'scale=-2:{rendition.height}',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-profile:v', 'main', '-crf', '23',
+        '-maxrate', str(rendition.video_bitrate), '-bufsize', str(rendition.video_bitrate * 2),
+        '-g', '48', '-keyint_min', '48', '-sc_threshold', '0',
+        '-threads', str(threads),
+    ]
+    if has_audio:
+        command += ['-c:a', 'aac', '-b:a', str(rendition.audio_bitrate), '-ac', '2']
+    command += [
+        '-f', 'hls', '-hls_time', str(SEGMENT_SECONDS), '-hls_playlist_type', 'vod',
+        '-hls_flags', 'independent_segments',
+        '-hls_segment_filename', os.path.join(output_dir, 'seg_%04d.ts'),
+        '-progress', 'pipe:1', '-nostats',
+        os.path.join(output_dir, 'index.m3u8'),
+    ]
+    return command
+
+
+def run_ffmpeg(command: List[str], duration: float, on_progress: Callable[[float], None] = None) -> None:
+    """Run ffmpeg, reporting progress fractions; raises TranscodeError on failure."""
+    # stderr goes to a file so a chatty ffmpeg can never block on a full pipe.
+    with tempfile.TemporaryFile(mode='w+') as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        for line in process.stdout:
+            fraction = parse_progress_line(line, duration)
+            if fraction is not None and on_progress:
+                on_progress(fraction)
+        returncode = process.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            raise TranscodeError(f"ffmpeg exited with {returncode}: {stderr.read()[-500:].strip()}")
+
+
+def extract_thumbnail(source: str, output_path: str, duration: float) -> None:
+    at = min(2.0, duration / 10)
+    run_ffmpeg([
+        FFMPEG, '-hide_banner', '-nostdin', '-y', '-ss', f'{at:.2f}', '-i', source,
+        '-frames:v', '1', '-vf', 'scale=-2:720', '-q:v', '3', output_path,
+    ], duration=0)
+
+
+def master_playlist(entries: Dict[str, dict]) -> str:
+    """HLS master playlist over finished renditions (``{name: {'bandwidth', 'resolution'}}``)."""
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3', '#EXT-X-INDEPENDENT-SEGMENTS']
+    for name, entry in sorted(entries.items(), key=lambda item: item[1]['bandwidth']):
+        lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={entry['bandwidth']},RESOLUTION={entry['resolution']}")
+        lines.append(f'{name}/index.m3u8')
+    return '\n'.join(lines) + '\n'
+
+
+class ProgressTracker:
+    """Thread-safe overall progress across parallel renditions."""
+
+    def __init__(self, names, done=()):
+        self._lock = threading.Lock()
+        self._fractions = {name: (1.0 if name in done else 0.0) for name in names}
+
+    def callback(self, name):
+        def update(fraction):
+            with self._lock:
+                self._fractions[name] = fraction
+        return update
+
+    @property
+    def percent(self) -> int:
+        with self._lock:
+            if not self._fractions:
+                return 0
+            return int(100 * sum(self._fractions.values()) / len(self._fractions))
@@ -1,12 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PropertyViewSet, PropertyTypeViewSet, PropertyImageViewSet, create_estate_payment
+from .views import (
+    PropertyViewSet, PropertyTypeViewSet, PropertyImageViewSet, PropertyVideoViewSet, create_estate_payment
+)
 
 # Initialize the router
 router = DefaultRouter()
 router.register(r'properties', PropertyViewSet, basename='property')
 router.register(r'property-types', PropertyTypeViewSet, basename='propertytype')
 router.register(r'property-images', PropertyImageViewSet, basename='propertyimage')
+router.register(r'property-videos', PropertyVideoViewSet, basename='propertyvideo')
 
 # Define URL patterns
 urlpatterns = [
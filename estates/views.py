@@ -6,6 +6,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404, reverse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, permissions, status
@@ -15,16 +16,22 @@ from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django_q.tasks import async_task
 from django.contrib.gis.geos import Point
-from django.contrib.gis.db.models.functions import Distance
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
 from rest_framework import serializers
 
-from estates.models import Property, PropertyImage, PropertyType
-from estates.serializers import PropertyImageSerializer, PropertySerializer, PropertyTypeSerializer
-from estates.pagination import StandardPagePagination
+from estates.models import Property, PropertyCampus, PropertyImage, PropertyType, PropertyVideo
+from estates.serializers import (
+    PropertyImageSerializer, PropertySerializer, PropertyTypeSerializer, PropertyVideoSerializer
+)
+from estates.pagination import CampusFeedCursorPagination, StandardPagePagination
 from shops.models import UserOffer
 from payments.models import Payment
 from core.models import Campus
+from core.services.direct_uploads import (
+    DirectUploadError, DirectUploadUnavailable, confirm_uploads, create_upload_slots
+)
+from core.pagination import ProximityPagePagination
+from core.services.proximity import parse_origin, proximity_feed
 
 logger = logging.getLogger(__name__)
 
@@ -176,30 +183,85 @@ class PropertyViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def near_university(self, request):
         campus_id = request.query_params.get('campus_id')
-        radius = float(request.query_params.get('radius', 5000))
         if not campus_id:
             return Response({'error': 'campus_id is required'}, status=400)
         try:
             campus = Campus.objects.get(id=campus_id)
         except Campus.DoesNotExist:
             return Response({'error': 'Campus not found'}, status=404)
-        estates = Property.objects.filter(campus=campus, location__isnull=False).annotate(
-            distance=Distance('location', campus.location)
-        ).filter(distance__lte=radius).order_by('distance')
-        serializer = self.get_serializer(estates, many=True)
-        return Response(serializer.data)
+        # Page over the campus feed index, then load only that page's properties.
+        links = PropertyCampus.objects.filter(
+            campus=campus,
+            is_available=True
+        ).values('property_id', 'created_at')
+        paginator = CampusFeedCursorPagination()
+        page = paginator.paginate_queryset(links, request, view=self)
+        property_ids = [link['property_id'] for link in page]
+        estates = Property.objects.filter(
+            id__in=property_ids
+        ).select_related('owner', 'property_type').prefetch_related('property_images').in_bulk()
+        serializer = self.get_serializer(
+            [estates[property_id] for property_id in property_ids if property_id in estates],
+            many=True
+        )
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def near_user(self, request):
-        user = request.user
-        radius = float(request.query_params.get('radius', 5000))
-        if not hasattr(user, 'location') or not user.location:
-            return Response({'error': 'User location not set'}, status=400)
-        estates = Property.objects.filter(location__isnull=False).annotate(
-            distance=Distance('location', user.location)
-        ).filter(distance__lte=radius).order_by('distance')
-        serializer = self.get_serializer(estates, many=True)
-        return Response(serializer.data)
+        """
+        Available properties at campuses near ``lat``/``lng`` (or the user's
+        campus), nearest campus first. ``radius`` is in km.
+        """
+        try:
+            lat, lng, radius = parse_origin(request.query_params, getattr(request.user, 'profile', None))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        ranked = proximity_feed(PropertyCampus, 'property', 'is_available', lat, lng, radius)
+        paginator = ProximityPagePagination()
+        page = paginator.paginate_queryset(ranked, request, view=self)
+        estates = Property.objects.filter(
+            id__in=[property_id for property_id, _ in page]
+        ).select_related('owner', 'property_type').prefetch_related('property_images').in_bulk()
+        results = []
+        for property_id, distance in page:
+            if property_id in estates:
+                data = self.get_serializer(estates[property_id]).data
+                data['distance_km'] = distance
+                results.append(data)
+        return paginator.get_paginated_response(results)
+
+    @action(detail=True, methods=['post'], url_path='upload-slots')
+    def upload_slots(self, request, pk=None):
+        """
+        Presigned PUT URLs for uploading images straight to storage. Body:
+        ``{"files": [{"content_type": "image/jpeg", "size": 123456}, ...]}``.
+        """
+        estate = get_object_or_404(Property, pk=pk, owner=request.user)
+        try:
+            slots = create_upload_slots('property', request.user.id, estate.id, request.data.get('files'))
+        except DirectUploadUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except DirectUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'slots': [slot.as_dict() for slot in slots]})
+
+    @action(detail=True, methods=['post'], url_path='confirm-uploads')
+    def confirm_direct_uploads(self, request, pk=None):
+        """
+        Verify directly uploaded images (``{"tokens": [...]}``) and queue them to
+        be sanitized and attached; the images appear once the task has run.
+        """
+        estate = get_object_or_404(Property, pk=pk, owner=request.user)
+        try:
+            queued, rejected = confirm_uploads('property', request.user.id, estate, request.data.get('tokens'))
+        except DirectUploadUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except DirectUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'queued': queued,
+            'rejected': rejected,
+        }, status=status.HTTP_202_ACCEPTED if queued else status.HTTP_400_BAD_REQUEST)
 
 class PropertyImageViewSet(viewsets.ModelViewSet):
     queryset = PropertyImage.objects.all()
@@ -220,6 +282,38 @@ class PropertyImageViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return super().get_queryset().select_related('property')
 
+class PropertyVideoViewSet(viewsets.ModelViewSet):
+    """Walkthrough videos; uploads are transcoded to HLS in the background."""
+    queryset = PropertyVideo.objects.all()
+    serializer_class = PropertyVideoSerializer
+    pagination_class = StandardPagePagination
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    def get_permissions(self):
+        if self.action in ['list', 'retrieve']:
+            return [permissions.AllowAny()]
+        return [permissions.IsAuthenticated(), IsOwnerOrAdmin()]
+
+    def perform_create(self, serializer):
+        property_instance = serializer.validated_data.get('property')
+        if property_instance.owner != self.request.user and not self.request.user.is_staff:
+            raise PermissionDenied("You can only add videos to your own properties.")
+        serializer.save()
+
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related('property')
+        property_id = self.request.query_params.get('property')
+        if property_id:
+            queryset = queryset.filter(property_id=property_id)
+        user = self.request.user
+        if self.action in ['list', 'retrieve'] and not user.is_staff:
+            # Owners can follow their uploads' progress; everyone else sees finished videos.
+            visible = Q(status=PropertyVideo.Status.READY)
+            if user.is_authenticated:
+                visible |= Q(property__owner=user)
+            queryset = queryset.filter(visible)
+        return queryset
+
 class EstatePaymentRequestSerializer(serializers.Serializer):
     property_id = serializers.IntegerField()
 
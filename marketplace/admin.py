@@ -2,7 +2,14 @@ from django.contrib import admin
 from unfold.admin import ModelAdmin
 from mptt.admin import MPTTModelAdmin
 
-from .models import Category, Brand, Attribute, AttributeValue, Product, ProductImage, WhatsAppClick
+from .models import Category, Brand, Attribute, AttributeValue, Product, ProductCampus, ProductImage, WhatsAppClick
+
+class ProductCampusInline(admin.TabularInline):
+    model = ProductCampus
+    extra = 1
+    fields = ('campus',)
+    verbose_name = 'Campus'
+    verbose_name_plural = 'Campuses'
 
 @admin.register(Category)
 class CategoryAdmin(MPTTModelAdmin):
@@ -37,10 +44,11 @@ class ProductAdmin(ModelAdmin):
     default_lat = -6.8
     default_zoom = 6
     readonly_fields = ('created_at', 'updated_at')
+    inlines = [ProductCampusInline]
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('name', 'description', 'owner', 'brand', 'category', 'price', 'condition', 'campus')
+            'fields': ('name', 'description', 'owner', 'brand', 'category', 'price', 'condition')
         }),
         ('Location Information', {
             'fields': ()
@@ -0,0 +1,67 @@
+# Converts the auto-created Product.campus join table into the explicit
+# ProductCampus model in place, then adds the denormalized feed columns.
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_listing_fields(apps, schema_editor):
+    Product = apps.get_model('marketplace', 'Product')
+    ProductCampus = apps.get_model('marketplace', 'ProductCampus')
+    products = Product.objects.filter(pk=models.OuterRef('product_id'))
+    ProductCampus.objects.update(
+        is_active=models.Subquery(products.values('is_active')[:1]),
+        created_at=models.Subquery(products.values('created_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_delete_location'),
+        ('marketplace', '0004_remove_product_marketplace_locatio_56048d_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ProductCampus',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('campus', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_links', to='core.campus')),
+                        ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='campus_links', to='marketplace.product')),
+                    ],
+                    options={
+                        'db_table': 'marketplace_product_campus',
+                        'unique_together': {('product', 'campus')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='product',
+                    name='campus',
+                    field=models.ManyToManyField(blank=True, related_name='products', through='marketplace.ProductCampus', to='core.campus'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='productcampus',
+            name='is_active',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='productcampus',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copy_listing_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='productcampus',
+            index=models.Index(fields=['campus', 'is_active', '-created_at'], include=('product',), name='mkt_prodcampus_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_active', '-created_at'], name='mkt_product_active_recent_idx'),
+        ),
+    ]
@@ -68,6 +68,16 @@ class AttributeValue(models.Model):
     def __str__(self):
         return f"{self.attribute.name}: {self.value}"
 
+class ProductQuerySet(models.QuerySet):
+    def set_active(self, is_active):
+        """
+        Bulk-update ``is_active`` on the matched products and on their campus feed
+        rows (``ProductCampus``), which a plain ``update()`` would leave stale.
+        """
+        with transaction.atomic():
+            ProductCampus.objects.filter(product__in=self.values('pk')).update(is_active=is_active)
+            return self.update(is_active=is_active)
+
 class Product(models.Model):
     class Condition(models.TextChoices):
         NEW = 'new', 'New'
@@ -82,13 +92,15 @@ class Product(models.Model):
     # Remove location field
     # location = gis_models.PointField(geography=True, null=True, blank=True)
     # Change campus to ManyToManyField
-    campus = models.ManyToManyField(Campus, related_name='products', blank=True)
+    campus = models.ManyToManyField(Campus, related_name='products', blank=True, through='ProductCampus')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     condition = models.CharField(max_length=100, choices=Condition.choices, default=Condition.USED)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     attribute_values = models.ManyToManyField(AttributeValue, related_name='product_lines')
     is_active = models.BooleanField(default=False)
+
+    objects = ProductQuerySet.as_manager()
      
     class Meta:
         indexes = [
@@ -97,6 +109,7 @@ class Product(models.Model):
             models.Index(fields=['shop_id']),
             models.Index(fields=['owner_id']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['is_active', '-created_at'], name='mkt_product_active_recent_idx'),
             # Removed location-related indexes
             # models.Index(fields=['location']),
             # models.Index(fields=['is_active', 'location']),
@@ -159,10 +172,44 @@ class Product(models.Model):
     def __str__(self):
         return self.name
 
+class ProductCampus(models.Model):
+    """
+    Through table for ``Product.campus``. Carries copies of the product's
+    ``is_active`` and ``created_at`` so campus feeds are answered from one
+    covering index; kept in sync by ``marketplace.signals`` and
+    ``ProductQuerySet.set_active``.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='campus_links')
+    campus = models.ForeignKey(Campus, on_delete=models.CASCADE, related_name='product_links')
+    is_active = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'marketplace_product_campus'
+        unique_together = ('product', 'campus')
+        indexes = [
+            models.Index(
+                fields=['campus', 'is_active', '-created_at'],
+                include=['product'],
+                name='mkt_prodcampus_feed_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.is_active = self.product.is_active
+            self.created_at = self.product.created_at
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.product_id} @ campus {self.campus_id}"
+
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='product_images/')
     is_primary = models.BooleanField(default=False)
+    # Resized renditions, filled in by core.tasks.generate_image_derivatives
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     
     def __str__(self):
         return f"Image for {self.product}"
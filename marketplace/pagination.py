@@ -21,4 +21,4 @@ class InfiniteScrollCursorPagination(CursorPagination):
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'results': data
-        })
\ No newline at end of file
+        })
@@ -5,6 +5,15 @@ from .models import Category, Brand, Attribute, AttributeValue, Product, Product
 from shops.models import Shop, UserOffer
 from users.serializers import CustomUserDetailsSerializer
 from core.models import University, Campus
+from core.media import media_url
+from core.services.media_ingest import MediaIngestError, ingest_images
+from core.serializers import (
+    ImagePlaceholderField,
+    ImageVariantsField,
+    MediaImageField,
+    image_placeholder,
+    image_variant_urls,
+)
 from drf_spectacular.utils import extend_schema_field
 
 User = get_user_model()
@@ -98,9 +107,13 @@ class AttributeValueSerializer(serializers.ModelSerializer):
         pass
 
 class ProductImageSerializer(serializers.ModelSerializer):
+    image = MediaImageField()
+    variants = ImageVariantsField()
+    placeholder = ImagePlaceholderField()
+
     class Meta:
         model = ProductImage
-        fields = ['id', 'product', 'image', 'is_primary']
+        fields = ['id', 'product', 'image', 'is_primary', 'variants', 'placeholder']
         extra_kwargs = {
             'product': {'read_only': True}
         }
@@ -116,7 +129,7 @@ class ProductSerializer(serializers.ModelSerializer):
     attribute_values = AttributeValueSerializer(many=True, read_only=True)
     images = ProductImageSerializer(many=True, read_only=True)
     images_upload = serializers.ListField(
-        child=serializers.ImageField(),
+        child=MediaImageField(),
         write_only=True,
         required=False,
         help_text="Upload multiple images at once."
@@ -127,6 +140,8 @@ class ProductSerializer(serializers.ModelSerializer):
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.all(), source='category', write_only=True, required=True
     )
+    # Declared explicitly: DRF makes M2M fields with a custom through model read-only.
+    campus = serializers.PrimaryKeyRelatedField(queryset=Campus.objects.all(), many=True, required=False)
 
     class Meta:
         model = Product
@@ -221,8 +236,10 @@ class ProductSerializer(serializers.ModelSerializer):
         product = super().create(validated_data)
         if attribute_value_ids:
             product.attribute_values.set(attribute_value_ids)
-        for image in images:
-            ProductImage.objects.create(product=product, image=image, is_primary=False)
+        try:
+            ingest_images(ProductImage, 'product', product, images, has_primary=False)
+        except MediaIngestError as e:
+            raise serializers.ValidationError({'images_upload': f'Image upload failed: {e}'})
         return product
 
 class ProductImageUrlSerializer(serializers.ModelSerializer):
@@ -232,12 +249,11 @@ class ProductImageUrlSerializer(serializers.ModelSerializer):
     
     def to_representation(self, instance):
         request = self.context.get('request')
-        image_url = instance.image.url
-        if request:
-            image_url = request.build_absolute_uri(image_url)
         return {
-            'image': image_url,
-            'is_primary': instance.is_primary
+            'image': media_url(instance.image, request),
+            'is_primary': instance.is_primary,
+            'variants': image_variant_urls(instance, request),
+            'placeholder': image_placeholder(instance)
         }
 
 class ProductListSerializer(serializers.ModelSerializer):
@@ -261,8 +277,10 @@ class ProductListSerializer(serializers.ModelSerializer):
         primary_image = obj.images.filter(is_primary=True).first()
         if primary_image and request:
             return {
-                'image': request.build_absolute_uri(primary_image.image.url),
-                'is_primary': True
+                'image': media_url(primary_image.image, request),
+                'is_primary': True,
+                'variants': image_variant_urls(primary_image, request),
+                'placeholder': image_placeholder(primary_image)
             }
         return None
 
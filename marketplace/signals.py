@@ -0,0 +1,31 @@
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import post_save, m2m_changed
+from django.dispatch import receiver
+from .models import Product, ProductCampus
+
+@receiver(post_save, sender=Product)
+def sync_campus_links(sender, instance, created, raw=False, **kwargs):
+    """Mirror the product's is_active onto its campus feed rows."""
+    if raw or created:
+        return
+    ProductCampus.objects.filter(product=instance).exclude(
+        is_active=instance.is_active
+    ).update(is_active=instance.is_active)
+
+@receiver(m2m_changed, sender=ProductCampus)
+def copy_listing_fields_to_campus_links(sender, instance, action, reverse, pk_set, **kwargs):
+    """Fill is_active/created_at on rows added through product.campus.add()/set()."""
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        # campus.products.add(...): instance is the Campus, pk_set holds product ids.
+        products = Product.objects.filter(pk=OuterRef('product_id'))
+        ProductCampus.objects.filter(campus=instance, product_id__in=pk_set).update(
+            is_active=Subquery(products.values('is_active')[:1]),
+            created_at=Subquery(products.values('created_at')[:1])
+        )
+    else:
+        ProductCampus.objects.filter(product=instance, campus_id__in=pk_set).update(
+            is_active=instance.is_active,
+            created_at=instance.created_at
+        )
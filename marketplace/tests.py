@@ -1,3 +1,86 @@
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
 from django.test import TestCase
 
-# Create your tests here.
+from core.models import Campus, University
+from users.models import NewUser
+
+from .models import Brand, Category, Product, ProductCampus
+
+
+class CampusFeedLinkTests(TestCase):
+    """ProductCampus rows must mirror their product's is_active and created_at."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = NewUser.objects.create_user(
+            email='seller@example.com', username='seller', phonenumber='+255716000001'
+        )
+        university = University.objects.create(name='University of Dodoma', short_name='UDOM')
+        cls.campuses = [Campus.objects.create(name=f'Campus {i}', university=university) for i in range(3)]
+        cls.category = Category.objects.create(name='Electronics')
+        cls.brand = Brand.objects.create(name='Tecno', created_by=cls.owner, is_active=True)
+
+    def create_product(self, name='Phone', is_active=False):
+        return Product.objects.create(
+            name=name, description='Barely used', brand=self.brand, category=self.category,
+            owner=self.owner, price=Decimal('150000'), is_active=is_active
+        )
+
+    def assertLinksInSync(self, product):
+        product.refresh_from_db()
+        links = list(ProductCampus.objects.filter(product=product).values_list('is_active', 'created_at'))
+        self.assertTrue(links)
+        for is_active, created_at in links:
+            self.assertEqual((is_active, created_at), (product.is_active, product.created_at))
+
+    def test_added_links_copy_listing_fields(self):
+        product = self.create_product(is_active=True)
+        product.campus.add(*self.campuses[:2])
+        self.assertLinksInSync(product)
+
+    def test_reverse_add_copies_listing_fields(self):
+        product = self.create_product(is_active=True)
+        self.campuses[0].products.add(product)
+        self.assertLinksInSync(product)
+
+    def test_toggling_activity_updates_links(self):
+        product = self.create_product()
+        product.campus.set(self.campuses)
+        product.is_active = True
+        product.save()
+        self.assertLinksInSync(product)
+        product.is_active = False
+        product.save(update_fields=['is_active'])
+        self.assertLinksInSync(product)
+
+    def test_relinking_campuses(self):
+        product = self.create_product(is_active=True)
+        product.campus.set(self.campuses[:2])
+        product.campus.set(self.campuses[1:])
+        self.assertEqual(
+            set(ProductCampus.objects.filter(product=product).values_list('campus_id', flat=True)),
+            {campus.id for campus in self.campuses[1:]}
+        )
+        self.assertLinksInSync(product)
+
+    def test_set_active_updates_both_tables(self):
+        first, second = self.create_product('Phone'), self.create_product('Laptop')
+        untouched = self.create_product('Radio')
+        for product in (first, second, untouched):
+            product.campus.set(self.campuses[:2])
+
+        updated = Product.objects.filter(pk__in=[first.pk, second.pk]).set_active(True)
+        self.assertEqual(updated, 2)
+        for product in (first, second, untouched):
+            self.assertLinksInSync(product)
+        self.assertFalse(ProductCampus.objects.filter(product=untouched, is_active=True).exists())
+
+    def test_migration_backfill_repairs_stale_links(self):
+        product = self.create_product(is_active=True)
+        product.campus.set(self.campuses[:2])
+        ProductCampus.objects.update(is_active=False)  # bypasses the signals
+        import_module('marketplace.migrations.0005_product_campus_feed').copy_listing_fields(apps, None)
+        self.assertLinksInSync(product)
@@ -7,7 +7,7 @@ from django.db.models import Prefetch, Q, Count
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from .models import Category, Brand, Attribute, AttributeValue, Product, ProductImage
+from .models import Category, Brand, Attribute, AttributeValue, Product, ProductCampus, ProductImage
 from .serializers import (
     CategorySerializer, BrandSerializer, AttributeSerializer,
     AttributeValueSerializer, ProductDetailSerializer,
@@ -26,6 +26,11 @@ from django.core.exceptions import ValidationError
 from django.contrib.gis.geos import Point
 from django.contrib.gis.db.models.functions import Distance
 from core.models import Campus
+from core.services.direct_uploads import (
+    DirectUploadError, DirectUploadUnavailable, confirm_uploads, create_upload_slots
+)
+from core.pagination import ProximityPagePagination
+from core.services.proximity import parse_origin, proximity_feed
 from drf_spectacular.utils import extend_schema
 from rest_framework import serializers
 
@@ -355,32 +360,90 @@ class ProductViewSet(viewsets.ModelViewSet):
             campus = Campus.objects.get(id=campus_id)
         except Campus.DoesNotExist:
             return Response({'error': 'Campus not found'}, status=404)
-        products = Product.objects.filter(
+        # Page over the campus feed index, then load only that page's products.
+        links = ProductCampus.objects.filter(
             campus=campus,
             is_active=True
-        ).select_related('shop', 'owner', 'brand', 'category').prefetch_related('images')
+        ).values('product_id', 'created_at')
+        paginator = InfiniteScrollCursorPagination()
+        page = paginator.paginate_queryset(links, request, view=self)
+        product_ids = [link['product_id'] for link in page]
+        products = Product.objects.filter(
+            id__in=product_ids
+        ).select_related('shop', 'owner', 'brand', 'category').prefetch_related('images').in_bulk()
         campus_data = {
             'id': campus.id,
             'name': campus.name,
             'latitude': campus.location.y if campus.location else None,
             'longitude': campus.location.x if campus.location else None
         }
-        serializer = self.get_serializer(products, many=True)
+        serializer = self.get_serializer(
+            [products[product_id] for product_id in product_ids if product_id in products],
+            many=True
+        )
         return Response({
             'campus': campus_data,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
             'products': serializer.data
         })
 
     @action(detail=False, methods=['get'])
     def near_user(self, request):
-        user = request.user
-        radius = float(request.query_params.get('radius', 5000))
-        # Remove location-based filtering and distance logic for products
+        """
+        Active products at campuses near ``lat``/``lng`` (or the user's campus),
+        nearest campus first, newest first within a campus. ``radius`` is in km.
+        """
+        try:
+            lat, lng, radius = parse_origin(request.query_params, getattr(request.user, 'profile', None))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        ranked = proximity_feed(ProductCampus, 'product', 'is_active', lat, lng, radius)
+        paginator = ProximityPagePagination()
+        page = paginator.paginate_queryset(ranked, request, view=self)
         products = Product.objects.filter(
-            is_active=True
-        ).select_related('shop', 'owner', 'brand', 'category').prefetch_related('images')
-        serializer = self.get_serializer(products, many=True)
-        return Response(serializer.data)
+            id__in=[product_id for product_id, _ in page]
+        ).select_related('shop', 'owner', 'brand', 'category').prefetch_related('images').in_bulk()
+        results = []
+        for product_id, distance in page:
+            if product_id in products:
+                data = self.get_serializer(products[product_id]).data
+                data['distance_km'] = distance
+                results.append(data)
+        return paginator.get_paginated_response(results)
+
+    @action(detail=True, methods=['post'], url_path='upload-slots')
+    def upload_slots(self, request, pk=None):
+        """
+        Presigned PUT URLs for uploading images straight to storage. Body:
+        ``{"files": [{"content_type": "image/jpeg", "size": 123456}, ...]}``.
+        """
+        product = get_object_or_404(Product, pk=pk, owner=request.user)
+        try:
+            slots = create_upload_slots('product', request.user.id, product.id, request.data.get('files'))
+        except DirectUploadUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except DirectUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'slots': [slot.as_dict() for slot in slots]})
+
+    @action(detail=True, methods=['post'], url_path='confirm-uploads')
+    def confirm_direct_uploads(self, request, pk=None):
+        """
+        Verify directly uploaded images (``{"tokens": [...]}``) and queue them to
+        be sanitized and attached; the images appear once the task has run.
+        """
+        product = get_object_or_404(Product, pk=pk, owner=request.user)
+        try:
+            queued, rejected = confirm_uploads('product', request.user.id, product, request.data.get('tokens'))
+        except DirectUploadUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except DirectUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'queued': queued,
+            'rejected': rejected,
+        }, status=status.HTTP_202_ACCEPTED if queued else status.HTTP_400_BAD_REQUEST)
 
 class ProductImageViewSet(viewsets.ModelViewSet):
     serializer_class = ProductImageSerializer
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.contenttypes.admin import GenericTabularInline
 from django.contrib import messages
-from .models import PaymentService, Payment, Wallet, WalletTransaction
+from .models import PaymentService, Payment, Wallet, WalletTransaction, WalletMonthlySnapshot, PaymentDailyRollup
 from django.utils.html import format_html
 
 @admin.register(PaymentService)
@@ -16,8 +16,8 @@ class PaymentServiceAdmin(admin.ModelAdmin):
 class WalletTransactionInline(admin.TabularInline):
     model = WalletTransaction
     extra = 0
-    readonly_fields = ('transaction_type', 'amount', 'description', 'created_at')
-    fields = ('transaction_type', 'amount', 'description', 'created_at')
+    readonly_fields = ('transaction_type', 'amount', 'balance_after', 'description', 'created_at')
+    fields = ('transaction_type', 'amount', 'balance_after', 'description', 'created_at')
     can_delete = False
 
     def has_add_permission(self, request, obj=None):
@@ -129,7 +129,7 @@ class PaymentAdmin(admin.ModelAdmin):
 class WalletTransactionAdmin(admin.ModelAdmin):
     list_display = (
         'id', 'wallet_user', 'transaction_type_display', 
-        'amount', 'payment_link', 'created_at'
+        'amount', 'balance_after', 'payment_link', 'created_at'
     )
     list_filter = ('transaction_type', 'created_at')
     search_fields = (
@@ -137,13 +137,13 @@ class WalletTransactionAdmin(admin.ModelAdmin):
         'payment__transaction_id', 'description'
     )
     readonly_fields = (
-        'wallet', 'amount', 'transaction_type', 'payment_link', 
+        'wallet', 'amount', 'balance_after', 'transaction_type', 'payment_link', 
         'transaction_id', 'external_id', 'provider', 'account_number',
         'description', 'created_at'
     )
     fieldsets = (
         (None, {
-            'fields': ('wallet', 'amount', 'transaction_type', 'payment_link')
+            'fields': ('wallet', 'amount', 'balance_after', 'transaction_type', 'payment_link')
         }),
         ('Transaction Details', {
             'fields': (
@@ -172,4 +172,34 @@ class WalletTransactionAdmin(admin.ModelAdmin):
                 str(obj.payment)
             )
         return "-"
-    payment_link.short_description = "Payment"
\ No newline at end of file
+    payment_link.short_description = "Payment"
+
+
+@admin.register(WalletMonthlySnapshot)
+class WalletMonthlySnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        'wallet', 'month', 'opening_balance', 'total_credits',
+        'total_debits', 'closing_balance', 'transaction_count'
+    )
+    list_filter = ('month',)
+    search_fields = ('wallet__user__username', 'wallet__user__email')
+    readonly_fields = (
+        'wallet', 'month', 'opening_balance', 'total_credits', 'total_debits',
+        'closing_balance', 'transaction_count', 'created_at', 'updated_at'
+    )
+    ordering = ('-month',)
+
+    def has_add_permission(self, request):
+        return False  # Snapshots are built by payments.tasks.build_wallet_monthly_snapshots
+
+
+@admin.register(PaymentDailyRollup)
+class PaymentDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('date', 'payment_type', 'status', 'count', 'total', 'updated_at')
+    list_filter = ('status', 'payment_type')
+    date_hierarchy = 'date'
+    readonly_fields = ('date', 'payment_type', 'status', 'count', 'total', 'updated_at')
+    ordering = ('-date',)
+
+    def has_add_permission(self, request):
+        return False  # Maintained by payments.signals; rebuilt with rebuild_payment_rollups
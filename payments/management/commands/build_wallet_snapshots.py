@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from payments.tasks import build_wallet_monthly_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Build (or rebuild) monthly closing-balance snapshots for all wallets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='Month to snapshot (YYYY-MM). Defaults to the previous month.')
+        parser.add_argument('--until', help='Build every month from --month up to and including this one (YYYY-MM).')
+
+    def handle(self, *args, **options):
+        try:
+            month = datetime.strptime(options['month'], '%Y-%m').date() if options['month'] else None
+            until = datetime.strptime(options['until'], '%Y-%m').date() if options['until'] else month
+        except ValueError:
+            raise CommandError('Months must be in YYYY-MM format.')
+
+        if month is None:
+            written = build_wallet_monthly_snapshots()
+            self.stdout.write(self.style.SUCCESS(f'Wrote {written} snapshots for the previous month.'))
+            return
+
+        # Months are built in order so each one can reuse the previous closing balance.
+        while month <= until:
+            written = build_wallet_monthly_snapshots(month)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {written} snapshots for {month:%Y-%m}.'))
+            month = month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from payments.tasks import rebuild_payment_daily_rollups
+
+
+class Command(BaseCommand):
+    help = 'Backfill (or rebuild) the per-day payment rollups used by the admin dashboard.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only rebuild from this date onwards (YYYY-MM-DD). Defaults to all history.')
+
+    def handle(self, *args, **options):
+        try:
+            since = datetime.strptime(options['since'], '%Y-%m-%d').date() if options['since'] else None
+        except ValueError:
+            raise CommandError('--since must be in YYYY-MM-DD format.')
+
+        written = rebuild_payment_daily_rollups(since)
+        scope = f'since {since}' if since else 'for all history'
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} payment rollup rows {scope}.'))
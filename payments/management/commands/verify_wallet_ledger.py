@@ -0,0 +1,78 @@
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.management.base import BaseCommand, CommandError
+from payments.models import Wallet, WalletTransaction
+
+
+class Command(BaseCommand):
+    help = (
+        'Verify every Wallet.balance against its WalletTransaction ledger in a single streaming pass. '
+        'Optionally backfill missing or incorrect balance_after values.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per database round-trip.')
+        parser.add_argument('--backfill', action='store_true', help='Write the computed running balance into balance_after.')
+        parser.add_argument('--strict', action='store_true', help='Exit with an error if any mismatch is found.')
+        parser.add_argument('--show', type=int, default=20, help='Number of mismatched wallets to print.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        backfill = options['backfill']
+
+        # Both streams are ordered by wallet id, so they can be merged without holding
+        # more than one wallet's transactions in memory.
+        wallets = Wallet.objects.order_by('id').values_list('id', 'balance').iterator(chunk_size=chunk_size)
+        transactions = WalletTransaction.objects.order_by('wallet_id', 'created_at', 'id').values_list(
+            'id', 'wallet_id', 'amount', 'balance_after'
+        ).iterator(chunk_size=chunk_size)
+        ledger = groupby(transactions, key=itemgetter(1))
+
+        checked = 0
+        mismatched = []
+        stale_rows = 0
+        pending_updates = []
+        current = next(ledger, None)
+
+        for wallet_id, balance in wallets:
+            while current is not None and current[0] < wallet_id:
+                self.stdout.write(self.style.WARNING(f'Transactions found for missing wallet {current[0]}'))
+                current = next(ledger, None)
+
+            running = Decimal('0.00')
+            if current is not None and current[0] == wallet_id:
+                for tx_id, _, amount, balance_after in current[1]:
+                    running += amount
+                    if balance_after != running:
+                        stale_rows += 1
+                        if backfill:
+                            pending_updates.append(WalletTransaction(id=tx_id, balance_after=running))
+                current = next(ledger, None)
+
+            if len(pending_updates) >= chunk_size:
+                WalletTransaction.objects.bulk_update(pending_updates, ['balance_after'])
+                pending_updates = []
+
+            checked += 1
+            if running != balance:
+                mismatched.append((wallet_id, balance, running))
+
+        if pending_updates:
+            WalletTransaction.objects.bulk_update(pending_updates, ['balance_after'])
+
+        for wallet_id, balance, running in mismatched[:options['show']]:
+            self.stdout.write(self.style.ERROR(
+                f'Wallet {wallet_id}: balance {balance} TZS, ledger {running} TZS (diff {balance - running})'
+            ))
+
+        action = 'backfilled' if backfill else 'needing backfill'
+        self.stdout.write(f'Transactions with missing/incorrect balance_after {action}: {stale_rows}')
+        if mismatched:
+            message = f'{len(mismatched)} of {checked} wallets do not match their ledger.'
+            if options['strict']:
+                raise CommandError(message)
+            self.stdout.write(self.style.ERROR(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'All {checked} wallets match their ledger.'))
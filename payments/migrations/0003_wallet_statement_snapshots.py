@@ -0,0 +1,54 @@
+# Generated by Django 5.1 on 2026-10-19 02:51
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletMonthlySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month this snapshot covers.')),
+                ('opening_balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('total_credits', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('total_debits', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('closing_balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('transaction_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AddField(
+            model_name='wallettransaction',
+            name='balance_after',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Wallet balance immediately after this transaction was applied.', max_digits=15, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', '-created_at', '-id'], name='payments_wa_wallet__f99691_idx'),
+        ),
+        migrations.AddField(
+            model_name='walletmonthlysnapshot',
+            name='wallet',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_snapshots', to='payments.wallet'),
+        ),
+        migrations.AddIndex(
+            model_name='walletmonthlysnapshot',
+            index=models.Index(fields=['month'], name='payments_wa_month_48f220_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='walletmonthlysnapshot',
+            constraint=models.UniqueConstraint(fields=('wallet', 'month'), name='unique_wallet_month_snapshot'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1 on 2026-10-19 02:54
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_wallet_statement_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payment_type', models.CharField(blank=True, choices=[('product', 'Product Activation'), ('estate', 'Estate Activation'), ('subscription', 'Shop Subscription'), ('brand', 'Brand Creation'), ('deposit', 'Wallet Deposit')], default='', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['status', 'date'], name='payments_pa_status_f5571d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'payment_type', 'status'), name='unique_payment_daily_rollup')],
+            },
+        ),
+    ]
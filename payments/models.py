@@ -4,8 +4,10 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.core.exceptions import ValidationError
 from django.db.models import F
-from django.db import transaction
+from django.db import transaction, IntegrityError
+from django.utils import timezone
 import logging
+from datetime import datetime, time
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
@@ -85,6 +87,26 @@ class Payment(models.Model):
             models.Index(fields=['transaction_id']),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored rollup bucket so a later save can move the payment
+        # between PaymentDailyRollup rows (see payments.signals).
+        if all(field in field_names for field in ('date_added', 'payment_type', 'status', 'amount')):
+            instance._rollup_state = instance.rollup_state()
+        return instance
+
+    def rollup_state(self):
+        """Return the (date, payment_type, status, amount) this payment contributes to the daily rollup."""
+        if self.date_added is None:
+            return None
+        return (
+            timezone.localdate(self.date_added),
+            self.payment_type or '',
+            self.status,
+            Decimal(str(self.amount)),
+        )
+
     def clean(self):
         if self.payment_type == self.PaymentType.PRODUCT and \
            (not self.content_type or self.content_type.model != 'product'):
@@ -200,6 +222,7 @@ class Wallet(models.Model):
             WalletTransaction.objects.create(
                 wallet=self,
                 amount=-amount,
+                balance_after=self.balance,
                 transaction_type=WalletTransaction.TransactionType.DEBIT,
                 payment=payment,
                 description=description or f"Payment for {payment.payment_type if payment else 'unknown'}"
@@ -217,6 +240,7 @@ class Wallet(models.Model):
             WalletTransaction.objects.create(
                 wallet=self,
                 amount=amount,
+                balance_after=self.balance,
                 transaction_type=WalletTransaction.TransactionType.CREDIT,
                 transaction_id=transaction_id,
                 external_id=external_id,
@@ -236,6 +260,13 @@ class WalletTransaction(models.Model):
         related_name='transactions'
     )
     amount = models.DecimalField(max_digits=15, decimal_places=2)
+    balance_after = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Wallet balance immediately after this transaction was applied."
+    )
     transaction_type = models.CharField(
         max_length=20,
         choices=TransactionType.choices
@@ -257,9 +288,96 @@ class WalletTransaction(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['wallet', 'created_at']),
+            models.Index(fields=['wallet', '-created_at', '-id']),
             models.Index(fields=['transaction_type']),
             models.Index(fields=['transaction_id']),
         ]
 
     def __str__(self):
-        return f"{self.transaction_type} - {self.amount} TZS - {self.created_at}"
\ No newline at end of file
+        return f"{self.transaction_type} - {self.amount} TZS - {self.created_at}"
+
+class WalletMonthlySnapshot(models.Model):
+    """Closing balance of a wallet for one calendar month."""
+    wallet = models.ForeignKey(
+        Wallet,
+        on_delete=models.CASCADE,
+        related_name='monthly_snapshots'
+    )
+    month = models.DateField(help_text="First day of the month this snapshot covers.")
+    opening_balance = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    total_credits = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    total_debits = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    closing_balance = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    transaction_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(fields=['wallet', 'month'], name='unique_wallet_month_snapshot'),
+        ]
+        indexes = [
+            models.Index(fields=['month']),
+        ]
+
+    def __str__(self):
+        return f"{self.wallet.user.username} - {self.month:%Y-%m} - closing {self.closing_balance} TZS"
+
+    @staticmethod
+    def month_bounds(month):
+        """Return the aware [start, end) datetimes of the calendar month containing ``month``."""
+        month_start = month.replace(day=1)
+        if month_start.month == 12:
+            next_month = month_start.replace(year=month_start.year + 1, month=1)
+        else:
+            next_month = month_start.replace(month=month_start.month + 1)
+        start = timezone.make_aware(datetime.combine(month_start, time.min))
+        end = timezone.make_aware(datetime.combine(next_month, time.min))
+        return start, end
+
+class PaymentDailyRollup(models.Model):
+    """
+    Per-day payment count and total for one (payment_type, status) pair.
+
+    Kept up to date by the Payment post_save/post_delete handlers in
+    ``payments.signals``; ``rebuild_payment_rollups`` recomputes it from the
+    payments table. Bulk ``QuerySet.update()`` calls bypass the handlers, so
+    re-run the command after such maintenance.
+    """
+    date = models.DateField()
+    payment_type = models.CharField(max_length=20, choices=Payment.PaymentType.choices, blank=True, default='')
+    status = models.CharField(max_length=20, choices=Payment.PaymentStatus.choices)
+    count = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal('0.00'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'payment_type', 'status'], name='unique_payment_daily_rollup'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.payment_type or '-'} {self.status}: {self.count} / {self.total} TZS"
+
+    @classmethod
+    def apply(cls, date, payment_type, status, count, total):
+        """Atomically add ``count``/``total`` to a bucket, creating it if needed."""
+        lookup = {'date': date, 'payment_type': payment_type or '', 'status': status}
+        changes = {
+            'count': F('count') + count,
+            'total': F('total') + total,
+            'updated_at': timezone.now(),
+        }
+        if cls.objects.filter(**lookup).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(**lookup, count=count, total=total)
+        except IntegrityError:
+            # Another transaction created the bucket first.
+            cls.objects.filter(**lookup).update(**changes)
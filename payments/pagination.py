@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+class WalletStatementCursorPagination(CursorPagination):
+    """Keyset pagination over a wallet's ledger, newest first."""
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
@@ -1,7 +1,7 @@
 import re
 from rest_framework import serializers
 from django.contrib.contenttypes.models import ContentType
-from .models import PaymentService, Payment, Wallet
+from .models import PaymentService, Payment, Wallet, WalletTransaction, WalletMonthlySnapshot
 
 class PaymentServiceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -61,6 +61,24 @@ class WalletSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'balance', 'created_at', 'updated_at']
         read_only_fields = ['user', 'created_at', 'updated_at']
 
+class WalletTransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WalletTransaction
+        fields = [
+            'id', 'transaction_type', 'amount', 'balance_after', 'payment',
+            'transaction_id', 'provider', 'description', 'created_at'
+        ]
+        read_only_fields = fields
+
+class WalletMonthlySnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WalletMonthlySnapshot
+        fields = [
+            'month', 'opening_balance', 'total_credits', 'total_debits',
+            'closing_balance', 'transaction_count'
+        ]
+        read_only_fields = fields
+
 class WalletDepositSerializer(serializers.Serializer):
     amount = serializers.DecimalField(max_digits=15, decimal_places=2, min_value=100.00)
     mobile_number = serializers.CharField(max_length=13)  # Increased to handle +2557XXXXXXXX
@@ -1,9 +1,32 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Wallet
+from .models import Wallet, Payment, PaymentDailyRollup
 
 @receiver(post_save, sender=get_user_model())
 def create_wallet(sender, instance, created, **kwargs):
     if created:
-        Wallet.objects.create(user=instance)
\ No newline at end of file
+        Wallet.objects.create(user=instance)
+
+@receiver(post_save, sender=Payment)
+def update_payment_rollup(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_state', None)
+    current = instance.rollup_state()
+    if previous == current:
+        return
+    if previous is not None:
+        date, payment_type, status, amount = previous
+        PaymentDailyRollup.apply(date, payment_type, status, -1, -amount)
+    if current is not None:
+        date, payment_type, status, amount = current
+        PaymentDailyRollup.apply(date, payment_type, status, 1, amount)
+    instance._rollup_state = current
+
+@receiver(post_delete, sender=Payment)
+def remove_payment_from_rollup(sender, instance, **kwargs):
+    previous = getattr(instance, '_rollup_state', None) or instance.rollup_state()
+    if previous is not None:
+        date, payment_type, status, amount = previous
+        PaymentDailyRollup.apply(date, payment_type, status, -1, -amount)
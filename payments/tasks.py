@@ -0,0 +1,142 @@
+# payments/tasks.py
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import Payment, PaymentDailyRollup, Wallet, WalletMonthlySnapshot, WalletTransaction
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_BATCH_SIZE = 1000
+
+
+def build_wallet_monthly_snapshots(month=None):
+    """
+    Compute closing-balance snapshots for every wallet for the given month.
+
+    Defaults to the previous calendar month. Opening balances are taken from the
+    prior month's snapshot, so only the month's own transactions are aggregated;
+    the full ledger is only summed for wallets that have no earlier snapshot.
+    Safe to re-run: existing snapshots for the month are overwritten.
+    """
+    if month is None:
+        month = (timezone.localdate().replace(day=1) - timedelta(days=1)).replace(day=1)
+    month = month.replace(day=1)
+    previous_month = (month - timedelta(days=1)).replace(day=1)
+    start, end = WalletMonthlySnapshot.month_bounds(month)
+
+    wallet_ids = Wallet.objects.filter(created_at__lt=end).order_by('id').values_list('id', flat=True)
+    batch = []
+    written = 0
+    for wallet_id in wallet_ids.iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+        batch.append(wallet_id)
+        if len(batch) >= SNAPSHOT_BATCH_SIZE:
+            written += _write_snapshot_batch(batch, month, previous_month, start, end)
+            batch = []
+    if batch:
+        written += _write_snapshot_batch(batch, month, previous_month, start, end)
+
+    logger.info(f"Wrote {written} wallet snapshots for {month:%Y-%m}")
+    return written
+
+
+def _write_snapshot_batch(wallet_ids, month, previous_month, start, end):
+    opening = dict(
+        WalletMonthlySnapshot.objects.filter(
+            wallet_id__in=wallet_ids,
+            month=previous_month
+        ).values_list('wallet_id', 'closing_balance')
+    )
+    missing = [wallet_id for wallet_id in wallet_ids if wallet_id not in opening]
+    if missing:
+        opening.update(
+            WalletTransaction.objects.filter(
+                wallet_id__in=missing,
+                created_at__lt=start
+            ).values('wallet_id').annotate(total=Sum('amount')).values_list('wallet_id', 'total')
+        )
+
+    activity = {
+        row['wallet_id']: row
+        for row in WalletTransaction.objects.filter(
+            wallet_id__in=wallet_ids,
+            created_at__gte=start,
+            created_at__lt=end
+        ).values('wallet_id').annotate(
+            credits=Sum('amount', filter=Q(amount__gt=0)),
+            debits=Sum('amount', filter=Q(amount__lt=0)),
+            count=Count('id')
+        )
+    }
+
+    snapshots = []
+    for wallet_id in wallet_ids:
+        opening_balance = opening.get(wallet_id) or Decimal('0.00')
+        row = activity.get(wallet_id, {})
+        credits = row.get('credits') or Decimal('0.00')
+        debits = -(row.get('debits') or Decimal('0.00'))
+        snapshots.append(WalletMonthlySnapshot(
+            wallet_id=wallet_id,
+            month=month,
+            opening_balance=opening_balance,
+            total_credits=credits,
+            total_debits=debits,
+            closing_balance=opening_balance + credits - debits,
+            transaction_count=row.get('count', 0)
+        ))
+
+    with transaction.atomic():
+        WalletMonthlySnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['wallet', 'month'],
+            update_fields=[
+                'opening_balance', 'total_credits', 'total_debits',
+                'closing_balance', 'transaction_count', 'updated_at'
+            ]
+        )
+    return len(snapshots)
+
+
+def rebuild_payment_daily_rollups(since=None):
+    """
+    Recompute ``PaymentDailyRollup`` rows from the payments table.
+
+    With ``since`` (a date) only that day onwards is rebuilt; otherwise the whole
+    history is. Existing rows in the range are replaced in one transaction.
+    """
+    payments = Payment.objects.all()
+    rollups = PaymentDailyRollup.objects.all()
+    if since is not None:
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        payments = payments.filter(date_added__gte=start)
+        rollups = rollups.filter(date__gte=since)
+
+    rows = payments.annotate(
+        day=TruncDate('date_added'),
+        type=Coalesce('payment_type', Value(''))
+    ).values('day', 'type', 'status').annotate(
+        payment_count=Count('id'),
+        payment_total=Sum('amount')
+    ).order_by()
+
+    with transaction.atomic():
+        rollups.delete()
+        created = PaymentDailyRollup.objects.bulk_create([
+            PaymentDailyRollup(
+                date=row['day'],
+                payment_type=row['type'],
+                status=row['status'],
+                count=row['payment_count'],
+                total=row['payment_total'] or Decimal('0.00')
+            )
+            for row in rows
+        ], batch_size=SNAPSHOT_BATCH_SIZE)
+
+    logger.info(f"Rebuilt {len(created)} payment daily rollups" + (f" since {since}" if since else ""))
+    return len(created)
@@ -1,3 +1,192 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from users.models import NewUser
+
+from .models import Payment, PaymentDailyRollup, Wallet, WalletMonthlySnapshot, WalletTransaction
+from .tasks import build_wallet_monthly_snapshots, rebuild_payment_daily_rollups
+
+
+def rollup_buckets():
+    """Non-empty rollup buckets as ``{(date, type, status): (count, total)}``."""
+    return {
+        (row.date, row.payment_type, row.status): (row.count, row.total)
+        for row in PaymentDailyRollup.objects.all()
+        if row.count or row.total
+    }
+
+
+class PaymentRollupTests(TestCase):
+    """The signal-maintained rollups must match a rebuild from the payments table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = NewUser.objects.create_user(
+            email='payer@example.com', username='payer', phonenumber='+255715000001'
+        )
+
+    def create(self, amount='1000.00', status=Payment.PaymentStatus.PENDING):
+        return Payment.objects.create(
+            user=self.user, amount=Decimal(amount), status=status, payment_type=Payment.PaymentType.DEPOSIT
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = rollup_buckets()
+        rebuild_payment_daily_rollups()
+        self.assertEqual(incremental, rollup_buckets())
+        return incremental
+
+    def bucket(self, status):
+        return (timezone.localdate(), Payment.PaymentType.DEPOSIT, status)
+
+    def test_create_completed(self):
+        self.create(status=Payment.PaymentStatus.COMPLETED)
+        self.create('250.00', status=Payment.PaymentStatus.COMPLETED)
+        buckets = self.assertMatchesRebuild()
+        self.assertEqual(buckets[self.bucket(Payment.PaymentStatus.COMPLETED)], (2, Decimal('1250.00')))
+
+    def test_pending_to_completed(self):
+        payment = self.create()
+        payment.status = Payment.PaymentStatus.COMPLETED
+        payment.save()
+        buckets = self.assertMatchesRebuild()
+        self.assertNotIn(self.bucket(Payment.PaymentStatus.PENDING), buckets)
+        self.assertEqual(buckets[self.bucket(Payment.PaymentStatus.COMPLETED)], (1, Decimal('1000.00')))
+
+    def test_completed_to_failed_on_a_reloaded_row(self):
+        # The model has no refunded status; a reversal is recorded as FAILED.
+        payment = self.create(status=Payment.PaymentStatus.COMPLETED)
+        reloaded = Payment.objects.get(pk=payment.pk)
+        reloaded.status = Payment.PaymentStatus.FAILED
+        reloaded.save()
+        buckets = self.assertMatchesRebuild()
+        self.assertEqual(set(buckets), {self.bucket(Payment.PaymentStatus.FAILED)})
+
+    def test_amount_change(self):
+        payment = self.create(status=Payment.PaymentStatus.COMPLETED)
+        payment.amount = Decimal('1500.00')
+        payment.save()
+        buckets = self.assertMatchesRebuild()
+        self.assertEqual(buckets[self.bucket(Payment.PaymentStatus.COMPLETED)], (1, Decimal('1500.00')))
+
+    def test_date_change_moves_bucket(self):
+        payment = self.create(status=Payment.PaymentStatus.COMPLETED)
+        payment.date_added = timezone.now() - timedelta(days=3)
+        payment.save()
+        buckets = self.assertMatchesRebuild()
+        self.assertEqual(
+            set(buckets),
+            {(timezone.localdate(payment.date_added), Payment.PaymentType.DEPOSIT, Payment.PaymentStatus.COMPLETED)}
+        )
+
+    def test_delete(self):
+        kept = self.create(status=Payment.PaymentStatus.COMPLETED)
+        self.create('300.00', status=Payment.PaymentStatus.COMPLETED).delete()
+        Payment.objects.get(pk=self.create(status=Payment.PaymentStatus.PENDING).pk).delete()
+        buckets = self.assertMatchesRebuild()
+        self.assertEqual(buckets, {self.bucket(Payment.PaymentStatus.COMPLETED): (1, kept.amount)})
+
+    def test_unchanged_save_is_a_no_op(self):
+        payment = self.create(status=Payment.PaymentStatus.COMPLETED)
+        payment.save()
+        Payment.objects.get(pk=payment.pk).save()
+        self.assertEqual(self.assertMatchesRebuild()[self.bucket(Payment.PaymentStatus.COMPLETED)][0], 1)
+
+
+class MonthBoundsTests(SimpleTestCase):
+
+    def test_month_bounds(self):
+        start, end = WalletMonthlySnapshot.month_bounds(date(2024, 2, 17))
+        self.assertEqual(timezone.localtime(start), timezone.make_aware(datetime(2024, 2, 1)))
+        self.assertEqual(timezone.localtime(end), timezone.make_aware(datetime(2024, 3, 1)))
+        start, end = WalletMonthlySnapshot.month_bounds(date(2024, 12, 31))
+        self.assertEqual((start.date(), end.date()), (date(2024, 12, 1), date(2025, 1, 1)))
+        self.assertTrue(timezone.is_aware(start) and timezone.is_aware(end))
+
+
+class WalletLedgerTests(TestCase):
+    """balance_after sequencing, monthly snapshots and the ledger verifier."""
+
+    def setUp(self):
+        self.user = NewUser.objects.create_user(
+            email='ledger@example.com', username='ledger', phonenumber='+255715000002'
+        )
+        self.wallet = self.user.wallet
+
+    def ledger(self):
+        return list(self.wallet.transactions.order_by('created_at', 'id').values_list('amount', 'balance_after'))
+
+    def backdate(self, month, day=10):
+        """Move every transaction of the wallet into ``month``."""
+        when = timezone.make_aware(datetime.combine(month.replace(day=day), time(12)))
+        self.wallet.transactions.update(created_at=when)
+
+    def test_balance_after_follows_each_transaction(self):
+        self.wallet.add_funds(Decimal('1000'))
+        self.wallet.deduct_balance(Decimal('300'), description='Listing')
+        self.wallet.add_funds(Decimal('50'))
+        self.assertEqual(self.ledger(), [
+            (Decimal('1000.00'), Decimal('1000.00')),
+            (Decimal('-300.00'), Decimal('700.00')),
+            (Decimal('50.00'), Decimal('750.00')),
+        ])
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('750.00'))
+
+    def test_snapshot_rebuild_is_idempotent_and_chains_months(self):
+        self.wallet.add_funds(Decimal('1000'))
+        self.wallet.deduct_balance(Decimal('400'))
+        self.backdate(date(2024, 1, 1))
+        Wallet.objects.filter(pk=self.wallet.pk).update(created_at=timezone.make_aware(datetime(2023, 12, 1)))
+
+        self.assertEqual(build_wallet_monthly_snapshots(date(2024, 1, 20)), 1)
+        self.assertEqual(build_wallet_monthly_snapshots(date(2024, 1, 1)), 1)
+        january = WalletMonthlySnapshot.objects.get(wallet=self.wallet)
+        self.assertEqual(january.month, date(2024, 1, 1))
+        self.assertEqual(
+            (january.opening_balance, january.total_credits, january.total_debits, january.closing_balance),
+            (Decimal('0.00'), Decimal('1000.00'), Decimal('400.00'), Decimal('600.00'))
+        )
+        self.assertEqual(january.transaction_count, 2)
+
+        build_wallet_monthly_snapshots(date(2024, 2, 1))
+        february = WalletMonthlySnapshot.objects.get(wallet=self.wallet, month=date(2024, 2, 1))
+        self.assertEqual((february.opening_balance, february.closing_balance), (Decimal('600.00'), Decimal('600.00')))
+        self.assertEqual(february.transaction_count, 0)
+
+    def test_transactions_on_month_boundary(self):
+        self.wallet.add_funds(Decimal('200'))
+        _, end = WalletMonthlySnapshot.month_bounds(date(2024, 3, 1))
+        self.wallet.transactions.update(created_at=end)  # first instant of April
+        Wallet.objects.filter(pk=self.wallet.pk).update(created_at=timezone.make_aware(datetime(2024, 1, 1)))
+        build_wallet_monthly_snapshots(date(2024, 3, 1))
+        build_wallet_monthly_snapshots(date(2024, 4, 1))
+        march, april = WalletMonthlySnapshot.objects.filter(wallet=self.wallet).order_by('month')
+        self.assertEqual((march.transaction_count, march.closing_balance), (0, Decimal('0.00')))
+        self.assertEqual((april.transaction_count, april.closing_balance), (1, Decimal('200.00')))
+
+    def verify(self, *args):
+        out = StringIO()
+        call_command('verify_wallet_ledger', *args, stdout=out)
+        return out.getvalue()
+
+    def test_verify_catches_tampered_balance(self):
+        self.wallet.add_funds(Decimal('500'))
+        self.assertIn('All 1 wallets match', self.verify('--strict'))
+        Wallet.objects.filter(pk=self.wallet.pk).update(balance=Decimal('900.00'))
+        with self.assertRaisesMessage(CommandError, '1 of 1 wallets do not match'):
+            self.verify('--strict')
+
+    def test_verify_backfills_tampered_balance_after(self):
+        self.wallet.add_funds(Decimal('500'))
+        self.wallet.add_funds(Decimal('100'))
+        WalletTransaction.objects.filter(wallet=self.wallet).update(balance_after=None)
+        self.assertIn('needing backfill: 2', self.verify())
+        self.assertIn('backfilled: 2', self.verify('--backfill'))
+        self.assertEqual([after for _, after in self.ledger()], [Decimal('500.00'), Decimal('600.00')])
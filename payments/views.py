@@ -15,10 +15,14 @@ from django.shortcuts import get_object_or_404
 from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 from django.core.exceptions import ValidationError
-from .models import PaymentService, Payment, Wallet
-from .serializers import PaymentServiceSerializer, PaymentSerializer, WalletSerializer, WalletDepositSerializer
+from .models import PaymentService, Payment, Wallet, WalletTransaction, WalletMonthlySnapshot
+from .serializers import (
+    PaymentServiceSerializer, PaymentSerializer, WalletSerializer, WalletDepositSerializer,
+    WalletTransactionSerializer, WalletMonthlySnapshotSerializer
+)
+from .pagination import WalletStatementCursorPagination
 from shops.models import Shop, Subscription, UserOffer
 from marketplace.models import Brand, Product
 from estates.models import Property
@@ -119,6 +123,58 @@ class WalletViewSet(viewsets.ModelViewSet):
             logger.error(f"Deposit initiation error: {str(e)}\nTraceback: {traceback.format_exc()}")
             return Response({"error": f"Internal server error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="month",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Restrict the statement to one month (YYYY-MM)."
+            )
+        ],
+        responses={200: WalletTransactionSerializer(many=True)},
+        description="Keyset-paginated wallet statement with the running balance after each transaction."
+    )
+    @action(detail=False, methods=['get'], url_path='statement')
+    def statement(self, request):
+        """Return the authenticated user's wallet ledger, newest first."""
+        wallet = get_object_or_404(Wallet, user=request.user)
+        transactions = WalletTransaction.objects.filter(wallet=wallet)
+        snapshot = None
+
+        month = request.query_params.get('month')
+        if month:
+            try:
+                month_start = datetime.strptime(month, '%Y-%m').date()
+            except ValueError:
+                return Response({"error": "month must be in YYYY-MM format."}, status=status.HTTP_400_BAD_REQUEST)
+            start, end = WalletMonthlySnapshot.month_bounds(month_start)
+            transactions = transactions.filter(created_at__gte=start, created_at__lt=end)
+            snapshot = WalletMonthlySnapshot.objects.filter(wallet=wallet, month=month_start).first()
+
+        paginator = WalletStatementCursorPagination()
+        page = paginator.paginate_queryset(transactions, request, view=self)
+        response = paginator.get_paginated_response(WalletTransactionSerializer(page, many=True).data)
+        response.data['balance'] = str(wallet.balance)
+        response.data['snapshot'] = WalletMonthlySnapshotSerializer(snapshot).data if snapshot else None
+        return response
+
+    @extend_schema(
+        responses={200: WalletMonthlySnapshotSerializer(many=True)},
+        description="Monthly opening/closing balances for the authenticated user's wallet."
+    )
+    @action(detail=False, methods=['get'], url_path='snapshots')
+    def snapshots(self, request):
+        """Return the most recent monthly closing-balance snapshots."""
+        wallet = get_object_or_404(Wallet, user=request.user)
+        try:
+            months = min(max(int(request.query_params.get('months', 12)), 1), 60)
+        except ValueError:
+            months = 12
+        snapshots = WalletMonthlySnapshot.objects.filter(wallet=wallet).order_by('-month')[:months]
+        return Response(WalletMonthlySnapshotSerializer(snapshots, many=True).data)
+
     @action(detail=False, methods=['get'], url_path='check-payment-status/(?P<transaction_id>[^/.]+)')
     @extend_schema(
         parameters=[
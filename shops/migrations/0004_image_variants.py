@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-19 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shops', '0003_remove_shop_shops_shop_locatio_653611_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shop',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='shopmedia',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-19 03:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_delete_location'),
+        ('shops', '0004_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shop',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['campus', '-created_at', '-id'], name='shop_active_campus_recent_idx'),
+        ),
+    ]
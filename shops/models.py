@@ -1,5 +1,7 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import BooleanField, Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import timedelta
 from phonenumber_field.modelfields import PhoneNumberField
@@ -15,8 +17,87 @@ from django.contrib.gis.db import models as gis_models
 
 logger = logging.getLogger(__name__)
 
+def publicly_active_q(prefix=''):
+    """
+    Predicate for a shop being publicly visible: an active, unexpired subscription
+    and the shop itself active. ``prefix`` is the lookup path to the shop, e.g.
+    ``'shop__'`` for promotions, events and services.
+    """
+    return Q(**{
+        f'{prefix}subscription__status': Subscription.Status.ACTIVE,
+        f'{prefix}subscription__end_date__gt': timezone.now(),
+        f'{prefix}is_active': True,
+    })
+
+def _publicly_active_annotation(prefix=''):
+    return Case(
+        When(publicly_active_q(prefix), then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField()
+    )
+
+def _child_count(model, **filters):
+    """Correlated ``COUNT`` of a shop's children; avoids the row fan-out of joining several relations."""
+    children = model.objects.filter(shop=OuterRef('pk'), **filters).order_by().values('shop')
+    return Coalesce(
+        Subquery(children.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+        0
+    )
+
+# Columns read by ShopSummarySerializer; everything else is deferred in list views.
+SUMMARY_FIELDS = ('id', 'name', 'image', 'image_variants', 'campus', 'is_active', 'created_at')
+
+class ShopQuerySet(models.QuerySet):
+    def publicly_active(self):
+        return self.filter(publicly_active_q())
+
+    def with_activity(self):
+        """Annotate ``is_publicly_active`` so serializers need no per-row subscription lookup."""
+        return self.annotate(is_publicly_active=_publicly_active_annotation())
+
+    def summary(self):
+        """
+        Lean projection for shop listings: only ``SUMMARY_FIELDS``, the campus
+        name, counts of services and current promotions/events, and subscription
+        activity, all computed in one query.
+        """
+        now = timezone.now()
+        return self.only(*SUMMARY_FIELDS).with_activity().annotate(
+            campus_name=F('campus__name'),
+            subscription_active=Case(
+                When(subscription__status=Subscription.Status.ACTIVE, subscription__end_date__gt=now, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField()
+            ),
+            services_count=_child_count(Services),
+            promotions_count=_child_count(Promotion, start_date__lte=now, end_date__gte=now),
+            events_count=_child_count(Event, start_time__lte=now, end_time__gte=now),
+        )
+
+class ShopRelatedQuerySet(models.QuerySet):
+    """Queryset for models with a ``shop`` ForeignKey (promotions, events, services)."""
+
+    def publicly_active(self):
+        return self.filter(publicly_active_q('shop__'))
+
+    def with_activity(self):
+        """Annotate ``is_publicly_active`` from the parent shop's subscription in SQL."""
+        return self.annotate(is_publicly_active=_publicly_active_annotation('shop__'))
+
+class ShopRelatedActivityMixin:
+    def shop_is_publicly_active(self):
+        """
+        Read the ``is_publicly_active`` annotation added by ``with_activity()``,
+        falling back to checking the shop (and its subscription) in Python.
+        """
+        annotated = getattr(self, 'is_publicly_active', None)
+        if annotated is not None:
+            return annotated
+        return self.shop.is_active and self.shop.is_subscription_active()
+
 class Shop(models.Model):
     image = models.ImageField(upload_to='shop-profile/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='shop')
     name = models.CharField(max_length=255)
     phone = PhoneNumberField(region='TZ')
@@ -28,10 +109,19 @@ class Shop(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=False)
 
+    objects = ShopQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=['user']),
             models.Index(fields=['is_active']),
+            # Directory listings: visible shops of one campus, newest first (the cursor ordering).
+            # Subscription expiry clears is_active, so the predicate tracks public visibility.
+            models.Index(
+                fields=['campus', '-created_at', '-id'],
+                condition=Q(is_active=True),
+                name='shop_active_campus_recent_idx'
+            ),
         ]
 
     def clean(self):
@@ -43,7 +133,7 @@ class Shop(models.Model):
     def is_subscription_active(self):
         """Check if the shop has an active subscription."""
         subscription = getattr(self, 'subscription', None)
-        return subscription and subscription.is_active()
+        return bool(subscription) and subscription.check_is_active()
 
     def __str__(self):
         return self.name
@@ -52,13 +142,17 @@ class ShopMedia(models.Model):
     shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name='media')
     image = models.ImageField(upload_to='shop_images/', blank=True, null=True)
     is_primary = models.BooleanField(default=False)
+    # Resized renditions, filled in by core.tasks.generate_image_derivatives
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = ShopRelatedQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if self.is_primary:
             ShopMedia.objects.filter(shop=self.shop, is_primary=True).update(is_primary=False)
         super().save(*args, **kwargs)
 
-class Promotion(models.Model):
+class Promotion(ShopRelatedActivityMixin, models.Model):
     shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name='promotions')
     title = models.CharField(max_length=100)
     description = models.TextField()
@@ -66,17 +160,19 @@ class Promotion(models.Model):
     end_date = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ShopRelatedQuerySet.as_manager()
+
     @property
     def is_active(self):
         if self.start_date is None or self.end_date is None:
             return False
         return (self.start_date <= timezone.now() <= self.end_date and
-                self.shop.is_subscription_active())
+                self.shop_is_publicly_active())
 
     def __str__(self):
         return self.title
 
-class Event(models.Model):
+class Event(ShopRelatedActivityMixin, models.Model):
     shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name='events')
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -86,17 +182,19 @@ class Event(models.Model):
     ticket_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ShopRelatedQuerySet.as_manager()
+
     @property
     def is_active(self):
         if self.start_time is None or self.end_time is None:
             return False
         return (self.start_time <= timezone.now() <= self.end_time and
-                self.shop.is_subscription_active())
+                self.shop_is_publicly_active())
 
     def __str__(self):
         return self.title
 
-class Services(models.Model):
+class Services(ShopRelatedActivityMixin, models.Model):
     shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name='services')
     name = models.CharField(max_length=255)
     description = models.TextField()
@@ -104,9 +202,11 @@ class Services(models.Model):
     duration = models.DurationField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ShopRelatedQuerySet.as_manager()
+
     @property
     def is_available(self):
-        return self.shop.is_subscription_active()
+        return self.shop_is_publicly_active()
 
     def __str__(self):
         return self.name
@@ -169,20 +269,10 @@ class Subscription(models.Model):
 
     def is_active(self):
         """
-        Check if the subscription is active and update its status in the database if it has expired.
-        This method has a side-effect and should be used carefully, for example in a periodic task.
+        Alias of ``check_is_active`` kept for existing callers and serializers.
+        Expired subscriptions are flipped to EXPIRED (and their shop/products
+        deactivated) in bulk by ``shops.tasks.expire_subscriptions``.
         """
-        if self.status == self.Status.ACTIVE and self.end_date < timezone.now():
-            with transaction.atomic():
-                self.status = self.Status.EXPIRED
-                self.save()
-                self.shop.is_active = False
-                self.shop.save(update_fields=['is_active'])
-                products_updated = Product.objects.filter(
-                    shop=self.shop,
-                    is_active=True
-                ).update(is_active=False)
-                logger.info(f"Deactivated {products_updated} products and shop {self.shop.id} due to expired subscription")
         return self.check_is_active()
 
     def extend_subscription(self, months=1, is_initial_free=False):
@@ -199,12 +289,12 @@ class Subscription(models.Model):
             products_updated = Product.objects.filter(
                 shop=self.shop,
                 is_active=False
-            ).update(is_active=True)
+            ).set_active(True)
             logger.info(f"Reactivated {products_updated} products and shop {self.shop.id} due to subscription extension")
 
     def activate_subscription(self):
         """Activate or extend the subscription via wallet payment."""
-        if self.is_active():
+        if self.check_is_active():
             logger.info(f"Subscription {self.id} already active for shop {self.shop.id}.")
             return
 
@@ -231,7 +321,7 @@ class Subscription(models.Model):
                 products_updated = Product.objects.filter(
                     shop=self.shop,
                     is_active=False
-                ).update(is_active=True)
+                ).set_active(True)
                 logger.info(f"Activated subscription {self.id} for shop {self.shop.id}, amount: {payment_service.price} TZS")
             except ValidationError as e:
                 logger.error(f"Subscription activation failed for subscription {self.id}: {str(e)}")
@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ShopCursorPagination(CursorPagination):
+    """Pages shop listings newest first; ``id`` breaks ties so cursors stay stable."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import Shop, ShopMedia, Promotion, Event, Services, Subscription, UserOffer
 from users.models import NewUser
 from core.models import University, Campus
+from core.serializers import ImagePlaceholderField, ImageVariantsField, MediaImageField
 import logging
 from datetime import timedelta
 from django.utils import timezone
@@ -30,7 +31,9 @@ class UserOfferSerializer(serializers.ModelSerializer):
 
 class ShopMediaSerializer(serializers.ModelSerializer):
     shop = serializers.PrimaryKeyRelatedField(queryset=Shop.objects.all())
-    image = serializers.ImageField(use_url=True, allow_null=True, required=False)
+    image = MediaImageField(allow_null=True, required=False)
+    variants = ImageVariantsField()
+    placeholder = ImagePlaceholderField()
 
     def validate(self, data):
         image = data.get('image')
@@ -42,7 +45,7 @@ class ShopMediaSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ShopMedia
-        fields = ['id', 'shop', 'image', 'is_primary']
+        fields = ['id', 'shop', 'image', 'is_primary', 'variants', 'placeholder']
 
 class PromotionSerializer(serializers.ModelSerializer):
     shop = serializers.PrimaryKeyRelatedField(queryset=Shop.objects.all())
@@ -91,7 +94,7 @@ class ShopSerializer(serializers.ModelSerializer):
             'id', 'user', 'name', 'phone', 'campus', 'description', 'operating_hours',
             'social_media', 'created_at', 'updated_at', 'is_active',
             'services', 'promotions', 'events', 'media', 'subscription', 'is_subscription_active',
-            'image', 'subscription_warning'
+            'image', 'image_variants', 'subscription_warning'
         ]
         read_only_fields = ['user', 'created_at', 'updated_at', 'is_subscription_active']
 
@@ -102,7 +105,8 @@ class ShopSerializer(serializers.ModelSerializer):
     media = ShopMediaSerializer(many=True, read_only=True)
     subscription = SubscriptionSerializer(read_only=True)
     is_subscription_active = serializers.ReadOnlyField()
-    image = serializers.ImageField(use_url=True, allow_null=True, required=False)  # Add image field
+    image = MediaImageField(allow_null=True, required=False)
+    image_variants = ImageVariantsField(variants_field='image_variants')
     subscription_warning = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.CharField(allow_null=True))
@@ -129,4 +133,30 @@ class ShopSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.BooleanField())
     def is_subscription_active(self, obj) -> bool:
-        return obj.is_subscription_active
\ No newline at end of file
+        return obj.is_subscription_active
+
+
+class ShopSummarySerializer(serializers.ModelSerializer):
+    """
+    Card-sized shop for list views. Reads only the annotations added by
+    ``Shop.objects.summary()``, so a page of shops is a single query.
+    """
+    campus = serializers.PrimaryKeyRelatedField(read_only=True)
+    campus_name = serializers.CharField(read_only=True, allow_null=True)
+    image = MediaImageField(read_only=True)
+    image_variants = ImageVariantsField(variants_field='image_variants')
+    image_placeholder = ImagePlaceholderField(variants_field='image_variants')
+    is_subscription_active = serializers.BooleanField(source='subscription_active', read_only=True)
+    is_publicly_active = serializers.BooleanField(read_only=True)
+    services_count = serializers.IntegerField(read_only=True)
+    promotions_count = serializers.IntegerField(read_only=True)
+    events_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Shop
+        fields = [
+            'id', 'name', 'campus', 'campus_name', 'image', 'image_variants', 'image_placeholder',
+            'is_active', 'is_subscription_active', 'is_publicly_active',
+            'services_count', 'promotions_count', 'events_count', 'created_at'
+        ]
+        read_only_fields = fields
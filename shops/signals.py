@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.conf import settings
 from django.db import transaction
@@ -8,6 +8,7 @@ from datetime import timedelta
 from .models import UserOffer, Subscription, Shop
 from payments.models import Payment
 from django.contrib.contenttypes.models import ContentType
+from core.cache import ShopDirectoryCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -79,4 +80,13 @@ def create_shop_trial_subscription(sender, instance, created, **kwargs):
                 subject="Shop Trial Subscription Creation Failure",
                 message=error_msg,
                 fail_silently=True
-            )
\ No newline at end of file
+            )
+
+
+@receiver(post_save, sender=Shop)
+@receiver(post_delete, sender=Shop)
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_shop_directory(sender, **kwargs):
+    """Campus shop counts depend on shop campus/activity and subscription state."""
+    transaction.on_commit(ShopDirectoryCache.invalidate)
@@ -3,9 +3,55 @@ from django.db import transaction
 from django.utils import timezone
 from .models import Subscription, Shop
 from marketplace.models import Product
-from datetime import timedelta
+from core.cache import ProfileCache, ShopDirectoryCache
 import logging
 
 logger = logging.getLogger(__name__)
 
-# (No background task needed for subscription expiry. Use on-demand checks in views/models.)
\ No newline at end of file
+EXPIRY_BATCH_SIZE = 500
+
+
+def expire_subscriptions():
+    """
+    Expire every active subscription whose end_date has passed and deactivate
+    the affected shops and their products.
+
+    Runs periodically via django-q (see ``setup_schedules``), so read paths only
+    need the side-effect free ``Subscription.check_is_active()``. Work is done in
+    set-based UPDATEs over batches of subscription ids; rows locked by another
+    transaction (e.g. a concurrent renewal) are skipped and picked up next run.
+    """
+    total_subscriptions = total_shops = total_products = 0
+    while True:
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                Subscription.objects.select_for_update(skip_locked=True).filter(
+                    status=Subscription.Status.ACTIVE,
+                    end_date__lt=now
+                ).values_list('id', 'shop_id')[:EXPIRY_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            subscription_ids = [subscription_id for subscription_id, _ in batch]
+            shop_ids = [shop_id for _, shop_id in batch]
+
+            total_subscriptions += Subscription.objects.filter(id__in=subscription_ids).update(
+                status=Subscription.Status.EXPIRED,
+                updated_at=now
+            )
+            total_shops += Shop.objects.filter(id__in=shop_ids, is_active=True).update(is_active=False)
+            owner_ids = list(Shop.objects.filter(id__in=shop_ids).values_list('user_id', flat=True))
+            transaction.on_commit(lambda owner_ids=owner_ids: ProfileCache.invalidate(*owner_ids))
+            total_products += Product.objects.filter(shop_id__in=shop_ids, is_active=True).set_active(False)
+
+        if len(batch) < EXPIRY_BATCH_SIZE:
+            break
+
+    if total_subscriptions:
+        ShopDirectoryCache.invalidate()
+        logger.info(
+            f"Expired {total_subscriptions} subscriptions, deactivated {total_shops} shops "
+            f"and {total_products} products"
+        )
+    return total_subscriptions
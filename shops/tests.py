@@ -1,3 +1,171 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.cache import ShopDirectoryCache
+from marketplace.models import Brand, Category, Product
+from users.models import NewUser
+from .models import Promotion, Shop, Subscription
+from .serializers import ShopSummarySerializer
+from .tasks import expire_subscriptions
+from .views import ShopViewSet
+
+
+def create_shop(name, phonenumber, subscription_end=None, subscription_status=Subscription.Status.ACTIVE):
+    """A shop with the trial subscription from the post_save signal, adjusted as asked."""
+    owner = NewUser.objects.create_user(
+        email=f'{name.lower()}@example.com', username=name.lower(), phonenumber=phonenumber
+    )
+    shop = Shop.objects.create(
+        user=owner, name=name, phone=phonenumber, description='Campus shop', image='shop-profile/x.jpg'
+    )
+    updates = {'status': subscription_status}
+    if subscription_end is not None:
+        updates['end_date'] = subscription_end
+    Subscription.objects.filter(shop=shop).update(**updates)
+    shop.refresh_from_db()
+    return shop
+
+
+class ShopSummaryTests(SimpleTestCase):
+    """The list projection (compiled SQL only; no database needed)."""
+
+    def test_summary_is_one_lean_query(self):
+        sql = str(Shop.objects.summary().query)
+        self.assertNotIn('"shops_shop"."description"', sql)
+        self.assertNotIn('"shops_shop"."operating_hours"', sql)
+        # Child counts are correlated subqueries, not joins that multiply rows.
+        self.assertNotIn('JOIN "shops_services"', sql)
+        self.assertNotIn('JOIN "shops_promotion"', sql)
+        self.assertIn('"services_count"', sql)
+        self.assertIn('"subscription_active"', sql)
+        # Current means started and not yet ended, like Promotion.is_active / Event.is_active.
+        self.assertIn('U0."start_date" <=', sql)
+        self.assertIn('U0."start_time" <=', sql)
+
+    def test_serializes_annotations_without_relations(self):
+        shop = Shop(id=7, name='Campus Prints', campus_id=3, is_active=True)
+        shop.campus_name = 'Main'
+        shop.subscription_active = True
+        shop.is_publicly_active = True
+        shop.services_count, shop.promotions_count, shop.events_count = 4, 1, 0
+        # SimpleTestCase rejects database access, so this also proves no query runs.
+        data = ShopSummarySerializer(shop).data
+        self.assertEqual(data['campus'], 3)
+        self.assertEqual(data['campus_name'], 'Main')
+        self.assertTrue(data['is_subscription_active'])
+        self.assertEqual((data['services_count'], data['promotions_count']), (4, 1))
+        self.assertIsNone(data['image_placeholder'])
+
+
+class ShopDirectoryTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def directory(self, query):
+        view = ShopViewSet()
+        view.request = Request(APIRequestFactory().get('/shops/', query))
+        return view.filter_directory(Shop.objects.summary())
+
+    def test_campus_and_university_filters(self):
+        sql = str(self.directory({'campus': '3', 'university': '9'}).query)
+        self.assertIn('"shops_shop"."campus_id" = 3', sql)
+        self.assertIn('"core_campus"."university_id" = 9', sql)
+
+    def test_malformed_filter_matches_nothing(self):
+        self.assertFalse(self.directory({'campus': 'main'}).exists())
+
+    def test_campus_counts_cached_until_invalidated(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [{'campus': 1, 'campus_name': 'Main', 'university': 2, 'shops': len(calls)}]
+
+        self.assertEqual(ShopDirectoryCache.get_campus_counts(loader)[0]['shops'], 1)
+        self.assertEqual(ShopDirectoryCache.get_campus_counts(loader)[0]['shops'], 1)
+        ShopDirectoryCache.invalidate()
+        self.assertEqual(ShopDirectoryCache.get_campus_counts(loader)[0]['shops'], 2)
+        self.assertEqual(len(calls), 2)
+
+
+class ExpireSubscriptionsTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.expired = create_shop('Lapsed', '+255717000001', subscription_end=now - timedelta(hours=1))
+        self.current = create_shop('Current', '+255717000002', subscription_end=now + timedelta(days=3))
+        category = Category.objects.create(name='Books')
+        brand = Brand.objects.create(name='Generic', created_by=self.expired.user, is_active=True)
+        self.products = {
+            shop.pk: Product.objects.create(
+                name='Textbook', description='Used', brand=brand, category=category, owner=shop.user,
+                shop=shop, price=Decimal('20000'), is_active=True
+            )
+            for shop in (self.expired, self.current)
+        }
+
+    def test_expires_only_lapsed_subscriptions(self):
+        self.assertTrue(self.expired.is_active)
+        self.assertEqual(expire_subscriptions(), 1)
+
+        self.assertEqual(Subscription.objects.get(shop=self.expired).status, Subscription.Status.EXPIRED)
+        self.expired.refresh_from_db()
+        self.assertFalse(self.expired.is_active)
+        self.assertFalse(Product.objects.get(pk=self.products[self.expired.pk].pk).is_active)
+
+        self.assertEqual(Subscription.objects.get(shop=self.current).status, Subscription.Status.ACTIVE)
+        self.current.refresh_from_db()
+        self.assertTrue(self.current.is_active)
+        self.assertTrue(Product.objects.get(pk=self.products[self.current.pk].pk).is_active)
+
+    def test_rerun_is_a_no_op(self):
+        expire_subscriptions()
+        self.assertEqual(expire_subscriptions(), 0)
+
+
+class PublicActivityTests(TestCase):
+    """The SQL ``is_publicly_active`` annotation must agree with the Python fallback."""
+
+    def setUp(self):
+        now = timezone.now()
+        self.expected = {}
+        active = create_shop('Open', '+255717000011', subscription_end=now + timedelta(days=3))
+        expired = create_shop('Lapsed', '+255717000012', subscription_end=now - timedelta(minutes=5))
+        canceled = create_shop(
+            'Canceled', '+255717000013', subscription_end=now + timedelta(days=3),
+            subscription_status=Subscription.Status.CANCELED
+        )
+        inactive = create_shop('Closed', '+255717000014', subscription_end=now + timedelta(days=3))
+        Shop.objects.filter(pk=inactive.pk).update(is_active=False)
+        self.expected = {active.pk: True, expired.pk: False, canceled.pk: False, inactive.pk: False}
+        for pk in self.expected:
+            Promotion.objects.create(
+                shop_id=pk, title='Sale', description='10% off',
+                start_date=now - timedelta(days=1), end_date=now + timedelta(days=1)
+            )
+
+    def test_shop_annotation_matches_python(self):
+        annotated = {shop.pk: shop.is_publicly_active for shop in Shop.objects.with_activity()}
+        self.assertEqual(annotated, self.expected)
+        for shop in Shop.objects.select_related('subscription'):
+            self.assertEqual(shop.is_active and shop.is_subscription_active(), self.expected[shop.pk], shop.name)
+        self.assertEqual(
+            set(Shop.objects.publicly_active().values_list('pk', flat=True)),
+            {pk for pk, visible in self.expected.items() if visible}
+        )
+
+    def test_child_annotation_matches_fallback(self):
+        for promotion in Promotion.objects.with_activity():
+            self.assertEqual(promotion.shop_is_publicly_active(), self.expected[promotion.shop_id])
+            self.assertEqual(promotion.is_active, self.expected[promotion.shop_id])
+        for promotion in Promotion.objects.all():
+            self.assertFalse(hasattr(promotion, 'is_publicly_active'))
+            self.assertEqual(promotion.shop_is_publicly_active(), self.expected[promotion.shop_id])
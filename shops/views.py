@@ -3,16 +3,18 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny, IsAu
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import Shop, ShopMedia, Promotion, Event, Services, UserOffer, Subscription
-from .serializers import ShopSerializer, ShopMediaSerializer, PromotionSerializer, EventSerializer, ServicesSerializer, UserOfferSerializer, SubscriptionSerializer
+from .models import Shop, ShopMedia, Promotion, Event, Services, UserOffer, Subscription, publicly_active_q
+from .serializers import ShopSerializer, ShopSummarySerializer, ShopMediaSerializer, PromotionSerializer, EventSerializer, ServicesSerializer, UserOfferSerializer, SubscriptionSerializer
 from .permissions import IsOwnerWithActiveSubscriptionOrReadOnly
+from .pagination import ShopCursorPagination
 import logging
-from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Exists, OuterRef, Q, Prefetch
 from django.db import transaction
 from django.urls import reverse
 from django.contrib.contenttypes.models import ContentType
 from payments.models import PaymentService
+from marketplace.models import Category, Product
+from core.cache import ShopDirectoryCache
 from decimal import Decimal
 from django.core.exceptions import ValidationError
 # Location logic now handled by frontend - simplified approach
@@ -31,15 +33,12 @@ class ShopRelatedViewSetMixin:
 
     def get_queryset(self):
         # The base queryset must be defined in the viewset's `queryset` attribute.
-        queryset = super().get_queryset().select_related('shop__user', 'shop__subscription')
+        queryset = super().get_queryset().select_related('shop__user').with_activity()
         user = self.request.user
 
-        # Base filter for what is considered "publicly active"
-        active_q = Q(
-            shop__subscription__status=Subscription.Status.ACTIVE,
-            shop__subscription__end_date__gt=timezone.now(),
-            shop__is_active=True
-        )
+        # Base filter for what is considered "publicly active"; the same predicate
+        # backs the ``is_publicly_active`` annotation read by the serializers.
+        active_q = publicly_active_q('shop__')
 
         if not user.is_authenticated:
             return queryset.filter(active_q)
@@ -62,27 +61,89 @@ class ShopRelatedViewSetMixin:
 class ShopViewSet(viewsets.ModelViewSet):
     serializer_class = ShopSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerWithActiveSubscriptionOrReadOnly]
+    pagination_class = ShopCursorPagination
 
     def get_queryset(self):
-        queryset = Shop.objects.select_related('user', 'subscription', 'campus').prefetch_related(
-            'media', 'services', 'promotions', 'events'
-        )
-        now = timezone.now()
+        if self.action == 'list':
+            # Cards only: no nested children, just counts and subscription state from SQL.
+            queryset = self.filter_directory(Shop.objects.summary())
+        else:
+            queryset = Shop.objects.select_related('user', 'subscription', 'campus').prefetch_related(
+                *self.child_prefetches()
+            ).with_activity()
         # Remove all query param handling for lat/lng
         # Use only campus for all proximity/location logic
         if not self.request.user.is_authenticated:
-            queryset = queryset.filter(
-                subscription__status=Subscription.Status.ACTIVE,
-                subscription__end_date__gt=now,
-                is_active=True
-            )
+            queryset = queryset.filter(publicly_active_q())
         elif not self.request.user.is_staff:
-            queryset = queryset.filter(
-                (Q(user=self.request.user)) | 
-                (Q(subscription__status=Subscription.Status.ACTIVE) & Q(subscription__end_date__gt=now) & Q(is_active=True))
-            )
+            queryset = queryset.filter(Q(user=self.request.user) | publicly_active_q())
         return queryset
 
+    def filter_directory(self, queryset):
+        """
+        Directory filters for the list: ``campus`` and ``university`` ids, and
+        ``category``, matching shops with an active product in that category or
+        any of its subcategories. Malformed or unknown ids match nothing.
+        """
+        params = self.request.query_params
+        try:
+            if params.get('campus'):
+                queryset = queryset.filter(campus_id=int(params['campus']))
+            if params.get('university'):
+                queryset = queryset.filter(campus__university_id=int(params['university']))
+            if params.get('category'):
+                category = Category.objects.get(pk=int(params['category']))
+                products = Product.objects.filter(
+                    shop=OuterRef('pk'),
+                    is_active=True,
+                    category__in=category.get_descendants(include_self=True).values('pk')
+                )
+                queryset = queryset.filter(Exists(products))
+        except (Category.DoesNotExist, ValueError):
+            return queryset.none()
+        return queryset
+
+    @extend_schema(description="Publicly visible shops per campus, optionally for one ?university=, cached briefly.")
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny], url_path='campus-counts')
+    def campus_counts(self, request):
+        counts = ShopDirectoryCache.get_campus_counts(lambda: [
+            {
+                'campus': row['campus'],
+                'campus_name': row['campus__name'],
+                'university': row['campus__university'],
+                'shops': row['shops'],
+            }
+            for row in Shop.objects.publicly_active().filter(campus__isnull=False).values(
+                'campus', 'campus__name', 'campus__university'
+            ).annotate(shops=Count('pk')).order_by('campus__name')
+        ])
+        university = request.query_params.get('university')
+        if university:
+            try:
+                university = int(university)
+            except ValueError:
+                return Response({'error': 'university must be an integer id.'}, status=status.HTTP_400_BAD_REQUEST)
+            counts = [row for row in counts if row['university'] == university]
+        return Response(counts)
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ShopSummarySerializer
+        return ShopSerializer
+
+    @staticmethod
+    def child_prefetches():
+        """
+        Prefetch nested shop content with ``is_publicly_active`` annotated in SQL,
+        so serializing promotions/events/services needs no per-child subscription lookup.
+        """
+        return [
+            'media',
+            Prefetch('services', queryset=Services.objects.with_activity()),
+            Prefetch('promotions', queryset=Promotion.objects.with_activity()),
+            Prefetch('events', queryset=Event.objects.with_activity()),
+        ]
+
     def perform_create(self, serializer):
         """
         Create a shop and assign it to the authenticated user.
@@ -107,8 +168,8 @@ class ShopViewSet(viewsets.ModelViewSet):
         """
         try:
             shop = Shop.objects.select_related('subscription', 'user').prefetch_related(
-                'media', 'services', 'promotions', 'events'
-            ).get(user=request.user)
+                *self.child_prefetches()
+            ).with_activity().get(user=request.user)
             serializer = self.get_serializer(shop)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Shop.DoesNotExist:
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from users.search import refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored search vector of every user (e.g. after campus or university renames)'
+
+    def handle(self, *args, **options):
+        updated = refresh_search_vectors()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed search vectors for {updated} users"))
@@ -0,0 +1,45 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Same statement as users.search.REFRESH_SQL, inlined so the migration does not
+# depend on application code.
+BACKFILL_SQL = """
+UPDATE users_newuser AS u SET search_vector =
+    setweight(to_tsvector('simple', coalesce(u.username, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce((
+        SELECT string_agg(c.name || ' ' || un.name || ' ' || un.short_name, ' ')
+        FROM users_profile p
+        JOIN users_profile_campuses pc ON pc.profile_id = p.id
+        JOIN core_campus c ON c.id = pc.campus_id
+        JOIN core_university un ON un.id = c.university_id
+        WHERE p.user_id = u.id
+    ), '')), 'B')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_delete_location'),
+        ('users', '0006_remove_profile_universities'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='newuser',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='newuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='users_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['username'], name='users_username_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager, Group, Permission
 from phonenumber_field.modelfields import PhoneNumberField
 from core.models import Campus
@@ -63,6 +65,8 @@ class NewUser(AbstractBaseUser, PermissionsMixin):
         help_text='Specific permissions for this user.',
         verbose_name='user permissions'
     )
+    # Maintained by users.search.refresh_search_vectors (username + campus/university names)
+    search_vector = SearchVectorField(null=True, editable=False)
     objects = CustomAccountManager()
     
     USERNAME_FIELD = 'email'
@@ -71,6 +75,8 @@ class NewUser(AbstractBaseUser, PermissionsMixin):
     class Meta:
         indexes = [
             models.Index(fields=['is_active']),
+            GinIndex(fields=['search_vector'], name='users_search_vector_idx'),
+            GinIndex(fields=['username'], opclasses=['gin_trgm_ops'], name='users_username_trgm_idx'),
         ]
     
     def __str__(self):
@@ -115,16 +121,32 @@ class Profile(models.Model):
     def __str__(self):
         return f"Profile for {self.user.username}"
     
+    def get_location_names(self):
+        """
+        University names, university short names and campus names in one pass
+        over ``campuses``. Prefetch ``campuses__university`` to keep it query-free.
+        """
+        university_names = {}
+        campus_names = []
+        for campus in self.campuses.all():
+            campus_names.append(campus.name)
+            university_names.setdefault(campus.university.name, campus.university.short_name)
+        return {
+            'university_names': list(university_names),
+            'university_short_names': list(university_names.values()),
+            'campus_names': campus_names,
+        }
+
     def get_university_names(self):
         """Get all university names for this profile via campuses"""
-        return list({c.university.name for c in self.campuses.all()})
+        return self.get_location_names()['university_names']
 
     def get_university_short_names(self):
         """Get all university short names for this profile via campuses"""
-        return list({c.university.short_name for c in self.campuses.all()})
+        return self.get_location_names()['university_short_names']
 
     def get_campus_names(self):
-        return [c.name for c in self.campuses.all()]
+        return self.get_location_names()['campus_names']
 
     def has_location_info(self):
         return self.campuses.exists()
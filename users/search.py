@@ -0,0 +1,119 @@
+"""
+User discovery search.
+
+``NewUser.search_vector`` stores a tsvector of the username (weight A) and the
+names of the user's campuses and universities (weight B), refreshed by signals
+whenever either changes. Queries match the vector by prefix (GIN index) or the
+username by trigram word similarity (``gin_trgm_ops`` index), so short and
+misspelled usernames still find their user. Results are ranked and paged with
+a keyset cursor over ``(rank, id)``, which stays cheap however deep the client
+scrolls.
+"""
+import base64
+import json
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import DecimalField, Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Cast, Coalesce
+
+SEARCH_CONFIG = 'simple'
+
+REFRESH_SQL = """
+UPDATE users_newuser AS u SET search_vector =
+    setweight(to_tsvector('simple', coalesce(u.username, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce((
+        SELECT string_agg(c.name || ' ' || un.name || ' ' || un.short_name, ' ')
+        FROM users_profile p
+        JOIN users_profile_campuses pc ON pc.profile_id = p.id
+        JOIN core_campus c ON c.id = pc.campus_id
+        JOIN core_university un ON un.id = c.university_id
+        WHERE p.user_id = u.id
+    ), '')), 'B')
+"""
+
+
+def refresh_search_vectors(user_ids=None):
+    """Recompute ``search_vector`` for the given users (all users when None)."""
+    with connection.cursor() as cursor:
+        if user_ids is None:
+            cursor.execute(REFRESH_SQL)
+        else:
+            cursor.execute(REFRESH_SQL + " WHERE u.id = ANY(%s)", [list(user_ids)])
+        return cursor.rowcount
+
+
+def _prefix_query(query: str):
+    """``term1:* & term2:*`` over the query's word characters, or None if it has none."""
+    terms = re.findall(r'\w+', query.lower())
+    if not terms:
+        return None
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_queryset(query=None, campus_id=None, university_id=None):
+    """
+    Active users matching ``query``, annotated with a numeric ``rank`` (0 when
+    there is no query). Campus/university filters are EXISTS probes on the
+    profile-campus join table, which is indexed on ``campus_id``.
+    """
+    from users.models import Profile
+
+    User = get_user_model()
+    queryset = User.objects.filter(is_active=True)
+
+    if campus_id or university_id:
+        memberships = Profile.campuses.through.objects.filter(profile__user_id=OuterRef('pk'))
+        if campus_id:
+            memberships = memberships.filter(campus_id=campus_id)
+        if university_id:
+            memberships = memberships.filter(campus__university_id=university_id)
+        queryset = queryset.filter(Exists(memberships))
+
+    query = (query or '').strip()
+    tsquery = _prefix_query(query) if query else None
+    if tsquery is None:
+        return queryset.annotate(rank=Cast(0, DecimalField(max_digits=10, decimal_places=6)))
+
+    # Rounded to numeric so the keyset cursor compares exactly. Users matched
+    # only by trigram may have no vector yet, hence the Coalesce.
+    return queryset.annotate(
+        rank=Cast(
+            Coalesce(SearchRank(F('search_vector'), tsquery), Value(0.0)) + TrigramWordSimilarity(query, 'username'),
+            DecimalField(max_digits=10, decimal_places=6)
+        )
+    ).filter(
+        Q(search_vector=tsquery) | Q(username__trigram_word_similar=query)
+    )
+
+
+def encode_cursor(rank, user_id) -> str:
+    return base64.urlsafe_b64encode(json.dumps([str(rank), user_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Return ``(rank, id)`` from a cursor string; raises ValueError if malformed."""
+    try:
+        rank, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return Decimal(rank), int(user_id)
+    except (TypeError, ValueError, InvalidOperation, json.JSONDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def search_page(queryset, cursor=None, limit=20):
+    """
+    One keyset page of a ``search_queryset`` result, best match first (newest
+    first when ranks tie). Returns ``(users, next_cursor)``.
+    """
+    if cursor:
+        rank, user_id = decode_cursor(cursor)
+        queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, id__lt=user_id))
+    users = list(queryset.order_by('-rank', '-id')[:limit + 1])
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1].rank, users[-1].id)
+    return users, next_cursor
@@ -5,7 +5,10 @@ from .models import NewUser, Profile
 from allauth.socialaccount.models import SocialAccount
 from phonenumber_field.serializerfields import PhoneNumberField
 from core.models import Campus, University
+from core.media import media_url
+from core.serializers import MediaImageField
 from django.apps import apps
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema_field
 
 class CustomRegisterSerializer(RegisterSerializer):
@@ -63,8 +66,7 @@ class CustomUserDetailsSerializer(UserDetailsSerializer):
     @extend_schema_field(serializers.CharField(allow_null=True))
     def get_profile_image(self, obj) -> str:
         if obj.profile and obj.profile.image:
-            request = self.context.get('request')
-            return request.build_absolute_uri(obj.profile.image.url) if request else obj.profile.image.url
+            return media_url(obj.profile.image, self.context.get('request'))
         return None
 
 
@@ -87,35 +89,45 @@ class PublicUserSerializer(serializers.ModelSerializer):
             'start_date'
         )
         read_only_fields = fields
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load profiles and their campuses/universities in two queries for any page size."""
+        return queryset.select_related('profile').prefetch_related(
+            Prefetch('profile__campuses', queryset=Campus.objects.select_related('university').order_by('id'))
+        )
+
+    def _location_names(self, obj) -> dict:
+        profile = getattr(obj, 'profile', None)
+        if profile is None:
+            return {'university_names': [], 'university_short_names': [], 'campus_names': []}
+        if not hasattr(profile, '_location_names'):
+            profile._location_names = profile.get_location_names()
+        return profile._location_names
     
     @extend_schema_field(serializers.CharField(allow_null=True))
     def get_profile_image(self, obj) -> str:
         """Get profile image URL if available"""
-        if obj.profile and obj.profile.image:
-            request = self.context.get('request')
-            return request.build_absolute_uri(obj.profile.image.url) if request else obj.profile.image.url
+        profile = getattr(obj, 'profile', None)
+        if profile and profile.image:
+            return media_url(profile.image, self.context.get('request'))
         return None
 
     @extend_schema_field(serializers.ListField(child=serializers.CharField()))
     def get_university_names(self, obj) -> list:
-        if obj.profile:
-            return obj.profile.get_university_names()
-        return []
+        return self._location_names(obj)['university_names']
 
     @extend_schema_field(serializers.ListField(child=serializers.CharField()))
     def get_university_short_names(self, obj) -> list:
-        if obj.profile:
-            return obj.profile.get_university_short_names()
-        return []
+        return self._location_names(obj)['university_short_names']
 
     @extend_schema_field(serializers.ListField(child=serializers.CharField()))
     def get_campus_names(self, obj) -> list:
-        if obj.profile:
-            return obj.profile.get_campus_names()
-        return []
+        return self._location_names(obj)['campus_names']
 
 class ProfileSerializer(serializers.ModelSerializer):
     user = CustomUserDetailsSerializer(read_only=True)
+    image = MediaImageField(required=False, allow_null=True)
     campuses = serializers.PrimaryKeyRelatedField(
         queryset=apps.get_model('core', 'Campus').objects.all(),
         many=True,
@@ -1,7 +1,12 @@
+from django.db import transaction
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from core.cache import LocationCache, ProfileCache
+from payments.models import Wallet
+from shops.models import Shop, Subscription, UserOffer
 from .models import NewUser
 from .models import Profile
+from .search import refresh_search_vectors
 
 @receiver(post_save, sender=NewUser)  
 def create_profile(sender, instance, created, **kwargs):
@@ -11,3 +16,58 @@ def create_profile(sender, instance, created, **kwargs):
     """
     if created:
         Profile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=NewUser)
+def refresh_user_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Keep the stored search vector in step with the username."""
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    refresh_search_vectors([instance.pk])
+
+
+@receiver(m2m_changed, sender=Profile.campuses.through)
+def profile_campuses_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drop cached location context and refresh search vectors for profiles
+    whose campuses changed.
+    """
+    if not reverse:
+        user_ids = [instance.user_id] if action in ('post_add', 'post_remove', 'post_clear') else []
+    # Changed from the campus side: pk_set holds profile ids, except for clear().
+    elif action == 'pre_clear':
+        instance._cleared_profile_user_ids = list(instance.profiles.values_list('user_id', flat=True))
+        return
+    elif action == 'post_clear':
+        user_ids = getattr(instance, '_cleared_profile_user_ids', [])
+    elif action in ('post_add', 'post_remove') and pk_set:
+        user_ids = list(Profile.objects.filter(id__in=pk_set).values_list('user_id', flat=True))
+    else:
+        user_ids = []
+
+    for user_id in user_ids:
+        LocationCache.invalidate_user_location(user_id)
+    if user_ids:
+        refresh_search_vectors(user_ids)
+        invalidate_profile_bundle(*user_ids)
+
+
+def invalidate_profile_bundle(*user_ids):
+    """Drop cached profile bundles once the current transaction commits."""
+    transaction.on_commit(lambda: ProfileCache.invalidate(*user_ids))
+
+
+@receiver(post_save, sender=NewUser)
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=UserOffer)
+@receiver(post_save, sender=Wallet)
+@receiver(post_save, sender=Shop)
+@receiver(post_delete, sender=Shop)
+def profile_bundle_source_changed(sender, instance, **kwargs):
+    invalidate_profile_bundle(instance.pk if sender is NewUser else instance.user_id)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def subscription_changed(sender, instance, **kwargs):
+    invalidate_profile_bundle(instance.user_id)
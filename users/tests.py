@@ -1,3 +1,135 @@
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.cache import LocationCache
+from core.models import Campus, University
+from core.services.location_service import LocationService
+from users.models import NewUser
+
+
+class PublicUserDiscoveryTests(TestCase):
+    """The public discovery endpoint must not issue queries per user or per campus."""
+
+    @classmethod
+    def setUpTestData(cls):
+        universities = [
+            University.objects.create(name=f'University {i}', short_name=f'U{i}')
+            for i in range(3)
+        ]
+        campuses = [
+            Campus.objects.create(name=f'Campus {i}', university=universities[i % 3])
+            for i in range(6)
+        ]
+        for i in range(12):
+            user = NewUser.objects.create_user(
+                email=f'user{i}@example.com',
+                username=f'user{i}',
+                phonenumber=f'+25571200{i:04d}',
+            )
+            user.profile.campuses.set(campuses[i % 4:i % 4 + 3])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('newuser-public')
+
+    def test_query_count_is_independent_of_page_size(self):
+        # users page + prefetched campuses/universities + total count
+        for page_size in (1, 5, 12):
+            with self.assertNumQueries(3):
+                response = self.client.get(self.url, {'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['users']), page_size)
+
+    def test_location_names_are_computed_from_campuses(self):
+        response = self.client.get(self.url, {'search': 'user0'})
+        user = response.data['users'][0]
+        self.assertEqual(user['campus_names'], ['Campus 0', 'Campus 1', 'Campus 2'])
+        self.assertEqual(user['university_short_names'], ['U0', 'U1', 'U2'])
+        self.assertEqual(len(user['university_names']), len(user['university_short_names']))
+
+    def test_cursor_pages_do_not_overlap(self):
+        first = self.client.get(self.url, {'page_size': 5}).data
+        second = self.client.get(self.url, {'page_size': 5, 'cursor': first['next_cursor']}).data
+        first_ids = {user['id'] for user in first['users']}
+        second_ids = {user['id'] for user in second['users']}
+        self.assertEqual(len(second_ids), 5)
+        self.assertFalse(first_ids & second_ids)
+
+    def test_campus_filter_and_search(self):
+        campus = Campus.objects.get(name='Campus 5')
+        response = self.client.get(self.url, {'campus_id': campus.id})
+        self.assertEqual(response.data['total_count'], NewUser.objects.filter(profile__campuses=campus).count())
+        response = self.client.get(self.url, {'search': 'campus 5'})
+        self.assertTrue(response.data['users'])
+
+
+class ProfileBundleTests(TestCase):
+    """The startup bundle is served from cache and dropped on related writes."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = NewUser.objects.create_user(
+            email='bundle@example.com',
+            username='bundle',
+            phonenumber='+255713000001',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('newuser-me-bundle')
+
+    def test_second_read_hits_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['user']['username'], 'bundle')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data, first.data)
+
+    def test_wallet_write_invalidates_bundle(self):
+        self.assertEqual(self.client.get(self.url).data['wallet']['balance'], '0.00')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.wallet.add_funds(Decimal('500'))
+        self.assertEqual(self.client.get(self.url).data['wallet']['balance'], '500.00')
+
+
+class LocationContextCacheTests(TestCase):
+    """The cached location context is dropped whenever profile.campuses changes, from either side."""
+
+    def setUp(self):
+        cache.clear()
+        university = University.objects.create(name='Mzumbe University', short_name='MU')
+        self.main, self.city = (
+            Campus.objects.create(name=name, university=university) for name in ('Main', 'City')
+        )
+        self.user = NewUser.objects.create_user(
+            email='located@example.com',
+            username='located',
+            phonenumber='+255713000002',
+        )
+        self.profile = self.user.profile
+
+    def campus_ids(self):
+        return [campus['id'] for campus in LocationService.get_user_context(self.user)['campuses']]
+
+    def assertInvalidatedBy(self, change, expected):
+        self.campus_ids()
+        self.assertIsNotNone(LocationCache.get_user_location(self.user.id))
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertIsNone(LocationCache.get_user_location(self.user.id))
+        self.assertEqual(self.campus_ids(), expected)
+
+    def test_forward_changes(self):
+        self.assertEqual(self.campus_ids(), [])
+        self.assertInvalidatedBy(lambda: self.profile.campuses.add(self.main), [self.main.id])
+        self.assertInvalidatedBy(lambda: self.profile.campuses.set([self.city]), [self.city.id])
+        self.assertInvalidatedBy(lambda: self.profile.campuses.clear(), [])
 
-# Create your tests here.
+    def test_reverse_changes(self):
+        self.assertInvalidatedBy(lambda: self.main.profiles.add(self.profile), [self.main.id])
+        self.assertInvalidatedBy(lambda: self.city.profiles.add(self.profile), [self.main.id, self.city.id])
+        self.assertInvalidatedBy(lambda: self.main.profiles.remove(self.profile), [self.city.id])
+        self.assertInvalidatedBy(lambda: self.city.profiles.clear(), [])
@@ -5,7 +5,6 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
 from rest_framework.generics import CreateAPIView, RetrieveUpdateAPIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.middleware.csrf import get_token
 from django.http import JsonResponse
@@ -16,11 +15,19 @@ import logging
 from .models import NewUser, Profile
 from .serializers import CustomUserDetailsSerializer, ProfileSerializer, CustomRegisterSerializer
 from core.models import University, Campus
+from core.cache import UniversityCache
+from core.services.campus_index import get_campus_index
+from core.services.location_service import LocationService
+from core.services.user_service import UserService
 from drf_spectacular.utils import extend_schema
 from rest_framework import serializers
 from users.serializers import PublicUserSerializer
+from users.search import encode_cursor, search_page, search_queryset
 
 logger = logging.getLogger(__name__)
+
+PUBLIC_MAX_PAGE_SIZE = 100
+
 User = get_user_model()
 
 @method_decorator(ensure_csrf_cookie, name='dispatch')
@@ -70,7 +77,7 @@ class CustomRegisterView(CreateAPIView):
                 'username': user.username,
                 'email': user.email,
                 'phonenumber': str(user.phonenumber),
-                'campus': profile.campus.id if profile.campus else None,
+                'campuses': [campus.id for campus in profile.campuses.all()],
             }
         }, status=status.HTTP_201_CREATED)
 
@@ -114,37 +121,43 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     )
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def public(self, request):
-        """Public user discovery endpoint with campus filtering"""
-        queryset = User.objects.filter(is_active=True)
-        
-        # Campus filtering
+        """
+        Public user discovery endpoint with campus filtering. Results are ranked
+        by ``search`` relevance; pass the returned ``next_cursor`` as ``cursor``
+        to fetch the next page (``page`` is still accepted for older clients).
+        """
         campus_id = request.query_params.get('campus_id')
-        if campus_id:
-            queryset = queryset.filter(profile__campuses__id=campus_id)
-        
-        # University filtering through campus
         university_id = request.query_params.get('university_id')
-        if university_id:
-            pass  # No universities field on profile, so skip this filter
-        
-        # Search filtering
         search = request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(username__icontains=search) |
-                Q(email__icontains=search)
+        cursor = request.query_params.get('cursor')
+
+        try:
+            campus_id = int(campus_id) if campus_id else None
+            university_id = int(university_id) if university_id else None
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 20)), 1), PUBLIC_MAX_PAGE_SIZE)
+        except ValueError:
+            return Response(
+                {'error': 'campus_id, university_id, page and page_size must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Optimize queries
-        queryset = queryset.select_related('profile').prefetch_related('profile__campuses')
-        
-        # Pagination
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 20))
-        start = (page - 1) * page_size
-        end = start + page_size
-        
-        users_page = queryset[start:end]
+
+        queryset = search_queryset(search, campus_id=campus_id, university_id=university_id)
+        # Optimize queries: a fixed number of queries regardless of page size
+        eager = PublicUserSerializer.setup_eager_loading(queryset)
+
+        if cursor:
+            try:
+                users_page, next_cursor = search_page(eager, cursor=cursor, limit=page_size)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            start = (page - 1) * page_size
+            users_page = list(eager.order_by('-rank', '-id')[start:start + page_size + 1])
+            next_cursor = None
+            if len(users_page) > page_size:
+                users_page = users_page[:page_size]
+                next_cursor = encode_cursor(users_page[-1].rank, users_page[-1].id)
         
         # Use public serializer that only exposes safe fields
         serializer = PublicUserSerializer(users_page, many=True, context={'request': request})
@@ -154,6 +167,7 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
             'total_count': queryset.count(),
             'page': page,
             'page_size': page_size,
+            'next_cursor': next_cursor,
             'filters': {
                 'university_id': university_id,
                 'campus_id': campus_id,
@@ -161,6 +175,38 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
             }
         })
 
+    @extend_schema(
+        description="Location context for the current user: profile campuses, their universities "
+                    "and, when lat/lng are given, the detected and closest profile campus."
+    )
+    @action(detail=False, methods=['get'], url_path='me/context')
+    def me_context(self, request):
+        """Cached location context for the authenticated user"""
+        latitude = longitude = None
+        if 'lat' in request.query_params or 'lng' in request.query_params:
+            try:
+                latitude = float(request.query_params.get('lat'))
+                longitude = float(request.query_params.get('lng'))
+            except (TypeError, ValueError):
+                return Response({'error': 'lat and lng must be valid numbers.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(LocationService.get_user_context(request.user, latitude, longitude))
+
+    @extend_schema(
+        description="Startup bundle for the current user: account, profile, campuses, "
+                    "free-listing offers, wallet balance and shop summary."
+    )
+    @action(detail=False, methods=['get'], url_path='me/bundle')
+    def me_bundle(self, request):
+        """Cached profile bundle for the authenticated user"""
+        bundle = UserService.get_profile_bundle(request.user.id)
+        if bundle is None:
+            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        bundle = {key: value for key, value in bundle.items() if key != 'campus_version'}
+        for section in ('profile', 'shop'):
+            if bundle[section] and bundle[section]['image'] and bundle[section]['image'].startswith('/'):
+                bundle[section] = {**bundle[section], 'image': request.build_absolute_uri(bundle[section]['image'])}
+        return Response(bundle)
+
 class CampusSuggestionResponseSerializer(serializers.Serializer):
     suggestions = serializers.ListField(child=serializers.CharField())
 
@@ -171,9 +217,27 @@ class CampusSuggestionResponseSerializer(serializers.Serializer):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_campus_suggestions(request):
-    """Get campus suggestions for a specific university"""
+    """
+    Get campus suggestions for a specific university, or near a position when
+    ``lat``/``lng`` (and optional ``radius`` in km) are given instead.
+    """
     university_id = request.query_params.get('university_id')
     
+    if not university_id and 'lat' in request.query_params:
+        try:
+            lat = float(request.query_params.get('lat'))
+            lng = float(request.query_params.get('lng'))
+            radius = float(request.query_params.get('radius', 20))
+        except (TypeError, ValueError):
+            return Response({'error': 'lat, lng and radius must be valid numbers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < radius <= 100:
+            return Response({'error': 'radius must be between 0 and 100 km.'}, status=status.HTTP_400_BAD_REQUEST)
+        campuses = UniversityCache.get_campus_suggestions(
+            lat, lng, radius,
+            loader=lambda center_lat, center_lng, search_radius: get_campus_index().nearby(center_lat, center_lng, search_radius)
+        )
+        return Response({'campuses': campuses}, status=status.HTTP_200_OK)
+
     if not university_id:
         return Response({'error': 'university_id is required'}, status=status.HTTP_400_BAD_REQUEST)
     